@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import AssignmentDelay
+from .models import AssignmentDelay, GradingJob
 # Register your models here.
 
-admin.site.register(AssignmentDelay)
\ No newline at end of file
+admin.site.register(AssignmentDelay)
+admin.site.register(GradingJob)
\ No newline at end of file
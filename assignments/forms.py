@@ -1,6 +1,7 @@
 from django import forms
 
 from proofchecker.models import Assignment, Problem, Proof, Course
+from proofchecker.semantics.argument import check_argument
 
 
 class DateInput(forms.DateInput):
@@ -55,6 +56,8 @@ class StudentProblemForm(ProblemForm):
 
 
 class ProblemProofForm(forms.ModelForm):
+    verify_entailment = True
+
     class Meta:
         model = Proof
         fields = ['rules', 'premises', 'conclusion']
@@ -64,12 +67,24 @@ class ProblemProofForm(forms.ModelForm):
         for visible in self.visible_fields():
             visible.field.widget.attrs['onkeydown'] = 'replaceCharacter(this)'
 
+    def clean(self):
+        # Confirm the premises entail the conclusion before the problem is published
+        cleaned_data = super(ProblemProofForm, self).clean()
+        if self.verify_entailment:
+            response = check_argument(cleaned_data.get('rules'), cleaned_data.get('premises'),
+                cleaned_data.get('conclusion'))
+            if not response.is_valid:
+                raise forms.ValidationError(response.err_msg)
+        return cleaned_data
+
     def disabled_all(self):
         self.fields['rules'].widget.attrs['read-only'] = True
         self.fields['premises'].widget.attrs['read-only'] = True
         self.fields['conclusion'].widget.attrs['read-only'] = True
 
 class StudentProblemProofForm(ProblemProofForm):
+    verify_entailment = False
+
     def __init__(self, *args, **kwargs):
         super(StudentProblemProofForm, self).__init__(*args, **kwargs)
         instance = getattr(self, 'instance', None)
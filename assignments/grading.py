@@ -0,0 +1,262 @@
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+
+from proofchecker.models import ProofLine, StudentProblemSolution
+from proofchecker.verification import save_records, verify_saved_proofs
+from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj
+from proofchecker.proofs.proofutils import get_premises
+from .models import GradingJob
+
+# Grading of student solutions in bulk: the solutions, their problems,
+# proofs and proof lines are loaded in a few queries, every proof is
+# verified, and the grades that changed are written with one bulk_update
+
+logger = logging.getLogger(__name__)
+
+# A failed job waits RETRY_DELAY times its number of attempts before it
+# is retried, and a job still running after JOB_TIMEOUT (its worker
+# having died) may be claimed again
+RETRY_DELAY = timedelta(seconds=30)
+JOB_TIMEOUT = timedelta(minutes=10)
+
+# Number of due jobs read at a time by claim_job
+CLAIM_CANDIDATES = 10
+
+
+class StepTimer:
+    """
+    Records the time spent in each step of a grading run, in seconds
+    """
+    def __init__(self):
+        self.steps = OrderedDict()
+
+    @contextmanager
+    def step(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = self.steps.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def total(self):
+        return sum(self.steps.values())
+
+    def as_dict(self):
+        return dict(self.steps)
+
+    def __str__(self):
+        return ', '.join('{}={:.3f}s'.format(name, seconds) for name, seconds in self.steps.items())
+
+
+class GradingResult:
+    """
+    The graded solutions, the ones whose grade changed (with their
+    previous grades, by pk), the number of proofs verified (the others
+    reusing their stored verification), and the timings
+    """
+    def __init__(self, solutions, changed, timer: StepTimer, verified=0, previous=None):
+        self.solutions = solutions
+        self.changed = changed
+        self.timer = timer
+        self.verified = verified
+        self.previous = previous if previous is not None else {}
+
+
+def make_proof_obj(proof, lines):
+    """
+    Returns the ProofObj of a saved Proof and its ProofLines (in order)
+    """
+    proof_obj = ProofObj(lines=[])
+    proof_obj.rules = str(proof.rules)
+    proof_obj.premises = get_premises(proof.premises)
+    proof_obj.conclusion = str(proof.conclusion)
+    for line in lines:
+        proofline = ProofLineObj()
+        proofline.line_no = str(line.line_no)
+        proofline.expression = str(line.formula)
+        proofline.rule = str(line.rule)
+        proof_obj.lines.append(proofline)
+    return proof_obj
+
+
+def compute_grade(problem, line_count: int, response):
+    """
+    Returns the grade of a solution: 0 for an invalid proof, otherwise the
+    problem's points, less lost_points for each line over target_steps
+    """
+    if response.err_msg:
+        return 0
+    if line_count <= problem.target_steps:
+        return problem.point
+    return problem.point - (line_count - problem.target_steps) * problem.lost_points
+
+
+def load_solutions(queryset):
+    """
+    Returns the solutions of a queryset with their problem, proof, stored
+    verification and proof lines (ordered as in the proof editor) in two queries
+    """
+    lines = ProofLine.objects.order_by('ORDER', 'pk')
+    return list(queryset.select_related('problem', 'proof', 'proof__verification').prefetch_related(
+        Prefetch('proof__proofline_set', queryset=lines, to_attr='ordered_lines')))
+
+
+def verify_solutions(solutions, workers=None, executor=None):
+    """
+    Returns the ProofResponse of each solution's proof (reusing the stored
+    verification of unchanged proofs), and the new ProofVerifications.
+    With a number of workers, or an executor from proof_pool, the proofs
+    are verified by a process pool
+    """
+    proofs = [make_proof_obj(solution.proof, solution.proof.ordered_lines) for solution in solutions]
+    return verify_saved_proofs([solution.proof for solution in solutions], proofs, workers, executor)
+
+
+def grade_solutions(queryset, save=True, workers=None, executor=None):
+    """
+    Grade every solution of a queryset of StudentProblemSolutions.
+    Returns a GradingResult; with save=True the changed grades are
+    written with a single bulk_update (and the new verifications stored).
+    With a number of workers, or an executor from proof_pool (shared
+    by the chunks of a run), the proofs are verified by a process pool
+    """
+    timer = StepTimer()
+
+    with timer.step('load'):
+        solutions = load_solutions(queryset)
+
+    with timer.step('verify'):
+        responses, records = verify_solutions(solutions, workers, executor)
+
+    changed = []
+    previous = {}
+    with timer.step('score'):
+        for solution, response in zip(solutions, responses):
+            grade = compute_grade(solution.problem, len(solution.proof.ordered_lines), response)
+            if solution.grade is None or solution.grade != grade:
+                previous[solution.pk] = solution.grade
+                solution.grade = grade
+                changed.append(solution)
+
+    if save and (changed or records):
+        with timer.step('save'):
+            save_records(records)
+            if changed:
+                StudentProblemSolution.objects.bulk_update(changed, ['grade'])
+
+    logger.info('Graded %d solutions (%d changed, %d verified) in %.3fs: %s',
+        len(solutions), len(changed), len(records), timer.total, timer)
+    return GradingResult(solutions, changed, timer, len(records), previous)
+
+
+def pk_chunks(queryset, chunk_size: int):
+    """
+    Yields the primary keys of a queryset in lists of chunk_size,
+    streaming them from the database
+    """
+    chunk = []
+    for pk in queryset.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=chunk_size):
+        chunk.append(pk)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def enqueue_grading(assignment, student):
+    """
+    Returns a queued GradingJob for a student's solutions to an
+    assignment (the job already waiting, if there is one)
+    """
+    job = GradingJob.objects.filter(assignment=assignment, student=student, status='queued').first()
+    if job is None:
+        job = GradingJob.objects.create(assignment=assignment, student=student)
+    return job
+
+
+def enqueue_problem_regrade(problem):
+    """
+    Queue a GradingJob for every submission with a graded solution of a
+    problem, after its point, target_steps or lost_points changed
+    (submissions already waiting for a job are not queued twice).
+    Returns the number of jobs queued
+    """
+    submissions = set(StudentProblemSolution.objects.filter(problem=problem, grade__isnull=False)
+        .values_list('assignment_id', 'student_id'))
+    waiting = set(GradingJob.objects.filter(status='queued', assignment_id__in=[a for a, s in submissions])
+        .values_list('assignment_id', 'student_id'))
+    jobs = [GradingJob(assignment_id=assignment_id, student_id=student_id)
+        for assignment_id, student_id in sorted(submissions - waiting)]
+    GradingJob.objects.bulk_create(jobs)
+    return len(jobs)
+
+
+def try_claim(job: GradingJob, now):
+    """
+    Mark a job as running if no other worker claimed it since it was read.
+    The update only matches the row while its status and attempts are
+    those read, so when two workers claim the same job one of them
+    updates no row and loses.  Returns True if the job was claimed
+    """
+    claimed = GradingJob.objects.filter(pk=job.pk, status=job.status, attempts=job.attempts)\
+        .update(status='running', attempts=job.attempts + 1, started_on=now)
+    if not claimed:
+        return False
+    job.status = 'running'
+    job.attempts += 1
+    job.started_on = now
+    return True
+
+
+def claim_job(now=None):
+    """
+    Returns the next job due to run, marked as running, or None.
+    Jobs claimed meanwhile by another worker are skipped, so each job
+    goes to a single worker (on any database, without row locks)
+    """
+    now = now or timezone.now()
+    due = Q(status='queued', run_after__lte=now) | Q(status='running', started_on__lt=now - JOB_TIMEOUT)
+    while True:
+        candidates = list(GradingJob.objects.filter(due).order_by('run_after', 'pk')[:CLAIM_CANDIDATES])
+        if not candidates:
+            return None
+        for job in candidates:
+            if try_claim(job, now):
+                return job
+
+
+def run_job(job: GradingJob):
+    """
+    Grade the solutions of a claimed job and record the outcome.
+    A failed job is queued again until it reaches max_attempts
+    """
+    try:
+        result = grade_solutions(StudentProblemSolution.objects.filter(
+            assignment=job.assignment_id, student=job.student_id))
+    except Exception as err:
+        logger.exception('Grading job %d failed (attempt %d)', job.pk, job.attempts)
+        job.error = '{}: {}'.format(type(err).__name__, err)
+        if job.attempts >= job.max_attempts:
+            job.status = 'failed'
+            job.finished_on = timezone.now()
+        else:
+            job.status = 'queued'
+            job.run_after = timezone.now() + RETRY_DELAY * job.attempts
+    else:
+        job.status = 'done'
+        job.error = ''
+        job.graded = len(result.solutions)
+        job.changed = len(result.changed)
+        job.timings = result.timer.as_dict()
+        job.finished_on = timezone.now()
+    job.save()
+    return job
+
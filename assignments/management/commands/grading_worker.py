@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from assignments.grading import claim_job, run_job
+
+
+class Command(BaseCommand):
+    help = 'Run queued grading jobs (submitted assignments) until stopped'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+            help='Exit when there are no more jobs due')
+        parser.add_argument('--sleep', type=float, default=1.0,
+            help='Seconds to wait when there are no jobs due (default 1)')
+        parser.add_argument('--max-jobs', type=int, default=None,
+            help='Exit after running this many jobs')
+
+    def handle(self, *args, **options):
+        count = 0
+        while (options['max_jobs'] is None) or (count < options['max_jobs']):
+            job = claim_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            run_job(job)
+            count += 1
+            if job.status == 'done':
+                self.stdout.write('Job {}: graded {} solutions ({} changed) in {:.3f}s ({})'.format(
+                    job.pk, job.graded, job.changed, sum(job.timings.values()),
+                    ', '.join('{}={:.3f}s'.format(step, seconds) for step, seconds in job.timings.items())))
+            else:
+                self.stderr.write('Job {}: attempt {} of {} failed, {}: {}'.format(
+                    job.pk, job.attempts, job.max_attempts, job.status, job.error))
+        self.stdout.write('Ran {} grading jobs'.format(count))
@@ -0,0 +1,72 @@
+import os
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from assignments.grading import grade_solutions, pk_chunks
+from proofchecker.models import Assignment, Course, StudentProblemSolution
+from proofchecker.proofs.proofchecker import proof_pool
+
+
+class Command(BaseCommand):
+    help = 'Grade again the graded solutions of an assignment, a course or every course'
+
+    def add_arguments(self, parser):
+        scope = parser.add_mutually_exclusive_group(required=True)
+        scope.add_argument('--assignment', type=int, help='Id of the assignment to regrade')
+        scope.add_argument('--course', type=int, help='Id of the course whose assignments to regrade')
+        scope.add_argument('--all', action='store_true', help='Regrade every assignment')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+            help='Number of processes verifying proofs (default: one per CPU)')
+        parser.add_argument('--chunk-size', type=int, default=500,
+            help='Number of solutions loaded and graded at a time (default 500)')
+        parser.add_argument('--dry-run', action='store_true',
+            help='Show the changed grades without saving them')
+
+    def get_queryset(self, options):
+        solutions = StudentProblemSolution.objects.filter(grade__isnull=False)
+        if options['assignment'] is not None:
+            if not Assignment.objects.filter(pk=options['assignment']).exists():
+                raise CommandError('Assignment {} does not exist'.format(options['assignment']))
+            return solutions.filter(assignment_id=options['assignment'])
+        if options['course'] is not None:
+            if not Course.objects.filter(pk=options['course']).exists():
+                raise CommandError('Course {} does not exist'.format(options['course']))
+            return solutions.filter(assignment__course_id=options['course'])
+        return solutions
+
+    def handle(self, *args, **options):
+        if (options['workers'] < 1) or (options['chunk_size'] < 1):
+            raise CommandError('--workers and --chunk-size must be at least 1')
+
+        queryset = self.get_queryset(options)
+        total = queryset.count()
+        save = not options['dry_run']
+        graded = verified = changed = 0
+        start = time.perf_counter()
+
+        # One pool of worker processes verifies the proofs of every chunk
+        workers = options['workers']
+        with (proof_pool(workers) if workers > 1 else nullcontext()) as pool:
+            for chunk in pk_chunks(queryset, options['chunk_size']):
+                result = grade_solutions(StudentProblemSolution.objects.filter(pk__in=chunk),
+                    save=save, workers=workers, executor=pool)
+                graded += len(result.solutions)
+                verified += result.verified
+                changed += len(result.changed)
+
+                for solution in result.changed:
+                    self.stdout.write('  student {}, assignment {}, problem {}: {} -> {}'.format(
+                        solution.student_id, solution.assignment_id, solution.problem_id,
+                        result.previous[solution.pk], solution.grade))
+
+                elapsed = time.perf_counter() - start
+                self.stdout.write('[{}/{}] {:.1f} solutions/s ({})'.format(
+                    graded, total, graded / elapsed if elapsed else 0, result.timer))
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write('{} {} solutions in {:.2f}s ({:.1f} solutions/s): {} verified, {} grades {}'.format(
+            'Checked' if options['dry_run'] else 'Regraded', graded, elapsed,
+            graded / elapsed if elapsed else 0, verified, changed,
+            'would change' if options['dry_run'] else 'changed'))
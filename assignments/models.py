@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 # Create your models here.
 
 
@@ -16,4 +17,42 @@ class AssignmentDelay(models.Model):
     status = models.CharField(choices=STATUS, max_length=150, default='pending')
 
     def __str__(self) -> str:
-        return "%s, %s, %s" %(self.assignment, self.student, self.status)
\ No newline at end of file
+        return "%s, %s, %s" %(self.assignment, self.student, self.status)
+
+
+JOB_STATUS = (
+    ('queued', 'Queued'),
+    ('running', 'Running'),
+    ('done', 'Done'),
+    ('failed', 'Failed'),
+)
+
+class GradingJob(models.Model):
+    """
+    A request to grade a student's solutions to an assignment, run by the
+    grading_worker command.  A failed attempt is retried (after run_after)
+    until max_attempts; timings holds the seconds spent in each step
+    """
+    assignment = models.ForeignKey("proofchecker.assignment", on_delete=models.CASCADE)
+    student = models.ForeignKey("proofchecker.student", on_delete=models.CASCADE)
+    status = models.CharField(choices=JOB_STATUS, max_length=20, default='queued', db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_on = models.DateTimeField(auto_now_add=True)
+    started_on = models.DateTimeField(null=True, blank=True)
+    finished_on = models.DateTimeField(null=True, blank=True)
+    graded = models.PositiveIntegerField(default=0)
+    changed = models.PositiveIntegerField(default=0)
+    timings = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-created_on']
+
+    @property
+    def in_progress(self):
+        return self.status in ('queued', 'running')
+
+    def __str__(self) -> str:
+        return "%s, %s, %s" %(self.assignment, self.student, self.status)
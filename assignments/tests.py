@@ -1,3 +1,286 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.management import CommandError, call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
 
-# Create your tests here.
+from proofchecker.models import (
+    Assignment, Course, Instructor, Problem, Proof, ProofLine, ProofVerification, Student, StudentProblemSolution,
+    User
+)
+from proofchecker.proofs.proofchecker import proof_pool
+from .grading import StepTimer, claim_job, enqueue_grading, enqueue_problem_regrade, grade_solutions, run_job, try_claim
+from .models import GradingJob
+
+
+class GradingTestData:
+    """
+    An assignment in a course with one student
+    """
+    @classmethod
+    def setUpTestData(cls):
+        instructor_user = User.objects.create(username='instructor', is_instructor=True)
+        instructor = Instructor.objects.create(user=instructor_user)
+        cls.student = Student.objects.create(user=User.objects.create(username='student', is_student=True))
+        course = Course.objects.create(title='Logic', term='Fall 2021', section=1, instructor=instructor)
+        cls.assignment = Assignment.objects.create(
+            title='Assignment', created_by=instructor, start_date=timezone.now() - timedelta(days=1),
+            due_by=timezone.now() + timedelta(days=7), course=course
+        )
+
+    def make_solution(self, lines, target_steps=3):
+        """
+        Returns the student's solution of a new problem A∧B ⊢ B∧A
+        (10 points, less 2 for each line over target_steps)
+        """
+        problem_proof = Proof.objects.create(premises='A∧B', conclusion='B∧A', created_by=self.student.user)
+        problem = Problem.objects.create(point=10, target_steps=target_steps, lost_points=2, proof=problem_proof)
+        self.assignment.problems.add(problem)
+        proof = Proof.objects.create(premises='A∧B', conclusion='B∧A', created_by=self.student.user)
+        # Saved out of order, as the proof editor may do
+        for order, (line_no, formula, rule) in reversed(list(enumerate(lines))):
+            ProofLine.objects.create(proof=proof, line_no=line_no, formula=formula, rule=rule, ORDER=order)
+        return StudentProblemSolution.objects.create(
+            student=self.student, assignment=self.assignment, problem=problem, proof=proof
+        )
+
+
+class GradeSolutionsTests(GradingTestData, TestCase):
+    VALID = [('1', 'A∧B', 'Premise'), ('2', 'B', '∧E 1'), ('3', 'A', '∧E 1'), ('4', 'B∧A', '∧I 2, 3')]
+
+    def test_grades(self):
+        full = self.make_solution(self.VALID, target_steps=4)
+        long = self.make_solution(self.VALID, target_steps=3)
+        invalid = self.make_solution([('1', 'A∧B', 'Premise'), ('2', 'B∧A', '∧I 1, 1')])
+
+        result = grade_solutions(StudentProblemSolution.objects.filter(student=self.student))
+        self.assertEqual(len(result.solutions), 3)
+        self.assertEqual(len(result.changed), 3)
+        grades = dict(StudentProblemSolution.objects.values_list('pk', 'grade'))
+        self.assertEqual(grades[full.pk], Decimal(10))
+        self.assertEqual(grades[long.pk], Decimal(8))
+        self.assertEqual(grades[invalid.pk], Decimal(0))
+
+    def test_queries(self):
+        for _ in range(3):
+            self.make_solution(self.VALID)
+        # Solutions with their problems, proofs and verifications, the proof lines,
+        # storing the verifications, and updating the grades
+        with self.assertNumQueries(4):
+            result = grade_solutions(StudentProblemSolution.objects.filter(student=self.student))
+        self.assertEqual(result.verified, 3)
+        # Nothing changed the second time
+        with self.assertNumQueries(2):
+            result = grade_solutions(StudentProblemSolution.objects.filter(student=self.student))
+        self.assertEqual(result.changed, [])
+        self.assertEqual(result.verified, 0)
+        self.assertEqual(list(result.timer.steps), ['load', 'verify', 'score'])
+
+    def test_stored_verification(self):
+        solution = self.make_solution(self.VALID, target_steps=4)
+        grade_solutions(StudentProblemSolution.objects.filter(pk=solution.pk))
+        record = ProofVerification.objects.get(proof=solution.proof)
+        self.assertTrue(record.is_valid)
+        self.assertTrue(record.is_complete)
+
+        # Editing a line deletes the stored verification
+        line = solution.proof.proofline_set.get(line_no='4')
+        line.rule = '∧I 2, 2'
+        line.save()
+        self.assertFalse(ProofVerification.objects.filter(proof=solution.proof).exists())
+
+        result = grade_solutions(StudentProblemSolution.objects.filter(pk=solution.pk))
+        self.assertEqual(result.verified, 1)
+        self.assertEqual(result.solutions[0].grade, 0)
+        record = ProofVerification.objects.get(proof=solution.proof)
+        self.assertFalse(record.is_valid)
+        self.assertTrue(record.err_msg.startswith('Error on line 4'))
+
+    def test_changed_proof_is_verified(self):
+        solution = self.make_solution(self.VALID, target_steps=4)
+        grade_solutions(StudentProblemSolution.objects.filter(pk=solution.pk))
+        # A change the signals do not see (a bulk update) changes the hash
+        ProofLine.objects.filter(proof=solution.proof, line_no='4').update(rule='∧I 2, 2')
+        result = grade_solutions(StudentProblemSolution.objects.filter(pk=solution.pk))
+        self.assertEqual(result.verified, 1)
+        self.assertEqual(result.solutions[0].grade, 0)
+
+    def test_save_false(self):
+        solution = self.make_solution(self.VALID, target_steps=4)
+        result = grade_solutions(StudentProblemSolution.objects.filter(pk=solution.pk), save=False)
+        self.assertEqual(result.solutions[0].grade, Decimal(10))
+        self.assertIsNone(StudentProblemSolution.objects.get(pk=solution.pk).grade)
+
+
+class GradingJobTests(GradingTestData, TestCase):
+    VALID = GradeSolutionsTests.VALID
+
+    def test_enqueue_once(self):
+        job = enqueue_grading(self.assignment, self.student)
+        self.assertEqual(enqueue_grading(self.assignment, self.student), job)
+        self.assertEqual(GradingJob.objects.count(), 1)
+
+    def test_claim_and_run(self):
+        solution = self.make_solution(self.VALID, target_steps=4)
+        job = enqueue_grading(self.assignment, self.student)
+
+        claimed = claim_job()
+        self.assertEqual(claimed, job)
+        self.assertEqual(claimed.status, 'running')
+        self.assertEqual(claimed.attempts, 1)
+        self.assertIsNone(claim_job())
+
+        run_job(claimed)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'done')
+        self.assertEqual((job.graded, job.changed), (1, 1))
+        self.assertEqual(list(job.timings), ['load', 'verify', 'score', 'save'])
+        self.assertEqual(StudentProblemSolution.objects.get(pk=solution.pk).grade, Decimal(10))
+
+    def test_concurrent_claims(self):
+        job = enqueue_grading(self.assignment, self.student)
+        # Two workers read the same queued job, then both try to claim it
+        first = GradingJob.objects.get(pk=job.pk)
+        second = GradingJob.objects.get(pk=job.pk)
+        now = timezone.now()
+        self.assertTrue(try_claim(first, now))
+        self.assertFalse(try_claim(second, now))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('running', 1))
+        self.assertIsNone(claim_job())
+
+    def test_claim_skips_lost_jobs(self):
+        lost = enqueue_grading(self.assignment, self.student)
+        other = GradingJob.objects.create(assignment=self.assignment, student=self.student)
+        # Another worker claims the first job between the read and the update
+        claim = try_claim
+        def claimed_meanwhile(job, now):
+            if job.pk == lost.pk:
+                claim(GradingJob.objects.get(pk=lost.pk), now)
+            return claim(job, now)
+        with mock.patch('assignments.grading.try_claim', side_effect=claimed_meanwhile):
+            self.assertEqual(claim_job(), other)
+
+    def test_retry(self):
+        job = enqueue_grading(self.assignment, self.student)
+        failure = mock.patch('assignments.grading.grade_solutions', side_effect=RuntimeError('no database'))
+        with failure, self.assertLogs('assignments.grading', 'ERROR'):
+            run_job(claim_job())
+            job.refresh_from_db()
+            self.assertEqual(job.status, 'queued')
+            self.assertEqual(job.error, 'RuntimeError: no database')
+            # Not due again until the retry delay has passed
+            self.assertIsNone(claim_job())
+
+            later = timezone.now() + timedelta(hours=1)
+            run_job(claim_job(later))
+            run_job(claim_job(later))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.attempts, 3)
+        self.assertIsNone(claim_job(later))
+
+    def test_stale_job(self):
+        enqueue_grading(self.assignment, self.student)
+        job = claim_job()
+        self.assertIsNone(claim_job())
+        self.assertEqual(claim_job(timezone.now() + timedelta(hours=1)), job)
+
+    def test_problem_regrade(self):
+        solution = self.make_solution(self.VALID, target_steps=4)
+        grade_solutions(StudentProblemSolution.objects.filter(pk=solution.pk))
+        # A problem without graded solutions queues nothing
+        self.make_solution(self.VALID)
+        self.assertEqual(enqueue_problem_regrade(Problem.objects.last()), 0)
+
+        solution.problem.target_steps = 2
+        solution.problem.save()
+        self.assertEqual(enqueue_problem_regrade(solution.problem), 1)
+        # Not queued twice
+        self.assertEqual(enqueue_problem_regrade(solution.problem), 0)
+
+        run_job(claim_job())
+        self.assertEqual(StudentProblemSolution.objects.get(pk=solution.pk).grade, Decimal(6))
+
+    def test_worker(self):
+        self.make_solution(self.VALID)
+        enqueue_grading(self.assignment, self.student)
+        out = StringIO()
+        call_command('grading_worker', '--once', stdout=out)
+        self.assertIn('graded 1 solutions (1 changed)', out.getvalue())
+        self.assertIn('Ran 1 grading jobs', out.getvalue())
+
+    def test_status_view(self):
+        self.make_solution(self.VALID)
+        job = enqueue_grading(self.assignment, self.student)
+        self.client.force_login(self.student.user)
+        response = self.client.get(reverse('assignment_details', args=[self.assignment.pk]))
+        self.assertContains(response, reverse('grading_job_status', args=[job.pk]))
+        response = self.client.get(reverse('grading_job_status', args=[job.pk]))
+        self.assertContains(response, 'Grading in progress')
+        self.assertNotIn('HX-Refresh', response)
+
+        run_job(claim_job())
+        response = self.client.get(reverse('grading_job_status', args=[job.pk]))
+        self.assertEqual(response['HX-Refresh'], 'true')
+
+
+class RegradeCommandTests(GradingTestData, TestCase):
+    VALID = GradeSolutionsTests.VALID
+
+    def setUp(self):
+        self.solutions = [self.make_solution(self.VALID, target_steps=4) for _ in range(3)]
+        grade_solutions(StudentProblemSolution.objects.filter(student=self.student))
+        self.problem = self.solutions[0].problem
+        self.problem.target_steps = 3
+        self.problem.save()
+
+    def regrade(self, *args, workers=1):
+        out = StringIO()
+        call_command('regrade', *args, '--workers', str(workers), stdout=out)
+        return out.getvalue()
+
+    def test_regrade_assignment(self):
+        out = self.regrade('--assignment', str(self.assignment.pk), '--chunk-size', '2')
+        self.assertIn('student {}, assignment {}, problem {}: 10.00 -> 8'.format(
+            self.student.pk, self.assignment.pk, self.problem.pk), out)
+        self.assertIn('[2/3]', out)
+        self.assertIn('Regraded 3 solutions', out)
+        self.assertIn('0 verified, 1 grades changed', out)
+        self.assertEqual(StudentProblemSolution.objects.get(pk=self.solutions[0].pk).grade, Decimal(8))
+
+    def test_one_pool_per_run(self):
+        # The chunks of a run share the process pool started for it
+        with mock.patch('assignments.management.commands.regrade.proof_pool', wraps=proof_pool) as pool:
+            out = self.regrade('--all', '--chunk-size', '1', workers=2)
+        pool.assert_called_once_with(2)
+        self.assertIn('Regraded 3 solutions', out)
+        self.assertEqual(StudentProblemSolution.objects.get(pk=self.solutions[0].pk).grade, Decimal(8))
+
+    def test_dry_run(self):
+        out = self.regrade('--all', '--dry-run')
+        self.assertIn('1 grades would change', out)
+        self.assertEqual(StudentProblemSolution.objects.get(pk=self.solutions[0].pk).grade, Decimal(10))
+
+    def test_course(self):
+        out = self.regrade('--course', str(self.assignment.course_id))
+        self.assertIn('Regraded 3 solutions', out)
+        with self.assertRaises(CommandError):
+            self.regrade('--course', '999')
+
+
+class StepTimerTests(TestCase):
+    def test_steps(self):
+        timer = StepTimer()
+        with timer.step('load'):
+            pass
+        with timer.step('verify'):
+            pass
+        with timer.step('load'):
+            pass
+        self.assertEqual(list(timer.steps), ['load', 'verify'])
+        self.assertAlmostEqual(timer.total, sum(timer.as_dict().values()))
+        self.assertTrue(str(timer).startswith('load='))
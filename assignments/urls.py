@@ -10,6 +10,7 @@ urlpatterns = [
     path("assignments/add", views.create_assignment_view, name="add_assignment"),
     path('assignment/<int:pk>/details', views.assignment_details_view, name="assignment_details"),
     path('assignment/<int:pk>/delete', views.AssignmentDeleteView.as_view(), name="delete_assignment"),
+    path('grading/<int:pk>/status', views.grading_job_status_view, name="grading_job_status"),
     path("problems/add", views.create_problem, name="add_problem"),
     path("problems/", views.ProblemView.as_view(), name="all_problems"),
     path('problems/<int:pk>/details', views.problem_details_view, name="problem_details"),
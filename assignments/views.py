@@ -1,6 +1,7 @@
 import datetime
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
 from django.db.models import Q
 from django.forms import inlineformset_factory
 from django.http import HttpResponseRedirect, HttpResponse
@@ -33,7 +34,8 @@ from .forms import (
     StudentProblemProofForm,
     StudentProblemForm,
 )
-from .models import AssignmentDelay
+from .grading import enqueue_grading, enqueue_problem_regrade
+from .models import AssignmentDelay, GradingJob
 
 
 @login_required
@@ -215,42 +217,8 @@ def assignment_details_view(request, pk=None):
             assignment = form.save(commit=False)
             if request.user.is_student:
                 get_student = Student.objects.get(user=request.user)
-                get_proof = StudentProblemSolution.objects.filter(
-                    assignment=assignment, student=get_student
-                )
-
-                for i in get_proof:
-                    get_proof = i.proof
-                    prooff = ProofObj(lines=[])  #
-                    prooff.rules = str(get_proof.rules)
-                    prooff.premises = get_premises(get_proof.premises)
-                    prooff.conclusion = str(get_proof.conclusion)
-                    get_lines = ProofLine.objects.filter(proof=get_proof)
-                    for line in get_lines:
-                        print(line)
-                        proofline = ProofLineObj()
-                        proofline.line_no = str(line.line_no)
-                        proofline.expression = str(line.formula)
-                        proofline.rule = str(line.rule)
-                        prooff.lines.append(proofline)
-                    if (prooff.rules == "fol_basic") or (prooff.rules == "fol_derived"):
-
-                        parser = folparser.parser
-                    else:
-                        parser = tflparser.parser
-                    response = verify_proof(prooff, parser)
-                    if response.err_msg:
-                        i.grade = 0
-                        i.save()
-                    else:
-                        if get_lines.count() <= i.problem.target_steps:
-                            i.grade = i.problem.point
-                            i.save()
-                        else:
-                            more_line = get_lines.count() - i.problem.target_steps
-                            scroe_lost = more_line * i.problem.lost_points
-                            i.grade = i.problem.point - scroe_lost
-                            i.save()
+                # Graded by the grading_worker command; the details page polls for the result
+                enqueue_grading(assignment, get_student)
             # print("dddddd", response.err_msg)
 
             # if studentPk is not None:
@@ -259,10 +227,14 @@ def assignment_details_view(request, pk=None):
             assignment.problems.add(*problems)
             assignment.save()
 
+            if request.user.is_student:
+                return HttpResponseRedirect(reverse("assignment_details", args=[assignment.pk]))
             return HttpResponseRedirect(reverse("all_assignments"))
         else:
             messages.error(request, form.errors)
 
+    grading_job = GradingJob.objects.filter(assignment=assignment, student_id=studentPk).first()
+
     # if request.user.is_student:
     #     form.disabled_all();
     context = {
@@ -275,10 +247,26 @@ def assignment_details_view(request, pk=None):
         'assignment_delay': user_assignment_delay_obj,
         'submission': submission_allowed,
         'grading': all_problem_grading_complete,
+        'grading_job': grading_job,
     }
     return render(request, "assignments/assignment_details.html", context)
 
 
+@login_required
+def grading_job_status_view(request, pk):
+    """
+    The grading status of a submission, polled by the assignment details page.
+    Reloads the page once the job has finished
+    """
+    job = get_object_or_404(GradingJob, pk=pk)
+    if not (request.user.is_instructor or job.student.user == request.user):
+        raise PermissionDenied
+    response = render(request, "assignments/grading_status.html", {"grading_job": job})
+    if not job.in_progress:
+        response["HX-Refresh"] = "true"
+    return response
+
+
 class AssignmentDeleteView(DeleteView):
     model = Assignment
     template_name = "assignments/delete_assignment.html"
@@ -383,6 +371,12 @@ def problem_details_view(request, pk=None):
             problem.save()
             messages.success(request, "Problem saved successfully")
 
+            if set(problem_form.changed_data) & {"point", "target_steps", "lost_points"}:
+                # Regraded by the grading_worker command
+                queued = enqueue_problem_regrade(problem)
+                if queued:
+                    messages.info(request, "{} submissions will be regraded".format(queued))
+
             if assignmentPk is not None:
                 # problem page loaded from assignment page
                 return HttpResponseRedirect(
@@ -0,0 +1,81 @@
+"""
+Startup-time benchmark for the yacc parsers
+
+Compares constructing each grammar's LALR tables from scratch (what every
+import used to do) with loading the tables persisted in proofchecker/utils/parsetabs,
+both in-process and as the cost of importing the three parsers in a fresh interpreter
+
+Usage: python benchmarks/parser_startup.py [repeat]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from proofchecker.utils import folparser, numparser, tflparser
+from proofchecker.utils.lrtables import TABLE_DIR, build_parser
+
+# Imports the three parsers in a fresh interpreter, reading tables from argv[1]
+IMPORT_SCRIPT = '''
+import sys, time
+from proofchecker.utils import lrtables
+lrtables.TABLE_DIR = sys.argv[1]
+start = time.perf_counter()
+from proofchecker.utils import tflparser, folparser, numparser
+print(time.perf_counter() - start)
+'''
+
+
+def time_import(table_dir):
+    """
+    Returns the time (in seconds) to import the parsers in a new process
+    """
+    output = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT, table_dir],
+        cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    return float(output.split()[-1])
+
+
+def main(repeat=20):
+    total_rebuild = 0
+    total_cached = 0
+
+    print('Parser construction (in-process, best of {})'.format(repeat))
+    print('{:<8}{:>14}{:>14}{:>10}'.format('grammar', 'rebuild (ms)', 'cached (ms)', 'speedup'))
+    for grammar in (tflparser, folparser, numparser):
+        name = grammar.parser.name
+
+        # Make sure a table file exists before timing the cached path
+        build_parser(name, module=grammar, refresh=True)
+
+        rebuild = min(timeit.repeat(
+            lambda: build_parser(name, module=grammar, use_cache=False), number=1, repeat=repeat))
+        cached = min(timeit.repeat(
+            lambda: build_parser(name, module=grammar), number=1, repeat=repeat))
+
+        total_rebuild += rebuild
+        total_cached += cached
+        print('{:<8}{:>14.2f}{:>14.2f}{:>9.1f}x'.format(name, rebuild * 1000, cached * 1000, rebuild / cached))
+
+    print('{:<8}{:>14.2f}{:>14.2f}{:>9.1f}x'.format(
+        'total', total_rebuild * 1000, total_cached * 1000, total_rebuild / total_cached))
+
+    # Each cold run gets an empty table directory, so every grammar is rebuilt
+    runs = max(3, repeat // 4)
+    cold = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as empty_dir:
+            cold.append(time_import(empty_dir))
+    warm = [time_import(TABLE_DIR) for _ in range(runs)]
+
+    print()
+    print('Importing tflparser, folparser and numparser in a new process (best of {})'.format(runs))
+    print('{:<14}{:>10.2f} ms'.format('no tables', min(cold) * 1000))
+    print('{:<14}{:>10.2f} ms'.format('cached tables', min(warm) * 1000))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
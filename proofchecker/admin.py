@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 
 from .models import User, Proof, Problem, Student, Instructor, Assignment, Course, ProofLine, \
-    StudentProblemSolution
+    ProofVerification, StudentProblemSolution
 
 # Register your models here.
 admin.site.register(User)
@@ -12,6 +12,7 @@ admin.site.register(Instructor)
 admin.site.register(Assignment)
 admin.site.register(Course)
 admin.site.register(StudentProblemSolution)
+admin.site.register(ProofVerification)
 
 
 class ProofLineInline(admin.TabularInline):
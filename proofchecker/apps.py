@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ProofcheckerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'proofchecker'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.7 on 2026-10-18 09:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('proofchecker', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProofVerification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('is_valid', models.BooleanField(default=False)),
+                ('is_complete', models.BooleanField(default=False)),
+                ('err_msg', models.TextField(blank=True, null=True)),
+                ('duration', models.FloatField(default=0)),
+                ('verified_on', models.DateTimeField(default=django.utils.timezone.now)),
+                ('proof', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='verification', to='proofchecker.proof')),
+            ],
+        ),
+    ]
@@ -2,8 +2,10 @@ from PIL import Image
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from proofchecker.proofs.proofobjects import ProofResponse
 from proofchecker.proofs.proofutils import is_line_no, make_tree
 from proofchecker.utils import tflparser
 
@@ -117,6 +119,25 @@ class Proof(models.Model):
         return "/proofs"
 
 
+class ProofVerification(models.Model):
+    """
+    The stored result of verifying a saved proof.  content_hash is the
+    proof_digest of the proof when it was verified, so the result is
+    only reused while the proof is unchanged
+    """
+    proof = models.OneToOneField(Proof, on_delete=models.CASCADE, related_name='verification')
+    content_hash = models.CharField(max_length=64)
+    is_valid = models.BooleanField(default=False)
+    is_complete = models.BooleanField(default=False)
+    err_msg = models.TextField(null=True, blank=True)
+    # Seconds spent verifying the proof
+    duration = models.FloatField(default=0)
+    verified_on = models.DateTimeField(default=timezone.now)
+
+    def response(self):
+        return ProofResponse(is_valid=self.is_valid, err_msg=self.err_msg, duration=self.duration)
+
+
 class ProofLine(models.Model):
     proof = models.ForeignKey(Proof, on_delete=models.CASCADE)
     line_no = models.CharField(max_length=100, validators=[validate_line_no])
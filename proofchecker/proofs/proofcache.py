@@ -0,0 +1,321 @@
+# Results of earlier verifications, so checking a proof again after an
+# edit only verifies the edited lines and the lines depending on them,
+# and a rule application already checked (for any user) is not checked again
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from proofchecker.proofs.proofindex import get_index
+from proofchecker.proofs.proofobjects import ProofObj, ProofResponse
+from proofchecker.proofs.proofutils import premise_list
+from proofchecker.rules.rulechecker import rule_registry
+
+# Maximum number of proofs whose results are kept (per process)
+MAX_PROOFS = 1024
+
+# Maximum number of rule applications whose results are kept (per process)
+MAX_RULE_RESULTS = 65536
+
+# Part of every proof_digest: bump it when a change to the rules may
+# change the result of verifying an existing proof
+VERIFIER_VERSION = 1
+
+
+def digest(*parts):
+    """
+    Returns a short hex digest of a tuple of strings
+    """
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def proof_digest(proof: ProofObj):
+    """
+    Returns a digest of everything verify_proof reads from a proof:
+    the rules, premises, conclusion and lines in order
+    """
+    lines = tuple((str(line.line_no), str(line.expression), str(line.rule)) for line in proof.lines)
+    premises = tuple(str(premise) for premise in premise_list(proof.premises))
+    return digest(str(VERIFIER_VERSION), str(proof.rules), premises, str(proof.conclusion), lines)
+
+
+class LineGraph:
+    """
+    The citation graph of a compiled proof and a fingerprint per line.
+    A line's fingerprint covers its line number, expression and rule,
+    the ruleset and parser, and the fingerprints of the lines it cites,
+    so editing a line changes the fingerprint of every line depending
+    on it (directly or not).
+    Rules that look beyond their citations also include the premises
+    (uses_premises) or every line of the proof (uses_scope)
+    """
+    def __init__(self, compiled, proof: ProofObj, parser):
+        index = get_index(proof)
+        positions = dict((id(line), position) for position, line in enumerate(proof.lines))
+        context = (str(getattr(parser, 'name', id(parser))), str(proof.rules))
+        contents = [(str(line.line_no), str(line.expression), str(line.rule)) for line in proof.lines]
+        proof_digest = None
+
+        # Position -> positions of the cited lines (and subproof bounds)
+        self.cited = []
+        # Position -> fingerprint
+        self.fingerprints = []
+
+        for position, compiled_line in enumerate(compiled.lines):
+            try:
+                citation = compiled_line.citation
+            except Exception:
+                citation = None
+
+            cited = []
+            rule = None
+            if citation is not None:
+                for line_no in citation.line_nos:
+                    line = index.get_line(line_no)
+                    if line is not None:
+                        cited.append(positions[id(line)])
+                    try:
+                        subproof = index.get_subproof(line_no)
+                    except SyntaxError:
+                        subproof = None
+                    if subproof is not None:
+                        cited.extend([positions[id(subproof[0])], positions[id(subproof[1])]])
+                rule = rule_registry.get_rule(proof.rules, citation.symbol)
+            self.cited.append(cited)
+
+            # Cited lines that come later (an invalid citation) are
+            # not fingerprinted yet, use their contents instead
+            cited_digests = []
+            for i in cited:
+                if i < position:
+                    cited_digests.append(self.fingerprints[i])
+                else:
+                    cited_digests.append(digest(*contents[i]))
+
+            extra = ''
+            if rule is not None:
+                if getattr(rule, 'uses_premises', False):
+                    extra = repr(proof.premises)
+                if getattr(rule, 'uses_scope', False):
+                    if proof_digest is None:
+                        proof_digest = digest(*[digest(*content) for content in contents])
+                    extra = proof_digest
+
+            self.fingerprints.append(digest(context, contents[position],
+                type(rule).__name__, extra, tuple(cited_digests)))
+
+
+class LineResults:
+    """
+    The cached results for the lines of one proof.
+    get returns a new ProofResponse, so cached results are never modified
+    """
+    def __init__(self, cache, graph: LineGraph, entries: dict):
+        self.cache = cache
+        self.graph = graph
+        self.entries = entries
+
+    def get(self, position: int):
+        """
+        Returns the cached result of the line at position (or None)
+        """
+        entry = self.entries.get(self.graph.fingerprints[position])
+        self.cache.count(entry is not None)
+        if entry is None:
+            return None
+        return ProofResponse(is_valid=entry[0], err_msg=entry[1])
+
+    def put(self, position: int, response: ProofResponse):
+        """
+        Store the result of the line at position
+        """
+        self.entries[self.graph.fingerprints[position]] = (response.is_valid, response.err_msg)
+
+
+class VerificationCache:
+    """
+    A bounded LRU cache of line results, keyed by proof
+    (e.g. a proof id, or the session of an unsaved proof).
+    Only the results of the lines in the latest version of a proof are kept
+    """
+
+    def __init__(self, max_proofs=MAX_PROOFS):
+        self.max_proofs = max_proofs
+        self.proofs = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def results_for(self, key, compiled, proof: ProofObj, parser):
+        """
+        Returns the LineResults of the current version of a proof,
+        keeping the results of the lines whose fingerprint did not change
+        """
+        graph = LineGraph(compiled, proof, parser)
+        with self.lock:
+            previous = self.proofs.get(key, {})
+            entries = dict((fingerprint, previous[fingerprint])
+                for fingerprint in graph.fingerprints if fingerprint in previous)
+            self.proofs[key] = entries
+            self.proofs.move_to_end(key)
+            while len(self.proofs) > self.max_proofs:
+                self.proofs.popitem(last=False)
+        return LineResults(self, graph, entries)
+
+    def count(self, hit: bool):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self):
+        """
+        Remove every proof and reset the counters
+        """
+        with self.lock:
+            self.proofs.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Returns the number of cached proofs, and the number of lines
+        reused (hits) and verified again (misses)
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'proofs': len(self.proofs),
+                'max_proofs': self.max_proofs,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+# The cache shared by every call to verify_proof with a cache key
+verification_cache = VerificationCache()
+
+
+def canonical(expression, compiled):
+    """
+    Returns the canonical form of an expression: its (interned) tree,
+    or the expression itself if it cannot be parsed
+    """
+    tree, err = compiled.parse(expression)
+    if err is not None:
+        return ('error', expression)
+    return tree
+
+
+def rule_key(rule, citation, current_line, proof: ProofObj, compiled):
+    """
+    Returns the key of a rule application: the rule, the canonical forms
+    of the current expression and of the cited lines, and the line numbers
+    (error messages quote them, and they determine the subproof shape
+    checked by verify_line_citation).
+    Returns None for rules whose result depends on lines they do not cite
+    """
+    if getattr(rule, 'uses_scope', False):
+        return None
+
+    index = get_index(proof)
+    cited = []
+    for line_no in citation.line_nos:
+        line = index.get_line(line_no)
+        if line is not None:
+            cited.append((str(line.line_no), canonical(line.expression, compiled)))
+        else:
+            cited.append(None)
+        try:
+            subproof = index.get_subproof(line_no)
+        except SyntaxError:
+            subproof = None
+        if subproof is not None:
+            cited.append(tuple((str(line.line_no), canonical(line.expression, compiled)) for line in subproof))
+
+    key = [getattr(compiled.parser, 'name', id(compiled.parser)), str(proof.rules), type(rule),
+        str(current_line.rule), str(current_line.line_no), canonical(current_line.expression, compiled), tuple(cited)]
+    if getattr(rule, 'uses_premises', False):
+        key.append(tuple(canonical(premise, compiled) for premise in compiled.premises))
+    if getattr(rule, 'quotes_expressions', False):
+        # The error messages include the expressions as written
+        key.append(str(current_line.expression))
+        key.append(tuple(str(line.expression) for line in index.lines if str(line.line_no) in citation.line_nos))
+    return tuple(key)
+
+
+class RuleCache:
+    """
+    A bounded LRU cache of rule results keyed by rule_key, shared by every
+    proof (and every user) in the process.
+    Results are stored as (is_valid, err_msg) and returned as new ProofResponses
+    """
+
+    def __init__(self, max_size=MAX_RULE_RESULTS):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def verify(self, rule, citation, current_line, proof: ProofObj, compiled):
+        """
+        Returns the result of rule.verify, calling it only on a cache miss
+        """
+        try:
+            key = rule_key(rule, citation, current_line, proof, compiled) if self.max_size > 0 else None
+            hash(key)
+        except Exception:
+            key = None
+        if key is None:
+            return rule.verify(current_line, proof, compiled.parser)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return ProofResponse(is_valid=entry[0], err_msg=entry[1])
+            self.misses += 1
+
+        response = rule.verify(current_line, proof, compiled.parser)
+
+        with self.lock:
+            self.entries[key] = (response.is_valid, response.err_msg)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return response
+
+    def clear(self):
+        """
+        Remove every entry and reset the counters
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """
+        Returns the cache counters, e.g. for tuning MAX_RULE_RESULTS
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+# The cache shared by every call to verify_rule
+rule_cache = RuleCache()
@@ -1,13 +1,47 @@
-from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj, ProofResponse
-from proofchecker.proofs.proofutils import fix_rule_whitespace_issues, make_tree, is_conclusion, depth, clean_rule
-from proofchecker.rules.rulechecker import RuleChecker
+import concurrent.futures
+import os
+import time
+
+from proofchecker.proofs.proofcache import LineResults, rule_cache, verification_cache
+from proofchecker.proofs.proofobjects import LineNumber, LineResponse, ProofObj, ProofLineObj, ProofResponse
+from proofchecker.proofs.proofutils import CompiledLine, CompiledProof, compile_proof, is_conclusion, premise_list
+from proofchecker.rules.rulechecker import rule_registry
+from proofchecker.semantics.oracle import check_entailment
+from proofchecker.utils import folparser, tflparser
 from proofchecker.utils.constants import Constants
 from proofchecker.utils.tfllexer import IllegalCharacterError
 
-def verify_proof(proof: ProofObj, parser):
+FOL_RULESETS = ('fol_basic', 'fol_derived')
+
+# Batches smaller than this are verified by verify_proofs in the calling process
+MIN_POOL_BATCH = 8
+
+# The parsers of a verify_proofs worker process, by ruleset family
+_worker_parsers = {}
+
+
+def get_parser(rules: str):
+    """
+    Returns the parser for a ruleset
+    """
+    if rules in FOL_RULESETS:
+        return folparser.parser
+    return tflparser.parser
+
+
+def verify_proof(proof: ProofObj, parser, full_report=False, cache_key=None, semantic_check=False):
     """
     Verify if a proof is valid, line by line.  
-    Returns a ProofResponse, which contains an error message if invalid
+    Returns a ProofResponse, which contains an error message if invalid.
+    With full_report=True every line is verified (instead of stopping at
+    the first error) and the result of each line is returned in
+    response.line_responses.
+    With a cache_key (e.g. the proof id), lines that did not change since
+    the last verification under that key, and do not cite a changed line,
+    reuse their previous result.
+    With semantic_check=True (TFL rulesets only), a line that is not
+    entailed by the lines it cites fails with a countermodel before the
+    rule itself is checked
     """
     response = ProofResponse()
 
@@ -15,37 +49,33 @@ def verify_proof(proof: ProofObj, parser):
         response.err_msg = "Cannot validate a proof with no lines"
         return response
 
-    for line in proof.lines:
+    # Parse every line, premise and the conclusion once
+    compiled = compile_proof(proof, parser, refresh=True)
 
-        # Verify the line has a line number
-        if not line.line_no:
-            response.err_msg = "One or more lines is missing a line number"
-            return response
+    results = None
+    if cache_key is not None:
+        results = verification_cache.results_for((cache_key, semantic_check), compiled, proof, parser)
 
-        # Verify the line has an expression
-        if (not line.expression) or (line.expression == ''):
-            response.err_msg = "No expression on line {}"\
-                .format(str(line.line_no))
-            return response
+    # Report malformed premises once, before any line
+    premise_response = verify_premises(compiled, proof)
 
-        # Verify the expression is valid
-        try:
-            make_tree(line.expression, parser)
-        except IllegalCharacterError as char_err:
-            response.err_msg = "{} on line {}"\
-                .format(char_err.message, str(line.line_no))
-            return response 
-        except:
-            response.err_msg = 'Syntax error on line {}.  Expression "{}" does not conform to ruleset "{}"'\
-                .format(str(line.line_no), line.expression, Constants.RULES_CHOICES.get(proof.rules))
-            return response
-        
-        # Verify the rule is valid
-        response = verify_rule(line, proof, parser)
+    if full_report:
+        response = verify_all_lines(compiled, proof, parser, results, semantic_check)
+        if not premise_response.is_valid:
+            response.is_valid = False
+            response.err_msg = premise_response.err_msg
         if not response.is_valid:
             return response
+    elif not premise_response.is_valid:
+        return premise_response
+    else:
+        for position, compiled_line in enumerate(compiled.lines):
+            response = check_line(position, compiled_line, proof, parser, results, semantic_check)
+            if not response.is_valid:
+                return response
 
-    last_line = proof.lines[len(proof.lines)-1]
+    last_compiled_line = compiled.lines[len(compiled.lines)-1]
+    last_line = last_compiled_line.line
     conclusion = is_conclusion(last_line, proof, parser)
     response.is_valid = True
 
@@ -54,7 +84,7 @@ def verify_proof(proof: ProofObj, parser):
         if (last_line.rule.casefold() == 'assumption') or (last_line.rule.casefold() == 'assumpt'):
             response.err_msg = "Proof cannot be concluded with an assumption"
             return response            
-        elif depth(last_line.line_no) > 1:
+        elif last_compiled_line.depth > 1:
             response.err_msg = "Proof cannot be concluded within a subproof"
             return response
         else:
@@ -68,21 +98,246 @@ def verify_proof(proof: ProofObj, parser):
         return response
 
 
-def verify_rule(current_line: ProofLineObj, proof: ProofObj, parser):
+def verify_premises(compiled: CompiledProof, proof: ProofObj):
+    """
+    Verify every premise of a compiled proof is a valid expression
+    Returns a ProofResponse with the error of the first malformed premise
+    """
+    response = ProofResponse()
+    errors = compiled.premise_index.errors
+    if not errors:
+        response.is_valid = True
+        return response
+
+    premise, err = errors[0]
+    if isinstance(err, IllegalCharacterError):
+        response.err_msg = '{} in premise "{}"'\
+            .format(err.message, premise)
+    else:
+        response.err_msg = 'Syntax error in premise "{}".  Expression does not conform to ruleset "{}"'\
+            .format(premise, Constants.RULES_CHOICES.get(proof.rules))
+    return response
+
+
+def verify_line(compiled_line: CompiledLine, proof: ProofObj, parser, semantic_check=False):
+    """
+    Verify a single line of a compiled proof
+    (line number, expression, syntax and rule)
+    Returns a ProofResponse
+    """
+    response = ProofResponse()
+    line = compiled_line.line
+
+    # Verify the line has a line number
+    if not line.line_no:
+        response.err_msg = "One or more lines is missing a line number"
+        return response
+
+    # Verify the line has an expression
+    if (not line.expression) or (line.expression == ''):
+        response.err_msg = "No expression on line {}"\
+            .format(str(line.line_no))
+        return response
+
+    # Verify the expression is valid
+    try:
+        compiled_line.tree
+    except IllegalCharacterError as char_err:
+        response.err_msg = "{} on line {}"\
+            .format(char_err.message, str(line.line_no))
+        return response 
+    except:
+        response.err_msg = 'Syntax error on line {}.  Expression "{}" does not conform to ruleset "{}"'\
+            .format(str(line.line_no), line.expression, Constants.RULES_CHOICES.get(proof.rules))
+        return response
+
+    # Verify the rule is valid
+    return verify_rule(line, proof, parser, semantic_check)
+
+
+def check_line(position: int, compiled_line: CompiledLine, proof: ProofObj, parser, results: LineResults = None,
+    semantic_check=False):
+    """
+    Verify a line, reusing its cached result if available
+    """
+    if results is None:
+        return verify_line(compiled_line, proof, parser, semantic_check)
+
+    response = results.get(position)
+    if response is None:
+        response = verify_line(compiled_line, proof, parser, semantic_check)
+        results.put(position, response)
+    return response
+
+
+def verify_all_lines(compiled: CompiledProof, proof: ProofObj, parser, results: LineResults = None,
+    semantic_check=False):
+    """
+    Verify every line of a compiled proof, without stopping at the first error.
+    Lines citing a line (or subproof) that failed, directly or through
+    other lines, are marked as depending on it.
+    Returns a ProofResponse with one LineResponse per line; the error
+    message of the ProofResponse is the one of the first invalid line
+    """
+    response = ProofResponse()
+    response.is_valid = True
+
+    # Prefixes of the line numbers of failed lines (a failed line 2.3
+    # also taints a citation of subproof 2)
+    failed = set()
+
+    for position, compiled_line in enumerate(compiled.lines):
+        line = compiled_line.line
+        result = check_line(position, compiled_line, proof, parser, results, semantic_check)
+        line_response = LineResponse(line.line_no, result.is_valid, result.err_msg)
+
+        # Find the cited lines that failed
+        try:
+            cited_line_nos = compiled_line.citation.line_nos
+        except:
+            cited_line_nos = []
+        for cited_line_no in cited_line_nos:
+            try:
+                if LineNumber.parse(cited_line_no) in failed:
+                    line_response.depends_on.append(cited_line_no)
+            except SyntaxError:
+                pass
+
+        if (not line_response.is_valid) or line_response.depends_on:
+            try:
+                number = LineNumber.parse(line.line_no)
+                for k in range(1, len(number)+1):
+                    failed.add(number[:k])
+            except SyntaxError:
+                pass
+
+        if (not line_response.is_valid) and response.is_valid:
+            response.is_valid = False
+            response.err_msg = line_response.err_msg
+        response.line_responses.append(line_response)
+
+    return response
+
+
+def verify_rule(current_line: ProofLineObj, proof: ProofObj, parser, semantic_check=False):
     """
     Determines what rule is being applied, then calls the appropriate
     function to verify the rule is applied correctly
+    (after the semantic check, if enabled)
     """
-    rule_str = clean_rule(current_line.rule)
-    fixed_rule = fix_rule_whitespace_issues(rule_str)
-    rule_symbols = fixed_rule.split()[0]
-    rule_checker = RuleChecker()
-    rule = rule_checker.get_rule(rule_symbols, proof)
+    compiled = compile_proof(proof, parser)
+    citation = compiled.line(current_line).citation
+    rule_symbols = citation.symbol
+    rule = rule_registry.get_rule(proof.rules, rule_symbols)
 
     if rule == None:
         response = ProofResponse()
         response.err_msg = 'Rule "{}" on line {} not found in ruleset "{}"'\
             .format(rule_symbols, str(current_line.line_no), Constants.RULES_CHOICES.get(proof.rules))
         return response     
-    else:
-        return rule.verify(current_line, proof, parser)
\ No newline at end of file
+
+    if semantic_check:
+        response = check_entailment(current_line, proof, parser)
+        if response is not None:
+            return response
+
+    return rule_cache.verify(rule, citation, current_line, proof, compiled)
+
+
+def _init_worker():
+    """
+    Runs once in each worker process of verify_proofs, so the parsers
+    are built (or inherited from the parent) before the first proof arrives
+    """
+    _worker_parsers['fol'] = folparser.parser
+    _worker_parsers['tfl'] = tflparser.parser
+
+
+def _verify_chunk(chunk, full_report, semantic_check):
+    """
+    Verify a list of (index, proof) in a worker process
+    Returns a list of (index, ProofResponse)
+    """
+    results = []
+    for index, proof in chunk:
+        parser = _worker_parsers['fol' if proof.rules in FOL_RULESETS else 'tfl']
+        results.append((index, _timed_verify(proof, parser, full_report, semantic_check)))
+    return results
+
+
+def _timed_verify(proof: ProofObj, parser, full_report, semantic_check):
+    """
+    Verify a proof, setting the duration of the response
+    """
+    start = time.perf_counter()
+    response = verify_proof(proof, parser, full_report, semantic_check=semantic_check)
+    response.duration = time.perf_counter() - start
+    return response
+
+
+def _portable(proof: ProofObj, ruleset=None):
+    """
+    Returns a copy of a proof holding only what is sent to a worker process
+    (not the trees compiled by an earlier verification)
+    """
+    return ProofObj(
+        rules=ruleset or proof.rules,
+        premises=premise_list(proof.premises),
+        conclusion=proof.conclusion,
+        lines=[ProofLineObj(line.line_no, line.expression, line.rule) for line in proof.lines]
+    )
+
+
+def proof_pool(workers=None):
+    """
+    Returns a process pool for verify_proofs, to share between batches
+    (workers defaults to the number of CPUs)
+    """
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+        initializer=_init_worker)
+
+
+def verify_proofs(proofs, ruleset=None, workers=None, ordered=True, chunksize=None,
+    full_report=False, semantic_check=False, executor=None):
+    """
+    Verify many proofs in a pool of worker processes (workers defaults to
+    the number of CPUs).  ruleset, if given, replaces the rules of every proof.
+    Yields (index, ProofResponse) for each proof, index being its position
+    in proofs: in input order, or with ordered=False in the order the
+    proofs are verified.  The duration of each response is set.
+    A pool from proof_pool may be given as executor, so a series of
+    batches starts its worker processes once; otherwise one is started
+    for this batch.
+    Small batches, and workers=1, are verified in this process
+    """
+    proofs = [(index, _portable(proof, ruleset)) for index, proof in enumerate(proofs)]
+    workers = workers or os.cpu_count() or 1
+
+    if (workers == 1) or (len(proofs) < MIN_POOL_BATCH):
+        for index, proof in proofs:
+            yield index, _timed_verify(proof, get_parser(proof.rules), full_report, semantic_check)
+        return
+
+    # A few chunks per worker, so a slow chunk does not hold up the others
+    chunksize = chunksize or max(1, min(32, len(proofs) // (workers * 4)))
+    chunks = [proofs[i:i+chunksize] for i in range(0, len(proofs), chunksize)]
+
+    if executor is not None:
+        yield from _run_chunks(executor, chunks, ordered, full_report, semantic_check)
+        return
+    with proof_pool(min(workers, len(chunks))) as executor:
+        yield from _run_chunks(executor, chunks, ordered, full_report, semantic_check)
+
+
+def _run_chunks(executor, chunks, ordered, full_report, semantic_check):
+    """
+    Yields the (index, ProofResponse) of the chunks verified by a pool
+    """
+    futures = [executor.submit(_verify_chunk, chunk, full_report, semantic_check) for chunk in chunks]
+    try:
+        for future in (futures if ordered else concurrent.futures.as_completed(futures)):
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
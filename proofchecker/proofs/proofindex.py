@@ -0,0 +1,219 @@
+import heapq
+from bisect import bisect_right
+
+from proofchecker.proofs.proofobjects import LineNumber, ProofObj
+
+# Indexes built once per proof, so citations can be resolved
+# without scanning every line of the proof
+
+# Mask with every bit set, used for expressions that cannot be scanned
+UNKNOWN_MASK = -1
+
+
+def letter_bit(ch):
+    """
+    Returns the bit for a lowercase letter (FOL names a-r and variables s-z),
+    or None for any other character
+    """
+    if isinstance(ch, str) and (len(ch) == 1) and ('a' <= ch <= 'z'):
+        return 1 << (ord(ch) - ord('a'))
+    return None
+
+
+def letter_mask(expression):
+    """
+    Returns a bitmask of the lowercase letters (names and variables)
+    appearing anywhere in an expression
+    """
+    if not isinstance(expression, str):
+        return UNKNOWN_MASK
+    mask = 0
+    for ch in expression:
+        if 'a' <= ch <= 'z':
+            mask |= 1 << (ord(ch) - ord('a'))
+    return mask
+
+
+class ScopeTree:
+    """
+    The subproof structure of a proof.  Each scope (the main proof,
+    or a subproof such as 2.3) holds the lines written directly in it,
+    in proof order, so the lines in scope at a given line can be listed
+    by walking up its enclosing scopes.
+    Every line also carries a bitmask of the names and variables in
+    its expression, and each scope keeps cumulative unions of these
+    masks, so the names used by all lines in scope are one lookup per depth
+    """
+    def __init__(self):
+        # Scope prefix (e.g. (2, 3) for subproof 2.3) -> [(position, last number, line, mask)]
+        self.scopes = {}
+        # Line number -> [(line, mask)]
+        self.numbered = {}
+        # Scope prefix -> ([last numbers, ascending], [union of masks up to that number])
+        self.cumulative = None
+
+    def add(self, position: int, number: LineNumber, line):
+        """
+        Add a line to the scope it was written in
+        """
+        mask = letter_mask(line.expression)
+        self.scopes.setdefault(number[:-1], []).append((position, number[-1], line, mask))
+        self.numbered.setdefault(number, []).append((line, mask))
+        self.cumulative = None
+
+    def build_cumulative_masks(self):
+        """
+        Compute the running union of line masks in each scope,
+        ordered by line number
+        """
+        self.cumulative = {}
+        for prefix, scope in self.scopes.items():
+            numbers = []
+            masks = []
+            mask = 0
+            for entry in sorted(scope, key=lambda entry: entry[1]):
+                mask |= entry[3]
+                if numbers and numbers[-1] == entry[1]:
+                    masks[-1] = mask
+                else:
+                    numbers.append(entry[1])
+                    masks.append(mask)
+            self.cumulative[prefix] = (numbers, masks)
+
+    def scope_mask(self, number: LineNumber, exclude=None):
+        """
+        Returns the union of the masks of all lines in scope at a
+        line number (see lines_in_scope), leaving out the line exclude
+        """
+        if self.cumulative is None:
+            self.build_cumulative_masks()
+
+        mask = 0
+        for k in range(len(number)):
+            limit = number[k]
+            # Lines numbered exactly like number are added below, one by one
+            if k == len(number)-1:
+                limit -= 1
+            cumulative = self.cumulative.get(number[:k])
+            if cumulative:
+                i = bisect_right(cumulative[0], limit)
+                if i > 0:
+                    mask |= cumulative[1][i-1]
+
+        for line, line_mask in self.numbered.get(number, []):
+            if line is not exclude:
+                mask |= line_mask
+        return mask
+
+    def lines_in_scope(self, number: LineNumber):
+        """
+        Returns an iterator over the lines in scope at a line number
+        (the lines it may cite, including lines with the same number), in proof order.
+        At each depth k these are the lines of the enclosing scope number[:k-1]
+        that are numbered at most number[k-1]
+        """
+        levels = []
+        for k in range(len(number)):
+            scope = self.scopes.get(number[:k])
+            if scope:
+                levels.append(entries_up_to(scope, number[k]))
+        return (entry[2] for entry in heapq.merge(*levels, key=lambda entry: entry[0]))
+
+
+def entries_up_to(scope: list, limit: int):
+    """
+    Yields the entries of a scope numbered at most limit
+    """
+    for entry in scope:
+        if entry[1] <= limit:
+            yield entry
+
+
+class ProofIndex:
+    """
+    Maps the line numbers of a proof to its lines, and each subproof
+    (e.g. '2' for lines 2.1 - 2.4) to its first and last line.
+    Also holds the ScopeTree of the proof
+    """
+    def __init__(self, proof: ProofObj):
+        self.lines = proof.lines
+        self.size = len(proof.lines)
+        self.by_line_no = {}
+        self.subproofs = {}
+        self.scope_tree = ScopeTree()
+
+        for position, line in enumerate(proof.lines):
+            # Keep the first line with a given line number
+            self.by_line_no.setdefault(str(line.line_no), line)
+
+            try:
+                number = LineNumber.parse(line.line_no)
+            except SyntaxError:
+                continue
+            self.scope_tree.add(position, number, line)
+            if number.depth > 1:
+                subproof = self.subproofs.get(number[:-1])
+                if subproof is None:
+                    self.subproofs[number[:-1]] = [line, line]
+                else:
+                    subproof[1] = line
+
+    def is_current(self, proof: ProofObj):
+        """
+        Returns False if lines were added, removed or replaced since the index was built
+        (lines edited in place are only seen by compile_proof with refresh=True)
+        """
+        return (proof.lines is self.lines) and (len(proof.lines) == self.size)
+
+    def get_line(self, line_no: str):
+        """
+        Returns the first line with the given line number (or None)
+        """
+        return self.by_line_no.get(str(line_no))
+
+    def get_subproof(self, line_no: str):
+        """
+        Returns the first and last line of a subproof (or None)
+        Raises a SyntaxError if line_no is not a valid line number
+        """
+        subproof = self.subproofs.get(tuple(LineNumber.parse(line_no)))
+        if subproof is None:
+            return None
+        return [subproof[0], subproof[1]]
+
+    def lines_in_scope(self, line_no: str):
+        """
+        Returns an iterator over the lines in scope at line_no
+        (nothing is in scope at an invalid line number)
+        """
+        try:
+            number = LineNumber.parse(line_no)
+        except SyntaxError:
+            return iter(())
+        return self.scope_tree.lines_in_scope(number)
+
+    def may_appear_in_scope(self, ch: str, line):
+        """
+        Returns False if ch (a name or variable) is certainly absent from
+        every line citable from line, using one bitwise AND.
+        Returns True if it may appear (the lines must then be checked)
+        """
+        bit = letter_bit(ch)
+        if bit is None:
+            return True
+        try:
+            number = LineNumber.parse(line.line_no)
+        except SyntaxError:
+            return False
+        return (self.scope_tree.scope_mask(number, exclude=line) & bit) != 0
+
+
+def get_index(proof: ProofObj):
+    """
+    Returns the ProofIndex of a proof, building it if necessary
+    """
+    index = proof.index
+    if (index is None) or (not index.is_current(proof)):
+        index = ProofIndex(proof)
+        proof.index = index
+    return index
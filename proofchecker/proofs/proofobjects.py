@@ -1,3 +1,6 @@
+import re
+from functools import lru_cache
+
 # Objects
 class ProofObj:
     
@@ -7,6 +10,8 @@ class ProofObj:
         self.conclusion = conclusion
         self.lines = lines
         self.created_by = created_by
+        self.compiled = None
+        self.index = None
     
     def __str__(self):
         result = ''
@@ -33,6 +38,99 @@ class ProofLineObj:
 
 class ProofResponse:
 
-    def __init__(self, is_valid=False, err_msg=None):
+    def __init__(self, is_valid=False, err_msg=None, line_responses=None, duration=None):
+        self.is_valid = is_valid
+        self.err_msg = err_msg
+        self.line_responses = line_responses if line_responses is not None else []
+        # Seconds spent verifying the proof (set by verify_proofs)
+        self.duration = duration
+
+class LineResponse:
+    """
+    The result of verifying a single line in a full report
+    depends_on lists the cited lines (or subproofs) that contain an error
+    """
+
+    def __init__(self, line_no=None, is_valid=False, err_msg=None, depends_on=None):
+        self.line_no = line_no
         self.is_valid = is_valid
-        self.err_msg = err_msg
\ No newline at end of file
+        self.err_msg = err_msg
+        self.depends_on = depends_on if depends_on is not None else []
+
+    def __str__(self):
+        if self.err_msg:
+            return 'Line {}: {}'.format(self.line_no, self.err_msg)
+        if self.depends_on:
+            return 'Line {}: Depends on line {}, which contains an error'\
+                .format(self.line_no, ', '.join(self.depends_on))
+        return 'Line {}: Valid'.format(self.line_no)
+
+class LineNumber(tuple):
+    """
+    A parsed line number (e.g. '3.2.1' -> (3, 2, 1)).
+    Instances are interned, hashable and ordered like tuples
+    """
+    __slots__ = ()
+
+    @staticmethod
+    def parse(line_no):
+        """
+        Returns the LineNumber for a string such as '3.2.1'
+        Raises a SyntaxError if the string is not a valid line number
+        """
+        if isinstance(line_no, LineNumber):
+            return line_no
+        if not isinstance(line_no, str):
+            raise SyntaxError('Invalid line number {}'.format(line_no))
+        return parse_line_number(line_no)
+
+    @property
+    def depth(self):
+        """
+        The number of nested subproofs (1 for a line in the main proof)
+        """
+        return len(self)
+
+    @property
+    def parent(self):
+        """
+        The line number of the enclosing subproof (None at depth 1)
+        """
+        if len(self) < 2:
+            return None
+        return LineNumber(self[:-1])
+
+    def startswith(self, prefix):
+        """
+        Returns True if prefix is an ancestor of (or equal to) this line number
+        """
+        return self[:len(prefix)] == prefix
+
+    def is_ancestor_of(self, other):
+        """
+        Returns True if other is nested inside the subproof this line number opens
+        """
+        return (len(other) > len(self)) and (other[:len(self)] == self)
+
+    def __str__(self):
+        return '.'.join(str(num) for num in self)
+
+    def __repr__(self):
+        return "LineNumber('{}')".format(self)
+
+
+_line_number_part = re.compile(r'\d+')
+
+@lru_cache(maxsize=65536)
+def parse_line_number(line_no: str):
+    """
+    Parse a line number string once (results are cached)
+    Whitespace around the numbers is ignored, as in the numparser grammar
+    """
+    nums = []
+    for part in line_no.split('.'):
+        part = part.strip(' \t\n')
+        if not _line_number_part.fullmatch(part):
+            raise SyntaxError('Invalid line number {}'.format(line_no))
+        nums.append(int(part))
+    return LineNumber(nums)
@@ -1,8 +1,9 @@
-from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj, ProofResponse
-from proofchecker.utils import numparser
-from proofchecker.utils.binarytree import Node
+from proofchecker.proofs.proofindex import get_index
+from proofchecker.proofs.proofobjects import LineNumber, ProofObj, ProofLineObj, ProofResponse
+from proofchecker.utils.binarytree import Node, intern_tree
 from proofchecker.utils.constants import Constants
-from proofchecker.utils.numlexer import lexer as numlexer
+from proofchecker.utils.folterms import aligned_terms, free_vars
+from proofchecker.utils.parsecache import parse_cache
 from proofchecker.utils.tfllexer import IllegalCharacterError
 
 # Parsing methods
@@ -10,19 +11,210 @@ def depth(line_no):
     """
     Calculates the depth of a line number
     """
-    return numparser.parser.parse(line_no, lexer=numlexer)
+    return LineNumber.parse(line_no).depth
 
 def make_tree(string: str, parser):
     """
     Function to construct a binary tree
+    (results are shared through the process-wide parse cache)
     """
-    return parser.parse(string, lexer=parser.lexer)
+    return parse_cache.parse(string, parser)
 
 def is_line_no(string: str):
     """
     Function to determine if a line number is valid
+    (raises a SyntaxError if it is not)
+    """
+    return LineNumber.parse(string).depth
+
+# Proof compilation
+class Citation:
+    """
+    The parsed justification of a line (e.g. '→I 2-4'):
+    the rule symbol and the cited line numbers
+    """
+    def __init__(self, rule: str):
+        self.rule = rule
+        fixed_rule = fix_rule_whitespace_issues(clean_rule(rule))
+        parts = fixed_rule.split(maxsplit=1)
+        self.symbol = parts[0]
+        if len(parts) > 1:
+            self.line_nos = parts[1].replace('-', ' ').replace(',', ' ').split()
+        else:
+            self.line_nos = []
+
+
+class CompiledLine:
+    """
+    A ProofLineObj with its expression tree, LineNumber and citation
+    computed once.  Errors raised while computing a value are stored
+    and raised again whenever that value is accessed
+    """
+    def __init__(self, line: ProofLineObj, compiled):
+        self.line = line
+        self.key = (line.line_no, line.expression, line.rule)
+        self.line_no = str(line.line_no).strip() if line.line_no else line.line_no
+        self._tree = None
+        self._number = None
+        self._citation = None
+
+        if line.expression:
+            self._tree = compiled.parse(line.expression)
+        if line.line_no:
+            try:
+                self._number = (LineNumber.parse(line.line_no), None)
+            except Exception as err:
+                self._number = (None, err)
+        if line.rule is not None:
+            try:
+                self._citation = (Citation(line.rule), None)
+            except Exception as err:
+                self._citation = (None, err)
+
+    @property
+    def tree(self):
+        return unwrap_result(self._tree)
+
+    @property
+    def number(self):
+        return unwrap_result(self._number)
+
+    @property
+    def depth(self):
+        return self.number.depth
+
+    @property
+    def citation(self):
+        return unwrap_result(self._citation)
+
+
+class CompiledProof:
+    """
+    A proof compiled in a single pass: every line, premise and the
+    conclusion are parsed once, so rules never have to call the parser.
+    Trees are shared between lines with the same expression and must
+    not be modified
+    """
+    def __init__(self, proof: ProofObj, parser):
+        self.parser = parser
+        self.trees = {}
+        self.lines = [CompiledLine(line, self) for line in proof.lines]
+        self.by_line = dict((id(line.line), line) for line in self.lines)
+
+        self.premises = premise_list(proof.premises)
+        for premise in self.premises:
+            self.parse(premise)
+        self.conclusion = proof.conclusion
+        if self.conclusion:
+            self.parse(self.conclusion)
+        self._premise_index = None
+        # Built by the semantic oracle (see semantics/oracle.py)
+        self.truth_table = None
+
+    @property
+    def premise_index(self):
+        """
+        Returns the PremiseIndex of the proof, building it on first use
+        """
+        if self._premise_index is None:
+            self._premise_index = PremiseIndex(self)
+        return self._premise_index
+
+    def parse(self, expression: str):
+        """
+        Parse an expression unless it has been parsed already
+        Returns a (tree, error) pair
+        """
+        try:
+            return self.trees[expression]
+        except KeyError:
+            pass
+        try:
+            result = (make_tree(expression, self.parser), None)
+        except Exception as err:
+            result = (None, err)
+        self.trees[expression] = result
+        return result
+
+    def tree(self, expression: str):
+        """
+        Returns the tree of an expression, raising its syntax error if invalid
+        """
+        return unwrap_result(self.parse(expression))
+
+    def line(self, line: ProofLineObj):
+        """
+        Returns the CompiledLine of a ProofLineObj, compiling it again
+        if the line was added or changed after compilation
+        """
+        compiled_line = self.by_line.get(id(line))
+        if (compiled_line is None) or (compiled_line.key != (line.line_no, line.expression, line.rule)):
+            compiled_line = CompiledLine(line, self)
+            self.by_line[id(line)] = compiled_line
+        return compiled_line
+
+
+class PremiseIndex:
+    """
+    The premises of a compiled proof as a set of (interned) trees,
+    so finding a premise is a single membership test.
+    Premises that cannot be parsed are kept in errors, in order,
+    as (premise, error) pairs.  Blank premises are ignored
+    """
+    def __init__(self, compiled: CompiledProof):
+        self.trees = set()
+        self.errors = []
+        for premise in compiled.premises:
+            if (not isinstance(premise, str)) or (not premise.strip()):
+                continue
+            tree, err = compiled.parse(premise)
+            if err is None:
+                self.trees.add(intern_tree(tree))
+            else:
+                self.errors.append((premise, err))
+
+    def __contains__(self, tree):
+        return intern_tree(tree) in self.trees
+
+
+def unwrap_result(result):
+    """
+    Returns the value of a (value, error) pair, raising the error if present
+    """
+    if result is None:
+        return None
+    value, err = result
+    if err is not None:
+        raise err.with_traceback(None)
+    return value
+
+def compile_proof(proof: ProofObj, parser, refresh=False):
+    """
+    Returns the CompiledProof of a proof for the given parser,
+    compiling it if necessary (or if refresh is True).
+    Refreshing also discards the ProofIndex, as lines may have been
+    renumbered or edited in place
     """
-    return numparser.parser.parse(string, lexer=numlexer)
+    compiled = proof.compiled
+    if refresh:
+        proof.index = None
+    if refresh or (compiled is None) or (compiled.parser is not parser):
+        compiled = CompiledProof(proof, parser)
+        proof.compiled = compiled
+    return compiled
+
+def get_premise_index(proof: ProofObj, parser):
+    """
+    Returns the PremiseIndex of a proof for the given parser
+    """
+    return compile_proof(proof, parser).premise_index
+
+def get_tree(expression: str, proof: ProofObj, parser):
+    """
+    Returns the tree of an expression in a proof, which is
+    only parsed the first time it is requested
+    """
+    return compile_proof(proof, parser).tree(expression)
 
 def is_name(ch):
     """
@@ -61,8 +253,8 @@ def is_conclusion(current_line: ProofLineObj, proof: ProofObj, parser):
     """
     response = ProofResponse
     try:
-        current = make_tree(current_line.expression, parser)
-        conclusion = make_tree(proof.conclusion, parser)
+        current = get_tree(current_line.expression, proof, parser)
+        conclusion = get_tree(proof.conclusion, proof, parser)
 
         if current == conclusion:
             return True
@@ -111,19 +303,27 @@ def verify_expression(expression: str, parser):
         return response
     
 
+def iter_citable_lines(current_line: ProofLineObj, proof: ProofObj):
+    """
+    Returns an iterator over the lines that are citable from the current line,
+    in proof order
+    """
+    for line in get_index(proof).lines_in_scope(current_line.line_no):
+        if line is not current_line:
+            yield line
+
 def get_citable_lines(current_line: ProofLineObj, proof: ProofObj):
     """
     Returns a list of all lines that are citable from the current line
     """
-    citable_lines = []
-
-    for line in proof.lines:
-        if line != current_line:
-            result = verify_line_citation(current_line.line_no, line.line_no)
-            if result.is_valid:
-                citable_lines.append(line)
+    return list(iter_citable_lines(current_line, proof))
 
-    return citable_lines
+def name_may_appear_in_scope(name: str, current_line: ProofLineObj, proof: ProofObj):
+    """
+    Returns False if a name (or variable) certainly does not appear
+    on any line citable from the current line (a constant-time check)
+    """
+    return get_index(proof).may_appear_in_scope(name, current_line)
 
 
 def verify_line_citation(current_line_no: str, cited_line_no: str):
@@ -134,9 +334,11 @@ def verify_line_citation(current_line_no: str, cited_line_no: str):
     response = ProofResponse()
     
     try:
-        # Calculate the depth of each line number
-        current_depth = depth(current_line_no)
-        cited_depth = depth(cited_line_no)
+        # Parse each line number
+        current_nums = LineNumber.parse(current_line_no)
+        cited_nums = LineNumber.parse(cited_line_no)
+        current_depth = current_nums.depth
+        cited_depth = cited_nums.depth
 
         # Check if the cited line occurs within a subproof that has not been closed
         # before the line where the rule is applied (this is a violation)
@@ -145,14 +347,11 @@ def verify_line_citation(current_line_no: str, cited_line_no: str):
                 .format(current_line_no, cited_line_no, current_line_no)
             return response
 
-        # Create an array of nested line numbers
-        current_nums = current_line_no.replace('.', ' ').split()
-        cited_nums = cited_line_no.replace('.', ' ').split()
         x = 0
-        
+
         # Check that the current line occurs after the cited line in the proof
         while x < cited_depth:
-            if int(current_nums[x]) < int(cited_nums[x]):
+            if current_nums[x] < cited_nums[x]:
                 response.err_msg = "Error on line {}: Invalid citation: Line {} occurs after line {}"\
                     .format(current_line_no, cited_line_no, current_line_no)
                 return response
@@ -173,6 +372,16 @@ def verify_line_citation(current_line_no: str, cited_line_no: str):
         return response
 
 
+def premise_list(premises):
+    """
+    Returns the premises of a ProofObj as a list
+    (a single premise may be given as a string)
+    """
+    if isinstance(premises, str):
+        return [premises]
+    return list(premises or [])
+
+
 def get_premises(premises: str):
     """
     Take a string of comma separated-premises
@@ -220,64 +429,39 @@ def get_line(rule: str, proof: ProofObj):
     Find a single line from a TFL rule
     """
     target_line_no = get_line_no(rule)
-    target_line = None
-    for line in proof.lines:
-        if str(target_line_no) == str(line.line_no):
-            target_line = line
-            break
-    return target_line
+    return get_index(proof).get_line(target_line_no)
 
 def get_line_with_line_no(line_no: str, proof: ProofObj):
     """
     Find a single line using the line number
     """
-    target_line = None
-    for line in proof.lines:
-        if line_no == str(line.line_no):
-            target_line = line
-            break
-    return target_line    
+    return get_index(proof).get_line(line_no)
 
 def get_line_DNE(rule: str, proof: ProofObj):
     """
     Find a single line for rule DNE
     """
     target_line_no = rule[3:len(rule)].strip()
-    target_line = None
-    for line in proof.lines:
-        if str(target_line_no) == str(line.line_no):
-            target_line = line
-            break
-    return target_line
+    return get_index(proof).get_line(target_line_no)
 
 def get_lines(rule: str, proof: ProofObj):
     """
     Find multiple lines from a TFL rule
     """
     target_line_nos = get_line_nos(rule)
+    index = get_index(proof)
     target_lines = []
     for num in target_line_nos:
-        for line in proof.lines:
-            if str(num) == str(line.line_no):
-                target_lines.append(line)
-                break
+        line = index.get_line(num)
+        if line is not None:
+            target_lines.append(line)
     return target_lines
 
 def get_lines_in_subproof(line_no: str, proof: ProofObj):
     """
     Returns the first and last line of a subproof
     """
-    current_depth = depth(line_no)+1
-    subproof = []
-    for line in proof:
-        if (line.line_no.startswith(line_no) and (depth(line.line_no) == current_depth)):
-            subproof.append(line)
-    if len(subproof) > 1:
-        return[subproof[0], subproof[len(subproof)-1]]
-    elif len(subproof) == 1:
-        return [subproof[0], subproof[0]]
-    else:
-        return None
+    return get_index(proof).get_subproof(line_no)
 
 def get_expressions(lines):
     """
@@ -361,241 +545,147 @@ def find_c(var_tree: Node, name_tree: Node, var: str):
     if (var_tree == None or name_tree == None):
         return None
 
-    if not is_predicate(var_tree.value[0]):
-        if (var_tree.left != None) and (name_tree.left != None):
-            result = find_c(var_tree.left, name_tree.left, var)
-            if result != None:
-                return result
-        if (var_tree.right != None) and (name_tree.right != None):
-            result = find_c(var_tree.right, name_tree.right, var)
-            if result != None:
-                return result
-
-    index = 0
-    var_indexes = []
-
-    # Eliminate whitespace to make sure indexes match
-    expression_with_vars = var_tree.value.replace(' ', '')
-    expression_with_names = name_tree.value.replace(' ', '')
+    # The term replacing the first free instance of var
+    for var_term, name_term in aligned_terms(var_tree, name_tree):
+        if var_term == var:
+            return name_term if isinstance(name_term, str) else None
 
-    # Keep track of the locations (indexes) of the bound variable on current line
-    for ch in expression_with_vars:
-        if ch == var:
-            var_indexes.append(index)
-        index += 1
-
-    # If there are no variables, return None
-    if len(var_indexes) == 0:
-        return None
-
-    # Get the values at these locations in line m
-    names = []
-    for i in var_indexes:
-        names.append(expression_with_names[i])    
-
-    # If there are no names, return None
-    if len(names) == 0:
-        return None
-        
-    return names[0]
+    return None
 
 
 def verify_same_structure_FOL(tree_1: Node, tree_2: Node, line_no_1: str, line_no_2: str):
     """
     Test to determine that two trees have the same structure
+    (the subtrees are checked before their root, without recursion)
     """
-    # If both nodes are empty, they have same structure
-    if (tree_1.value == None and tree_2.value == None):
+    def error(message):
         response = ProofResponse()
-        response.is_valid = True
+        response.err_msg = message.format(line_no_1, line_no_2)
         return response
 
-    # If one node is empty and the other is not, return error message
-    if (tree_1 == None and tree_2 != None) or (tree_1 != None and tree_2 == None):
-        response = ProofResponse()
-        response.err_msg = "Lines {} and {} do not have similar structure"\
-            .format(line_no_1, line_no_2)
-        return response         
+    structure_error = "Lines {} and {} do not have similar structure"
 
-    # If both nodes have values, continue
-    if (tree_1 != None) and (tree_2 != None):
+    # Stack of (node of tree_1, node of tree_2, children checked)
+    stack = [(tree_1, tree_2, False)]
+    while stack:
+        node_1, node_2, visited = stack.pop()
 
-        # If one node has a left or right child where the other does not, return error message
-        if (tree_1.left == None and tree_2.left != None) or (tree_2.left == None and tree_1.left != None) \
-            or (tree_1.right == None and tree_2.left != None) or (tree_1.right == None and tree_2.right != None):
-                response = ProofResponse()
-                response.err_msg = "Lines {} and {} do not have similar structure"\
-                    .format(line_no_1, line_no_2)
-                return response
+        # If both nodes are empty, they have same structure
+        if (node_1.value == None and node_2.value == None):
+            continue
 
-        # If both trees have a left node, check the left nodes for equivalent structure (recursive)
-        if (tree_1.left != None) and (tree_2.left != None):
-            response = verify_same_structure_FOL(tree_1.left, tree_2.left, line_no_1, line_no_2)
-            if response.is_valid == False:
-                return response
+        # If one node is empty and the other is not, return error message
+        if (node_1 == None and node_2 != None) or (node_1 != None and node_2 == None):
+            return error(structure_error)
 
-        # If both trees have a right node, check the right node for equivalent structure (recursive)
-        if (tree_1.right != None) and (tree_2.right != None):
-            response = verify_same_structure_FOL(tree_1.right, tree_2.right, line_no_1, line_no_2)
-            if response.is_valid == False:
-                return response
+        if not visited:
+            # If one node has a left or right child where the other does not, return error message
+            if (node_1.left == None and node_2.left != None) or (node_2.left == None and node_1.left != None) \
+                or (node_1.right == None and node_2.left != None) or (node_1.right == None and node_2.right != None):
+                    return error(structure_error)
+
+            # Check the left nodes, then the right nodes, then this node
+            stack.append((node_1, node_2, True))
+            if (node_1.right != None) and (node_2.right != None):
+                stack.append((node_1.right, node_2.right, False))
+            if (node_1.left != None) and (node_2.left != None):
+                stack.append((node_1.left, node_2.left, False))
+            continue
+
+        # If the values of the nodes are equivalent, they have the same structure
+        if node_1.value == node_2.value:
+            continue
 
-        # If the values of the nodes are equivalent, return valid
-        if tree_1.value == tree_2.value:
-            response = ProofResponse()
-            response.is_valid = True
-            return response
-        
         # If one node is a predicate and the other is not, return error message
-        if (is_predicate(tree_1.value[0]) and not is_predicate(tree_2.value[0]))\
-            or (is_predicate(tree_2.value[0]) and not is_predicate(tree_1.value[0])):
-                response = ProofResponse()
-                response.err_msg = "Lines {} and {} do not have similar structure"\
-                    .format(line_no_1, line_no_2)
-                return response            
+        if (is_predicate(node_1.value[0]) and not is_predicate(node_2.value[0]))\
+            or (is_predicate(node_2.value[0]) and not is_predicate(node_1.value[0])):
+                return error(structure_error)
 
         # If the expressions refer to different predicates, return error message
-        if is_predicate(tree_1.value[0]) and is_predicate(tree_2.value[0]):
-            if tree_1.value[0] != tree_2.value[0]:
-                response = ProofResponse()
-                response.err_msg = "The expressions on lines {} and {} do not refer to the same predicate"\
-                    .format(line_no_1, line_no_2)
-                return response
-            else:
-                # If the predicates do not have the same number of inputs, return error message
-                inputs_1 = count_inputs(tree_1.value)
-                inputs_2 = count_inputs(tree_2.value)
-                response = ProofResponse()
-                if inputs_1 != inputs_2:
-                    response.err_msg = "The predicates on lines {} and {} do not have the same number of inputs"\
-                        .format(line_no_1, line_no_2)
-                    return response
-                else:
-                    response.is_valid = True
-                    return response
-            
+        if is_predicate(node_1.value[0]) and is_predicate(node_2.value[0]):
+            if node_1.value[0] != node_2.value[0]:
+                return error("The expressions on lines {} and {} do not refer to the same predicate")
+
+            # If the predicates do not have the same number of inputs, return error message
+            if count_inputs(node_1.value) != count_inputs(node_2.value):
+                return error("The predicates on lines {} and {} do not have the same number of inputs")
+            continue
+
         # If the expressions refer to quantifiers but reference different variables, return error message:
-        if is_quantifier(tree_1.value[0]):
+        if is_quantifier(node_1.value[0]):
 
             # Check they refer to same quantifier
-            if tree_1.value[0] != tree_2.value[0]:
-                response = ProofResponse()
-                response.err_msg = "The expressions on lines {} and {} do not refer to the same quantifier"\
-                    .format(line_no_1, line_no_2)
-                return response
+            if node_1.value[0] != node_2.value[0]:
+                return error("The expressions on lines {} and {} do not refer to the same quantifier")
 
             # Check they refer to the same variable and domain
-            result = verify_same_var_and_domain(tree_1, tree_2, line_no_1, line_no_2)
+            result = verify_same_var_and_domain(node_1, node_2, line_no_1, line_no_2)
             if result.is_valid == False:
                 return result
-        
+
     # If we reached this point without returning a response, return valid
     response = ProofResponse()
     response.is_valid = True
     return response
 
 
-def verify_var_replaces_every_name(var_tree: Node, name_tree: Node, var: str, var_line_no: str, name_line_no: str):
+def replaced_names(var_tree: Node, name_tree: Node, var: str, var_line_no: str, name_line_no: str):
     """
-    Verify all instances of var in var_tree are replaced by a single name in name_tree AND
-    that all instances of name in name_tree are replaced by var in var_tree
+    Returns the terms of name_tree at the positions of the free instances
+    of var in var_tree (a list), or a ProofResponse with an error if
+    var appears in name_tree or does not consistently replace a single name
     """
-    # If either node is empty, return valid
-    if (var_tree == None or name_tree == None):
-        response = ProofResponse
-        response.is_valid = True
-        return response
-
-    # If both trees have a left node, check the left nodes (recursive)
-    if (var_tree.left != None) and (name_tree.left != None):
-        response = verify_var_replaces_every_name(var_tree.left, name_tree.left, var, var_line_no, name_line_no)
-        if response.is_valid == False:
-            return response
-
-    # If both trees have a right node, check the right nodes (recursive)
-    if (var_tree.right != None) and (name_tree.right != None):
-        response = verify_var_replaces_every_name(var_tree.right, name_tree.right, var, var_line_no, name_line_no)
-        if response.is_valid == False:
-            return response
-
-    index = 0
-    var_indexes = []
-
-    # Eliminate whitespace to make sure indexes match
-    expression_with_vars = var_tree.value.replace(' ', '')
-    expression_with_names = name_tree.value.replace(' ', '')
-
     # Make sure the bound variable does not appear in the expression with names
-    for ch in expression_with_names:
-        if ch == var:
-            response = ProofResponse()
-            response.err_msg = 'Variable "{}" on line {} should not appear on line {}'\
-                .format(var, var_line_no, name_line_no)
-            return response
-
-    # Keep track of the locations (indexes) of the bound variable on current line
-    for ch in expression_with_vars:
-        if ch == var:
-            var_indexes.append(index)
-        index += 1
-
-    # If there are no variables, stop here
-    if len(var_indexes) == 0:
+    if var in free_vars(name_tree):
         response = ProofResponse()
-        response.is_valid = True
+        response.err_msg = 'Variable "{}" on line {} should not appear on line {}'\
+            .format(var, var_line_no, name_line_no)
         return response
 
-    # Get the values at these locations in line m
+    names = [name_term for var_term, name_term in aligned_terms(var_tree, name_tree) if var_term == var]
+
     # Make sure they all represent names
-    names = []
-    for i in var_indexes:
-        names.append(expression_with_names[i])
-    
-    for ch in names:
-        if not is_name(ch):
+    for term in names:
+        if not (isinstance(term, str) and is_name(term)):
             response = ProofResponse()
             response.err_msg = 'Instances of variable "{}" on line {} should replace a name on line {}'\
                 .format(var, var_line_no, name_line_no)
             return response
-    
+
     # Make sure they all use the same name
-    if len(names) > 1:
-        for ch in names:
-            if not ch == names[0]:
-                response = ProofResponse()
-                response.err_msg = 'All instances of variable "{}" on line {} should replace the same name on line {}'\
-                    .format(var, var_line_no, name_line_no)
-                return response
-    
-    # If there are no names, stop here
-    if len(names) == 0:
+    if len(set(names)) > 1:
+        response = ProofResponse()
+        response.err_msg = 'All instances of variable "{}" on line {} should replace the same name on line {}'\
+            .format(var, var_line_no, name_line_no)
+        return response
+
+    return names
+
+
+def verify_var_replaces_every_name(var_tree: Node, name_tree: Node, var: str, var_line_no: str, name_line_no: str):
+    """
+    Verify all instances of var in var_tree are replaced by a single name in name_tree AND
+    that all instances of name in name_tree are replaced by var in var_tree
+    """
+    # If either node is empty, return valid
+    if (var_tree == None or name_tree == None):
         response = ProofResponse()
         response.is_valid = True
-        return response        
+        return response
+
+    names = replaced_names(var_tree, name_tree, var, var_line_no, name_line_no)
+    if isinstance(names, ProofResponse):
+        return names
 
     # Now, check that all instances of this name in line_m are replaced by the same (bound) var in current line
-    name = names[0]
-    index = 0
-    name_indexes = []
-
-    # Keep track of the locations (indexes) of the bound variable on current line
-    for ch in expression_with_names:
-        if ch == name:
-            name_indexes.append(index)
-        index += 1
-
-    # Get the values at these locations in the current line
-    # Make sure they all are replaced by the bound variable
-    vars = []
-    for i in name_indexes:
-        vars.append(expression_with_vars[i])
-
-    for ch in vars:
-        if not (ch == var):
-            response = ProofResponse()
-            response.err_msg = 'All instances of name "{}" on line {} should be replaced with the bound variable "{}" on line {}'\
-                .format(name, name_line_no, var, var_line_no)
-            return response
+    if len(names) > 0:
+        name = names[0]
+        for var_term, name_term in aligned_terms(var_tree, name_tree):
+            if (name_term == name) and (var_term != var):
+                response = ProofResponse()
+                response.err_msg = 'All instances of name "{}" on line {} should be replaced with the bound variable "{}" on line {}'\
+                    .format(name, name_line_no, var, var_line_no)
+                return response
 
     # If we reach this point, return valid
     response = ProofResponse()
@@ -609,72 +699,15 @@ def verify_var_replaces_some_name(var_tree: Node, name_tree: Node, var: str, var
     """
     # If either node is empty, return valid
     if (var_tree == None or name_tree == None):
-        response = ProofResponse
-        response.is_valid = True
-        return response
-
-    # If both trees have a left node, check the left nodes (recursive)
-    if (var_tree.left != None) and (name_tree.left != None):
-        response = verify_var_replaces_some_name(var_tree.left, name_tree.left, var, var_line_no, name_line_no)
-        if response.is_valid == False:
-            return response
-
-    # If both trees have a right node, check the right nodes (recursive)
-    if (var_tree.right != None) and (name_tree.right != None):
-        response = verify_var_replaces_some_name(var_tree.right, name_tree.right, var, var_line_no, name_line_no)
-        if response.is_valid == False:
-            return response
-
-    index = 0
-    var_indexes = []
-
-    # Eliminate whitespace to make sure indexes match
-    expression_with_vars = var_tree.value.replace(' ', '')
-    expression_with_names = name_tree.value.replace(' ', '')
-
-    # Make sure the bound variable does not appear in the expression with names
-    for ch in expression_with_names:
-        if ch == var:
-            response = ProofResponse()
-            response.err_msg = 'Variable "{}" on line {} should not appear on line {}'\
-                .format(var, var_line_no, name_line_no)
-            return response
-
-    # Keep track of the locations (indexes) of the bound variable on current line
-    for ch in expression_with_vars:
-        if ch == var:
-            var_indexes.append(index)
-        index += 1
-
-    # If there are no variables, stop here
-    if len(var_indexes) == 0:
         response = ProofResponse()
         response.is_valid = True
         return response
 
-    # Get the values at these locations in line m
-    # Make sure they all represent names
-    names = []
-    for i in var_indexes:
-        names.append(expression_with_names[i])
-    
-    for ch in names:
-        if not is_name(ch):
-            response = ProofResponse()
-            response.err_msg = 'Instances of variable "{}" on line {} should replace a name on line {}'\
-                .format(var, var_line_no, name_line_no)
-            return response
-    
-    # Make sure they all use the same name
-    if len(names) > 1:
-        for ch in names:
-            if not ch == names[0]:
-                response = ProofResponse()
-                response.err_msg = 'All instances of variable "{}" on line {} should replace the same name on line {}'\
-                    .format(var, var_line_no, name_line_no)
-                return response
+    names = replaced_names(var_tree, name_tree, var, var_line_no, name_line_no)
+    if isinstance(names, ProofResponse):
+        return names
 
     # If we reach this point, return valid
     response = ProofResponse()
     response.is_valid = True
-    return response
\ No newline at end of file
+    return response
@@ -1,93 +1,30 @@
-from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj, ProofResponse
-from proofchecker.proofs.proofutils import clean_rule, get_line_nos, get_lines_in_subproof, verify_line_citation, make_tree, get_expressions
-from .rule import Rule
+from .schema import Schema, SchemaRule
 
-class BiconditionalIntro(Rule):
+def not_equivalent(slot_1, slot_2):
+    return "Error on line {current}: The expressions on lines {%s} and {%s} are not equivalent" % (slot_1, slot_2)
 
-    name = "Biconditional Introduction"
-    symbols = "↔I"
-
-    def verify(self, current_line: ProofLineObj, proof: ProofObj, parser):
-        """
-        Verify the rule ↔I i, j
-        (Biconditional Introduction)
-        """
-        rule = clean_rule(current_line.rule)
-        response = ProofResponse()
-
-        # Attempt to find lines in subproofs i and j
-        try:
-            target_line_nos = get_line_nos(rule)
-            lines_i = get_lines_in_subproof(target_line_nos[0], proof)
-            lines_j = get_lines_in_subproof(target_line_nos[1], proof)
-            target_lines = [lines_i[0], lines_i[1], lines_j[0], lines_j[1]]
-
-            # Verify that subproof citations are valid
-            for line_no in target_line_nos:
-                result = verify_line_citation(current_line.line_no, line_no)
-                if result.is_valid == False:
-                    return result
+SIDES = {
+    'left': "Error on line {current}: Left side of line {current} does not equal either of the expressions on lines {j} and {l}",
+    'right': "Error on line {current}: Right side of line {current} does not equal either of the expressions on lines {j} and {l}",
+}
+INVALID = "Error on line {current}: Invalid introduction on line {current}"
+SAME_SIDES = "Error on line {current}: Left side and right side of line {current} are equivalent, but lines {i} and {j} are not equivalent"
 
-            # Search for lines i.1, i.x, j.1, and j.x in the proof
-            try:
-                expressions = get_expressions(target_lines)
+class BiconditionalIntro(SchemaRule):
 
-                # Create trees for expressions on lines i.1, i.x, j.1, and j.x
-                root_i_1 = make_tree(expressions[0], parser)
-                root_i_x = make_tree(expressions[1], parser)
-                root_j_1 = make_tree(expressions[2], parser)
-                root_j_x = make_tree(expressions[3], parser)
-                root_current = make_tree(current_line.expression, parser)
-
-                # Verify lines i.1 and j.x are equivalent
-                if root_i_1 == root_j_x:
-                    # Verify that lines i.x and j.1 are equivalent
-                    if root_i_x == root_j_1:
-                        # If i.1 and i.x are equivalent, the left and right hand sides
-                        # of the biconditional on the current line should also be equivalent
-                        if root_i_1==root_i_x:
-                            if (root_current.left == root_i_1) and (root_current.left == root_current.right):
-                                response.is_valid = True
-                                return response
-                            else:
-                                response.err_msg = "Error on line {}: Invalid introduction on line {}"\
-                                    .format(str(current_line.line_no), str(current_line.line_no))
-                                return response
-
-                        else:
-                            # If i.1 and i.x are not equivalent, the left side of the current line should equal i.1 or i.x,
-                            # and the right side of the current line should equal i.1 or i.x,
-                            # and the left side should not be the same as the right side
-                            if (root_current.left == root_i_1) or (root_current.left == root_i_x):
-                                if (root_current.right == root_i_1) or (root_current.right == root_i_x):
-                                    if root_current.left != root_current.right:
-                                        response.is_valid = True
-                                        return response
-                                    else:
-                                        response.err_msg = "Error on line {}: Left side and right side of line {} are equivalent, but lines {} and {} are not equivalent"\
-                                            .format(str(current_line.line_no), str(current_line.line_no), str(target_lines[0].line_no), str(target_lines[1].line_no))
-                                        return response
-                                else:
-                                        response.err_msg = "Error on line {}: Right side of line {} does not equal either of the expressions on lines {} and {}"\
-                                            .format(str(current_line.line_no), str(current_line.line_no), str(target_lines[1].line_no), str(target_lines[3].line_no))
-                                        return response
-                            else:
-                                    response.err_msg = "Error on line {}: Left side of line {} does not equal either of the expressions on lines {} and {}"\
-                                        .format(str(current_line.line_no), str(current_line.line_no), str(target_lines[1].line_no), str(target_lines[3].line_no))
-                                    return response
-                    else:
-                        response.err_msg = "Error on line {}: The expressions on lines {} and {} are not equivalent"\
-                            .format(str(current_line.line_no), str(target_lines[1].line_no),str(target_lines[2].line_no))
-                        return response
-                else:
-                    response.err_msg = "Error on line {}: The expressions on lines {} and {} are not equivalent"\
-                        .format(str(current_line.line_no), str(target_lines[0].line_no),str(target_lines[3].line_no))
-                    return response
-            except:
-                response.err_msg = "Error on line {}: Line numbers are not specified correctly.  ↔I i, j"\
-                    .format(str(current_line.line_no))
-                return response        
-        except:
-            response.err_msg = "Error on line {}: Rule not formatted properly.  ↔I i, j"\
-                .format(str(current_line.line_no))
-            return response
\ No newline at end of file
+    name = "Biconditional Introduction"
+    symbols = "↔I"
+    usage = "↔I i, j"
+
+    # Subproof k-l must lead back from the conclusion of i-j to its assumption
+    # (the first schema is the case where both subproofs have one sentence)
+    schemas = [
+        Schema('i-j: A ... A, k-l: A ... A ⊢ A↔A', order=['i', 'l', 'j', 'k', 'current'], roots_first=False,
+            roots={'current': INVALID},
+            mismatch={'l': not_equivalent('i', 'l'), 'k': not_equivalent('j', 'k'), 'current': INVALID}),
+    ] + [
+        Schema('i-j: A ... B, k-l: B ... A ⊢ ' + current, order=['i', 'l', 'j', 'k', 'current'], roots_first=False,
+            roots={'current': SIDES['left']}, error=error,
+            mismatch={'l': not_equivalent('i', 'l'), 'k': not_equivalent('j', 'k'), 'current': SIDES})
+        for current, error in (('A↔B', None), ('B↔A', None), ('A↔A', SAME_SIDES), ('B↔B', SAME_SIDES))
+    ]
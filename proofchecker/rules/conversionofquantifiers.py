@@ -1,5 +1,5 @@
 from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj, ProofResponse
-from proofchecker.proofs.proofutils import clean_rule, get_line, is_var, is_name, make_tree, verify_line_citation, verify_same_var_and_domain
+from proofchecker.proofs.proofutils import clean_rule, get_line, is_var, is_name, get_tree, verify_line_citation, verify_same_var_and_domain
 from .rule import Rule
 
 class ConversionOfQuantifiers(Rule):
@@ -26,8 +26,8 @@ class ConversionOfQuantifiers(Rule):
 
             try: 
                 expression = target_line.expression
-                root_m = make_tree(expression, parser)
-                current = make_tree(current_line.expression, parser)
+                root_m = get_tree(expression, proof, parser)
+                current = get_tree(current_line.expression, proof, parser)
                 
                 ### Case 1
                 if root_m.value[0] == '∀':
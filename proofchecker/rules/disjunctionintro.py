@@ -1,56 +1,32 @@
-from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj, ProofResponse
-from proofchecker.proofs.proofutils import clean_rule, get_line, verify_line_citation, make_tree
-from .rule import Rule
+from proofchecker.utils.narytree import has_brackets, is_side
+from .schema import Schema, SchemaRule
 
-class DisjunctionIntro(Rule):
+NOT_FOLLOWING = "Error on line {current}: Line {current} does not follow from line {m}"
+
+class DisjunctionIntro(SchemaRule):
 
     name = "Disjunction Introduction"
     symbols = "∨I"
+    usage = "Disjunction Introduction: ∨I m"
 
-    def verify(self, current_line: ProofLineObj, proof: ProofObj, parser):
-        """
-        Verify proper implementation of the rule ∨I m
-        (Disjunction Introduction)
-        """
-        rule = clean_rule(current_line.rule)
-        response = ProofResponse()
-
-        # Attempt to find line m
-        try:
-            target_line = get_line(rule, proof)
-
-            # Verify if line citation is valid
-            result = verify_line_citation(current_line.line_no, target_line.line_no)
-            if result.is_valid == False:
-                return result
-
-            # Search for line m in the proof
-            try:
-                expression = target_line.expression
+    schemas = [
+        Schema('m: A ⊢ A∨B', roots={'current': NOT_FOLLOWING}, mismatch={'current': NOT_FOLLOWING}),
+        Schema('m: B ⊢ A∨B', roots={'current': NOT_FOLLOWING}, mismatch={'current': NOT_FOLLOWING}),
+    ]
 
-                # Create a tree for the target expression
-                root_target = make_tree(expression, parser)
+    @property
+    def quotes_expressions(self):
+        # With modulo_association, the parentheses written on the current
+        # line decide whether it may be regrouped, so results are cached by the text
+        return self.modulo_association
 
-                # Create trees for left and right side of current expression
-                root_current = make_tree(current_line.expression, parser)
-                root_left = root_current.left
-                root_right = root_current.right
-
-                # Compare the trees
-                if (root_target == root_left) or (root_target == root_right):
-                    response.is_valid = True
-                    return response
-                else:
-                    response.err_msg = "Error on line {}: Line {} does not follow from line {}"\
-                        .format(str(current_line.line_no), str(current_line.line_no), str(target_line.line_no))
-                    return response
-
-            except:
-                response.err_msg = "Error on line {}: Line numbers are not specified correctly.  Disjunction Introduction: ∨I m"\
-                    .format(str(current_line.line_no))
-                return response
-
-        except:
-            response.err_msg = "Error on line {}: Rule not formatted properly.  Disjunction Introduction: ∨I m"\
-                .format(str(current_line.line_no))
-            return response
\ No newline at end of file
+    def check(self, trees: dict, expressions: dict):
+        """
+        With modulo_association, also accept line m as any operand of a
+        chain of ∨ written without parentheses on the current line
+        """
+        message = super().check(trees, expressions)
+        if (message is not None) and self.modulo_association and \
+            not has_brackets(expressions['current']) and is_side(trees['m'], trees['current'], '∨'):
+            return None
+        return message
@@ -1,12 +1,14 @@
 from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj, ProofResponse
-from proofchecker.proofs.proofutils import clean_rule, get_lines, verify_line_citation, make_tree, get_expressions
+from proofchecker.proofs.proofutils import clean_rule, get_lines, verify_line_citation, get_tree, get_expressions
 from proofchecker.utils.binarytree import Node
+from proofchecker.utils.folterms import Atom, debruijn, parse_atom
 from .rule import Rule
 
 class EqualityElim(Rule):
 
     name = "Equality Elimination"
     symbols = "=E"
+    quotes_expressions = True
 
     def verify(self, current_line: ProofLineObj, proof: ProofObj, parser):
         """
@@ -28,9 +30,9 @@ class EqualityElim(Rule):
             # Search for lines (m, n) in the proof
             try:
                 expressions = get_expressions(target_lines)
-                root_m = make_tree(expressions[0], parser)
-                root_n = make_tree(expressions[1], parser)
-                root_current = make_tree(current_line.expression, parser)
+                root_m = get_tree(expressions[0], proof, parser)
+                root_n = get_tree(expressions[1], proof, parser)
+                root_current = get_tree(current_line.expression, proof, parser)
 
                 # Verify the root operand on line m is =
                 if not root_m.value == '=':
@@ -58,45 +60,77 @@ class EqualityElim(Rule):
 def check_subs(current_tree: Node, line_n_tree: Node, left: str, right: str, current_line: ProofLineObj, line_n: ProofLineObj):
     """
     Test to determine that current_tree follows from line n by replacing a certian subset of a's with b's
+    (or of b's with a's).  Both trees are walked once in de Bruijn form,
+    so bound variables are never replaced
     """
-    
-    # Check if the current_tree node is equivalent to the line_n tree node
-    if not ((current_tree.value == line_n_tree.value) or (current_tree.value == left) or (current_tree.value == line_n_tree.right)):
-
-        # Check whether they are equivalent length
-        current_clean = current_tree.value.replace(" ", "")
-        line_n_clean = line_n_tree.value.replace(" ", "")
-
-        if not len(current_clean) == len(line_n_clean):
-            response = ProofResponse()
-            response.err_msg = "Error on line {}: Expressions on lines {} and {} should have similar structure"\
-                .format(current_line.line_no, line_n.line_no, current_line.line_no)
-            return response
-
-        # Check whether they are equivalent by swapping 'left' with 'right'
-        side = left
-        x = 0
-        while x < len(current_clean):
-            if not ((current_clean[x] == line_n_clean[x]) or (current_clean[x] == side)):
-                if side == left:
-                    side = right
-                    continue 
-                response = ProofResponse()
-                response.err_msg = 'Error on line {}: Expression "{}" cannot be achieved by replacing "{}" with "{}" (or vice versa) in the expression "{}"'\
-                    .format(current_line.line_no, current_line.expression, left, right, line_n.expression)
-                return response
-            x += 1
-    
-    if current_tree.left != None:
-        response = check_subs(current_tree.left, line_n_tree.left, left, right, current_line, line_n)
-        if response.err_msg != None:
-            return response
-
-    if current_tree.right != None:
-        response = check_subs(current_tree.right, line_n_tree.right, left, right, current_line, line_n)
-        if response.err_msg != None:
-            return response
+    structure_error = ProofResponse()
+    structure_error.err_msg = "Error on line {}: Expressions on lines {} and {} should have similar structure"\
+        .format(current_line.line_no, line_n.line_no, current_line.line_no)
+    substitution_error = ProofResponse()
+    substitution_error.err_msg = 'Error on line {}: Expression "{}" cannot be achieved by replacing "{}" with "{}" (or vice versa) in the expression "{}"'\
+        .format(current_line.line_no, current_line.expression, left, right, line_n.expression)
+
+    left_atom = parse_atom(left)
+    right_atom = parse_atom(right)
+    # Replacements (line n, current line) in each direction, as whole
+    # atoms and (when both sides are terms) as terms inside atoms
+    term_sides = (left_atom.predicate is None) and (right_atom.predicate is None)
+    replacements = [((left_atom, right_atom), (left_atom.terms, right_atom.terms) if term_sides else None),
+        ((right_atom, left_atom), (right_atom.terms, left_atom.terms) if term_sides else None)]
+    # The direction used so far (only one direction may be used)
+    direction = None
+
+    stack = [(debruijn(current_tree), debruijn(line_n_tree))]
+    while stack:
+        current_node, line_n_node = stack.pop()
+        if (current_node is None) and (line_n_node is None):
+            continue
+        if (current_node is None) or (line_n_node is None):
+            return structure_error
+        if current_node is line_n_node:
+            continue
+
+        current_atom = current_node.value if isinstance(current_node.value, Atom) else None
+        line_n_atom = line_n_node.value if isinstance(line_n_node.value, Atom) else None
+        if (current_atom is None) != (line_n_atom is None):
+            return structure_error
+
+        if current_atom is None:
+            # Connectives and quantifiers must be the same
+            if current_node.value != line_n_node.value:
+                return substitution_error
+            stack.append((current_node.right, line_n_node.right))
+            stack.append((current_node.left, line_n_node.left))
+            continue
+
+        # Replacing a whole side of the equation (e.g. "F(a)" with "G(a)")
+        found = None
+        for i, (atoms, terms) in enumerate(replacements):
+            if (line_n_atom, current_atom) == atoms:
+                found = i
+        if found is not None:
+            if (direction is not None) and (direction != found):
+                return substitution_error
+            direction = found
+            continue
+
+        if len(current_atom.terms) != len(line_n_atom.terms):
+            return structure_error
+        if current_atom.predicate != line_n_atom.predicate:
+            return substitution_error
+
+        # Replacing terms (e.g. "a" with "b")
+        for line_n_term, current_term in zip(line_n_atom.terms, current_atom.terms):
+            if line_n_term == current_term:
+                continue
+            found = None
+            for i, (atoms, terms) in enumerate(replacements):
+                if ((line_n_term,), (current_term,)) == terms:
+                    found = i
+            if (found is None) or ((direction is not None) and (direction != found)):
+                return substitution_error
+            direction = found
 
     response = ProofResponse()
     response.is_valid = True
-    return response
\ No newline at end of file
+    return response
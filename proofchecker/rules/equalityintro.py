@@ -1,11 +1,12 @@
 from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj, ProofResponse
-from proofchecker.proofs.proofutils import make_tree
+from proofchecker.proofs.proofutils import get_tree
 from .rule import Rule
 
 class EqualityIntro(Rule):
 
     name = "Equality Introduction"
     symbols = "=I"
+    quotes_expressions = True
 
     def verify(self, current_line: ProofLineObj, proof: ProofObj, parser):
         """
@@ -16,7 +17,7 @@ class EqualityIntro(Rule):
 
         try:
 
-            root_current = make_tree(current_line.expression, parser)
+            root_current = get_tree(current_line.expression, proof, parser)
 
             # Verify the root operand is =
             if not root_current.value == '=':
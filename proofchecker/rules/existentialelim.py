@@ -1,13 +1,14 @@
 from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj, ProofResponse
-from proofchecker.proofs.proofutils import clean_rule, find_c, get_citable_lines, get_line_nos, get_line_with_line_no, get_lines_in_subproof, \
-    get_expressions, verify_line_citation, verify_line_citation, make_tree, is_name, is_var, verify_same_structure_FOL, \
-    verify_var_replaces_some_name
+from proofchecker.proofs.proofutils import clean_rule, find_c, iter_citable_lines, get_line_nos, get_line_with_line_no, get_lines_in_subproof, \
+    get_expressions, verify_line_citation, verify_line_citation, get_tree, is_name, is_var, verify_same_structure_FOL, \
+    verify_var_replaces_some_name, name_may_appear_in_scope
 from .rule import Rule
 
 class ExistentialElim(Rule):
 
     name = "Existential Elimination"
     symbols = "∃E"
+    uses_scope = True
     
     def verify(self, current_line: ProofLineObj, proof: ProofObj, parser):
         """
@@ -33,10 +34,10 @@ class ExistentialElim(Rule):
             # Search for lines m, i.1, i.x
             try:
                 expressions = get_expressions(target_lines)
-                root_m = make_tree(expressions[0], parser)
-                root_i_1 = make_tree(expressions[1], parser)
-                root_i_x = make_tree(expressions[2], parser)
-                root_current = make_tree(current_line.expression, parser)
+                root_m = get_tree(expressions[0], proof, parser)
+                root_i_1 = get_tree(expressions[1], proof, parser)
+                root_i_x = get_tree(expressions[2], proof, parser)
+                root_current = get_tree(current_line.expression, proof, parser)
 
                 # Verify root operand of line m is ∃
                 if (root_m.value[0] != '∃'):
@@ -66,12 +67,12 @@ class ExistentialElim(Rule):
 
                 # Verify that 'c' (on line i_1) does not appear earlier in the proof
                 c = find_c(root_m.right, root_i_1, var)
-                citable_lines = get_citable_lines(lines_i[0], proof)
-                for line in citable_lines:
-                    if c in line.expression:
-                        response.err_msg = 'Error on line {}: The name "{}" on line {} should not appear earlier in the proof (it appears on line {})'\
-                            .format(current_line.line_no, c, lines_i[0].line_no, line.line_no)
-                        return response
+                if name_may_appear_in_scope(c, lines_i[0], proof):
+                    for line in iter_citable_lines(lines_i[0], proof):
+                        if c in line.expression:
+                            response.err_msg = 'Error on line {}: The name "{}" on line {} should not appear earlier in the proof (it appears on line {})'\
+                                .format(current_line.line_no, c, lines_i[0].line_no, line.line_no)
+                            return response
 
                 # Verify that 'B' does not contain 'c'
                 if c in current_line.expression:
@@ -1,5 +1,5 @@
 from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj, ProofResponse
-from proofchecker.proofs.proofutils import clean_rule, get_line, verify_line_citation, make_tree, \
+from proofchecker.proofs.proofutils import clean_rule, get_line, verify_line_citation, get_tree, \
     verify_same_structure_FOL, verify_var_replaces_some_name
 from .rule import Rule
 
@@ -27,8 +27,8 @@ class ExistentialIntro(Rule):
 
             try: 
                 expression = target_line.expression
-                root_m = make_tree(expression, parser)
-                current = make_tree(current_line.expression, parser)
+                root_m = get_tree(expression, proof, parser)
+                current = get_tree(current_line.expression, proof, parser)
 
                 # Verify root operand of current line is ∃
                 if (current.value[0] != '∃'):
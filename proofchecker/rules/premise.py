@@ -1,11 +1,12 @@
 from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj, ProofResponse
-from proofchecker.proofs.proofutils import make_tree
+from proofchecker.proofs.proofutils import get_premise_index, get_tree
 from .rule import Rule
 
 class Premise(Rule):
 
     name = "Premise"
     symbols = "Premise"
+    uses_premises = True
 
     def verify(self, current_line: ProofLineObj, proof: ProofObj, parser):
         """
@@ -14,25 +15,25 @@ class Premise(Rule):
         response = ProofResponse()
         try:
             current_exp = current_line.expression
-            current = make_tree(current_exp, parser)
+            current = get_tree(current_exp, proof, parser)
+
+            # The premises are parsed once per proof
+            premises = get_premise_index(proof, parser)
+            if current in premises:
+                response.is_valid = True
+                return response
+
+            # The expression may match a premise that could not be parsed
+            if premises.errors:
+                raise premises.errors[0][1]
 
             # If there is only one premise
             if isinstance(proof.premises, str):
-                if make_tree(proof.premises, parser) == current:
-                    response.is_valid = True
-                    return response
-                else:
-                    response.err_msg = "Error on line {}: Expression on line {} is not a premise"\
-                        .format(str(current_line.line_no), str(current_line.line_no))
-                    return response                
-
-            # If multiple expressions, search for the premise
-            for premise in proof.premises:
-                if make_tree(premise, parser) == current:
-                    response.is_valid = True
-                    return response
-        
-            # If not found, invalid
+                response.err_msg = "Error on line {}: Expression on line {} is not a premise"\
+                    .format(str(current_line.line_no), str(current_line.line_no))
+                return response                
+
+            # If not found in multiple premises, invalid
             response.err_msg = "Error on line {}: Expression on line {} not found in premises"\
                 .format(str(current_line.line_no), str(current_line.line_no))
             return response
@@ -6,6 +6,18 @@ class Rule(ABC):
     An interface for creating Rule objects
     """
 
+    # Whether verify reads proof.premises, or lines it does not cite,
+    # and whether its error messages quote expressions as written
+    # (used to decide which edits invalidate a cached result)
+    uses_premises = False
+    uses_scope = False
+    quotes_expressions = False
+
+    # Whether a chain of ∧ or ∨ written without parentheses may be read
+    # in any grouping (A∧B∧C as (A∧B)∧C or A∧(B∧C)).  Off by default:
+    # a course can register a subclass of ∧E or ∨I with it set
+    modulo_association = False
+
     @abstractmethod
     def verify(self, current_line: ProofLineObj, proof: ProofObj, parser):
         pass
\ No newline at end of file
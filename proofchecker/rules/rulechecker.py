@@ -39,31 +39,102 @@ FOL_BASIC_RULES = [ExistentialElim(), ExistentialIntro(), UniversalElim(), Unive
 
 FOL_DERIVED_RULES = [ConversionOfQuantifiers()]
 
-class RuleChecker:
+# Rule tiers of each ruleset, from highest to lowest precedence
+# (when two tiers define the same symbol, the earlier tier wins)
+RULESET_TIERS = {
+    'tfl_basic': [TFL_BASIC_RULES],
+    'tfl_derived': [TFL_DERIVED_RULES, TFL_BASIC_RULES],
+    'fol_basic': [FOL_BASIC_RULES, TFL_BASIC_RULES],
+    'fol_derived': [FOL_DERIVED_RULES, FOL_BASIC_RULES, TFL_DERIVED_RULES, TFL_BASIC_RULES],
+}
 
-    def get_rule(self, rule: str, proof: ProofObj):
+# Ruleset used for proofs whose ruleset is not registered
+DEFAULT_RULESET = 'tfl_basic'
+
+
+class RuleRegistry:
+    """
+    Merges the rule tiers of every ruleset into a single dictionary
+    keyed by the casefolded rule symbols, so a rule is found with one lookup
+    """
+
+    def __init__(self, tiers: dict):
+        self.tiers = dict((name, list(ruleset)) for name, ruleset in tiers.items())
+        # Rules registered on top of the tiers of a ruleset (newest first)
+        self.extra_rules = {}
+        self.tables = {}
+
+    def table(self, ruleset: str):
         """
-        Determine which rule is being applied
+        Returns the merged {symbol: rule} dictionary of a ruleset
         """
+        table = self.tables.get(ruleset)
+        if table is None:
+            table = {}
+            # Merge from lowest to highest precedence, so the
+            # first rule with a given symbol overwrites the others
+            tiers = [self.extra_rules.get(ruleset, [])] + self.tiers[ruleset]
+            for tier in reversed(tiers):
+                for rule in reversed(tier):
+                    table[rule.symbols.casefold()] = rule
+            self.tables[ruleset] = table
+        return table
 
-        if proof.rules == 'fol_derived':
-            for derived_fol_rule in FOL_DERIVED_RULES:
-                if rule.casefold() == derived_fol_rule.symbols.casefold():
-                    return derived_fol_rule
+    def get_rule(self, ruleset: str, symbols: str):
+        """
+        Returns the rule of a ruleset with the given symbols (or None)
+        """
+        if ruleset not in self.tiers:
+            ruleset = DEFAULT_RULESET
+        return self.table(ruleset).get(symbols.casefold())
 
-        if ((proof.rules == 'fol_derived') or (proof.rules == 'fol_basic')):
-            for basic_fol_rule in FOL_BASIC_RULES:
-                if rule.casefold() == basic_fol_rule.symbols.casefold():
-                    return basic_fol_rule
+    def register_ruleset(self, name: str, rules: list, base: str = DEFAULT_RULESET):
+        """
+        Add (or replace) a ruleset made of rules on top of the rules of base
+        (e.g. an instructor-defined set of derived rules)
+        """
+        tiers = [list(rules)]
+        if base is not None:
+            tiers += self.tiers[base]
+        self.tiers[name] = tiers
+        self.extra_rules.pop(name, None)
+        self.tables.clear()
 
-        if ((proof.rules == 'fol_derived') or (proof.rules == 'tfl_derived')):
-            for derived_rule in TFL_DERIVED_RULES:
-                if rule.casefold() == derived_rule.symbols.casefold():
-                    return derived_rule
+    def register_rule(self, rule: Rule, rulesets: list = None):
+        """
+        Add a rule to existing rulesets (all of them by default).
+        A registered rule takes precedence over built-in rules with the same symbols
+        """
+        if rulesets is None:
+            rulesets = list(self.tiers)
+        for name in rulesets:
+            if name not in self.tiers:
+                raise KeyError('Ruleset "{}" is not registered'.format(name))
+            self.extra_rules.setdefault(name, []).insert(0, rule)
+        self.tables.clear()
 
-        for basic_rule in TFL_BASIC_RULES:
-            if rule.casefold() == basic_rule.symbols.casefold():
-                return basic_rule
 
-                
-        return None
\ No newline at end of file
+rule_registry = RuleRegistry(RULESET_TIERS)
+
+
+def register_ruleset(name: str, rules: list, base: str = DEFAULT_RULESET):
+    """
+    Register an extra ruleset with the shared rule registry
+    """
+    rule_registry.register_ruleset(name, rules, base)
+
+
+def register_rule(rule: Rule, rulesets: list = None):
+    """
+    Register an extra rule with the shared rule registry
+    """
+    rule_registry.register_rule(rule, rulesets)
+
+
+class RuleChecker:
+
+    def get_rule(self, rule: str, proof: ProofObj):
+        """
+        Determine which rule is being applied
+        """
+        return rule_registry.get_rule(proof.rules, rule)
@@ -0,0 +1,349 @@
+from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj, ProofResponse
+from proofchecker.proofs.proofutils import Citation, get_tree, verify_line_citation
+from proofchecker.proofs.proofindex import get_index
+from proofchecker.utils import tflparser
+from proofchecker.utils.binarytree import InternedNode, intern_tree
+from .rule import Rule
+
+# Rules written as schemas, e.g. 'm: ¬(A∧B) ⊢ ¬A∨¬B' for the first
+# De Morgan rule: the cited lines (m, n, ...) and the current line must
+# be instances of the formulas, with each capital letter standing for
+# the same sentence everywhere it appears.  A cited subproof is written
+# with its first and last line, e.g. 'i-j: A ... B ⊢ A→B' for →I.
+# A schema is compiled once into interned pattern trees; a rule with
+# several schemas picks the ones for the root connective of its first
+# cited line, and the line is valid if it is an instance of any of them.
+#
+# Every TFL rule checked by comparing trees is a SchemaRule.  Premise
+# and Assumption (which check where a line stands, not its tree) and
+# the FOL rules (which substitute names for variables) are written by hand
+
+CONNECTIVE_NAMES = {
+    '¬': 'a negation (¬)',
+    '∧': 'a conjunction (∧)',
+    '∨': 'a disjunction (∨)',
+    '→': 'an implication (→)',
+    '↔': 'a biconditional (↔)',
+    '⊥': 'a contradiction (⊥)',
+}
+
+
+def connective(node: InternedNode):
+    """
+    Returns the value of a node, with False written as ⊥
+    """
+    if node.value.casefold() == 'false':
+        return '⊥'
+    return node.value
+
+
+def is_metavariable(node: InternedNode):
+    """
+    Returns True if a pattern node is a capital letter (matching any sentence)
+    """
+    return (node.left is None) and (node.right is None) and (len(node.value) == 1) and ('A' <= node.value <= 'Z')
+
+
+def spine(pattern: InternedNode):
+    """
+    Returns the connectives a sentence must have to match a pattern,
+    from the root down through negations, e.g. ('¬', '∧') for ¬(A∧B)
+    """
+    values = []
+    node = pattern
+    while (node is not None) and not is_metavariable(node):
+        values.append(node.value)
+        if node.value != '¬':
+            break
+        node = node.right
+    return tuple(values)
+
+
+def spine_mismatch(values: tuple, tree: InternedNode):
+    """
+    Returns the depth of the first connective of a spine missing from
+    a tree, or None if the tree has them all
+    """
+    node = tree
+    for depth, value in enumerate(values):
+        if (node is None) or (connective(node) != value):
+            return depth
+        node = node.right
+    return None
+
+
+def tree_spine(tree: InternedNode, length: int):
+    """
+    Returns the connectives of a tree from the root down through
+    negations, at most length of them
+    """
+    values = []
+    node = tree
+    while (node is not None) and (len(values) < length):
+        values.append(connective(node))
+        if node.value != '¬':
+            break
+        node = node.right
+    return tuple(values)
+
+
+def unify(pattern: InternedNode, tree: InternedNode, bindings: dict):
+    """
+    Unify a pattern with a tree, extending the bindings of the capital letters.
+    Returns (bindings, matched, side): the new bindings (or None if the tree
+    is not an instance of the pattern), the number of pattern nodes matched,
+    and the side of the root ('left' or 'right') where matching failed
+    """
+    bindings = dict(bindings)
+    matched = 0
+    # Left to right, so matched counts the nodes before the first difference
+    stack = [(pattern, tree, None)]
+    while stack:
+        p, t, side = stack.pop()
+        if is_metavariable(p):
+            bound = bindings.get(p.value)
+            if bound is None:
+                bindings[p.value] = t
+            elif bound != t:
+                return None, matched, side
+            matched += 1
+            continue
+        if (t is None) or (connective(p) != connective(t)):
+            return None, matched, side
+        for child_side, p_child, t_child in (('right', p.right, t.right), ('left', p.left, t.left)):
+            if (p_child is None) != (t_child is None):
+                return None, matched, side or child_side
+            if p_child is not None:
+                stack.append((p_child, t_child, side or child_side))
+        matched += 1
+    return bindings, matched, None
+
+
+def match(pattern: InternedNode, tree: InternedNode, bindings: dict):
+    """
+    Unify a pattern with a tree, extending the bindings of the capital letters.
+    Returns the new bindings, or None if the tree is not an instance of the pattern
+    """
+    return unify(pattern, tree, bindings)[0]
+
+
+def parse_pattern(formula: str):
+    tree = tflparser.parser.parse(formula, lexer=tflparser.lexer)
+    if tree is None:
+        raise ValueError('Invalid schema formula {}'.format(formula))
+    return intern_tree(tree)
+
+
+class Schema:
+    """
+    One form of a rule, e.g. Schema('m: A→B, n: ¬B ⊢ ¬A').
+    Error messages may be given for a line missing a connective of its
+    pattern (roots, a message or a list of messages by depth), for a line
+    that does not match its pattern (mismatch, a message or a message by
+    side of the root, {'left': ..., 'right': ...}), for cited lines that
+    must differ (distinct, as (slot, slot, message)), and for letters that
+    must stand for different sentences (distinct, as (letter, letter, message)).
+    A schema with an error message is a recognised mistake: its instances
+    are rejected with that message (unless another schema accepts them).
+    Messages are formatted with the line numbers ({current}, {m}, {n}, ...)
+    and the root of each line ({current_root}, {m_root}, ...).
+    The lines are checked in order (by default the cited lines, then the
+    current line); with roots_first the root connectives of every line
+    are checked before matching any line
+    """
+    def __init__(self, text: str, roots=None, mismatch=None, distinct=None, error=None, order=None,
+        roots_first=True):
+        self.text = text
+        cited, conclusion = text.split('⊢')
+        # The slots of each citation: (m,) for a line, (i, j) for a subproof
+        self.citations = []
+        self.slots = []
+        self.patterns = {}
+        for part in cited.split(','):
+            names, formulas = part.split(':')
+            names = tuple(name.strip() for name in names.split('-'))
+            formulas = formulas.split('...')
+            self.citations.append(names)
+            for name, formula in zip(names, formulas):
+                self.slots.append(name)
+                self.patterns[name] = parse_pattern(formula.strip())
+        self.patterns['current'] = parse_pattern(conclusion.strip())
+        self.order = list(order or (self.slots + ['current']))
+        self.spines = dict((slot, spine(pattern)) for slot, pattern in self.patterns.items())
+        self.roots = roots or {}
+        self.mismatch = mismatch or {}
+        self.error = error
+
+        distinct = distinct or []
+        differ = [entry for entry in distinct if entry[0] in self.patterns]
+        letters = [entry for entry in distinct if entry[0] not in self.patterns]
+        roots = [('root', slot) for slot in self.order if self.spines[slot]]
+        matches = [('match', slot) for slot in self.order]
+        if roots_first:
+            self.steps = roots + [('differ', entry) for entry in differ] + matches
+        else:
+            self.steps = [('differ', entry) for entry in differ]
+            for slot in self.order:
+                if self.spines[slot]:
+                    self.steps.append(('root', slot))
+                self.steps.append(('match', slot))
+        self.steps += [('distinct', entry) for entry in letters]
+
+
+class SchemaRule(Rule):
+    """
+    A rule verified by matching its schemas.
+    Subclasses set name, symbols, usage (e.g. 'De Morgan: DeM m'), the
+    schemas, and no_match, the message when no schema applies to the
+    root of the first cited line
+    """
+    usage = ''
+    schemas = []
+    no_match = "Error on line {current}: Line {m} does not match any form of this rule"
+
+    def __init__(self):
+        # Spine of the first cited line -> schemas
+        self.dispatch = {}
+        for schema in self.schemas:
+            self.dispatch.setdefault(schema.spines[schema.slots[0]], []).append(schema)
+        self.spine_lengths = sorted(set(len(key) for key in self.dispatch), reverse=True)
+
+    def select(self, tree: InternedNode):
+        """
+        Returns the schemas for the root of the first cited line (or None)
+        """
+        if len(self.dispatch) == 1:
+            return self.schemas
+        for length in self.spine_lengths:
+            schemas = self.dispatch.get(tree_spine(tree, length))
+            if schemas is not None:
+                return schemas
+        return None
+
+    def root_message(self, schema: Schema, slot: str, depth: int):
+        message = schema.roots.get(slot)
+        if isinstance(message, (list, tuple)):
+            message = message[min(depth, len(message)-1)]
+        if message is None:
+            message = "Error on line {current}: The root of line {%s} should be %s when applying %s" \
+                % (slot, CONNECTIVE_NAMES.get(schema.spines[slot][0], schema.spines[slot][0]), self.name.lower())
+        return message
+
+    def mismatch_message(self, schema: Schema, slot: str, side=None):
+        message = schema.mismatch.get(slot)
+        if isinstance(message, dict):
+            message = message.get(side) or message.get('left')
+        if message is None:
+            message = "Error on line {current}: Line {%s} does not match %s in %s %s" \
+                % (slot, str(schema.patterns[slot]), self.symbols, schema.text)
+        return message
+
+    def attempt(self, schema: Schema, trees: dict):
+        """
+        Match the lines (slot -> tree) against a schema.
+        Returns None if they are an instance of it, or else how far the
+        matching went (to report the schema that came closest) and the
+        unformatted error message
+        """
+        bindings = {}
+        for step, (kind, arg) in enumerate(schema.steps):
+            if kind == 'root':
+                depth = spine_mismatch(schema.spines[arg], trees[arg])
+                if depth is not None:
+                    return (step, depth), self.root_message(schema, arg, depth)
+            elif kind == 'differ':
+                if trees[arg[0]] == trees[arg[1]]:
+                    return (step, 0), arg[2]
+            elif kind == 'match':
+                bindings, matched, side = unify(schema.patterns[arg], trees[arg], bindings)
+                if bindings is None:
+                    return (step, matched), self.mismatch_message(schema, arg, side)
+            elif bindings[arg[0]] == bindings[arg[1]]:
+                return (step, 0), arg[2]
+
+        if schema.error is not None:
+            return (len(schema.steps), 0), schema.error
+        return None
+
+    def check(self, trees: dict, expressions: dict):
+        """
+        Returns None if the lines (slot -> tree, with their expressions as
+        written) are an instance of one of the schemas, or else the
+        unformatted error message of the schema they came closest to
+        """
+        first = self.schemas[0].slots[0]
+        schemas = self.select(trees[first])
+        if schemas is None:
+            return self.no_match
+
+        closest = None
+        for schema in schemas:
+            failure = self.attempt(schema, trees)
+            if failure is None:
+                return None
+            if (closest is None) or (failure[0] > closest[0]):
+                closest = failure
+        return closest[1]
+
+    def verify(self, current_line: ProofLineObj, proof: ProofObj, parser):
+        """
+        Verify the rule by matching the cited lines and the current line
+        against the schemas
+        """
+        response = ProofResponse()
+        citations = self.schemas[0].citations
+        index = get_index(proof)
+
+        # Attempt to find the cited lines and subproofs
+        try:
+            # More line numbers than the rule cites is a malformed rule
+            # (too few are reported as line numbers not specified correctly)
+            line_nos = Citation(current_line.rule).line_nos
+            if len(line_nos) > len(citations):
+                raise ValueError('Too many line numbers')
+
+            target_lines = []
+            for position, slots in enumerate(citations):
+                line_no = line_nos[position] if position < len(line_nos) else None
+                if line_no is None:
+                    target_lines.extend([None] * len(slots))
+                    continue
+
+                # Verify the line citation is valid
+                result = verify_line_citation(current_line.line_no, line_no)
+                if result.is_valid == False:
+                    return result
+
+                if len(slots) == 1:
+                    target_lines.append(index.get_line(line_no))
+                else:
+                    target_lines.extend(index.get_subproof(line_no) or [None, None])
+
+            try:
+                trees = {'current': get_tree(current_line.expression, proof, parser)}
+                expressions = {'current': str(current_line.expression)}
+                fields = {'current': str(current_line.line_no)}
+                for slot, line in zip(self.schemas[0].slots, target_lines):
+                    trees[slot] = get_tree(line.expression, proof, parser)
+                    expressions[slot] = str(line.expression)
+                    fields[slot] = str(line.line_no)
+                for slot, tree in list(trees.items()):
+                    fields[slot + '_root'] = str(tree.value)
+
+                message = self.check(trees, expressions)
+                if message is not None:
+                    response.err_msg = message.format(**fields)
+                    return response
+
+                response.is_valid = True
+                return response
+
+            except:
+                response.err_msg = "Error on line {}: Line numbers are not specified correctly.  {}"\
+                    .format(str(current_line.line_no), self.usage)
+                return response
+
+        except:
+            response.err_msg = "Error on line {}: Rule not formatted properly.  {}"\
+                .format(str(current_line.line_no), self.usage)
+            return response
@@ -1,5 +1,5 @@
 from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj, ProofResponse
-from proofchecker.proofs.proofutils import clean_rule, get_line, verify_line_citation, make_tree, verify_same_structure_FOL, \
+from proofchecker.proofs.proofutils import clean_rule, get_line, verify_line_citation, get_tree, verify_same_structure_FOL, \
     verify_var_replaces_some_name
 from .rule import Rule
 
@@ -26,8 +26,8 @@ class UniversalElim(Rule):
                 return result
 
             try: 
-                root_m = make_tree(target_line.expression, parser)
-                current = make_tree(current_line.expression, parser)
+                root_m = get_tree(target_line.expression, proof, parser)
+                current = get_tree(current_line.expression, proof, parser)
 
                 # Verify root operand of line m is ∀
                 if (root_m.value[0] != '∀'):
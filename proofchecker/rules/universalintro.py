@@ -1,12 +1,13 @@
 from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj, ProofResponse
-from proofchecker.proofs.proofutils import clean_rule, find_c, get_citable_lines, get_line, verify_line_citation, \
-    make_tree, verify_same_structure_FOL, verify_var_replaces_every_name
+from proofchecker.proofs.proofutils import clean_rule, find_c, iter_citable_lines, get_line, verify_line_citation, \
+    get_tree, verify_same_structure_FOL, verify_var_replaces_every_name, name_may_appear_in_scope
 from .rule import Rule
 
 class UniversalIntro(Rule):
 
     name = "Universal Introduction"
     symbols = "∀I"
+    uses_scope = True
 
     def verify(self, current_line: ProofLineObj, proof: ProofObj, parser):
         """
@@ -26,8 +27,8 @@ class UniversalIntro(Rule):
                 return result
 
             try: 
-                root_m = make_tree(target_line.expression, parser)
-                current = make_tree(current_line.expression, parser)
+                root_m = get_tree(target_line.expression, proof, parser)
+                current = get_tree(current_line.expression, proof, parser)
 
                 # Verify root operand of current line is ∀
                 if (current.value[0] != '∀'):
@@ -51,19 +52,17 @@ class UniversalIntro(Rule):
 
                 # TODO: Verify that the name represents a "generic free variable"
                 c = find_c(current.right, root_m, var)
-                citable_lines = get_citable_lines(current_line, proof)
-                if len(citable_lines) > 0:
-                    citable_lines_with_c = []
-                    for line in citable_lines:
+                # (only the first line in scope that mentions c matters)
+                if name_may_appear_in_scope(c, current_line, proof):
+                    for line in iter_citable_lines(current_line, proof):
                         if c in line.expression:
-                            citable_lines_with_c.append(line)
-                    if len(citable_lines_with_c) > 0:
-                        if (citable_lines_with_c[0].rule.casefold() == 'Premise'.casefold()) or \
-                            (citable_lines_with_c[0].rule.casefold() == 'Assumption'.casefold()) or \
-                            (citable_lines_with_c[0].rule.casefold() == 'Assumpt'.casefold()):
-                            response.err_msg = 'Error on line {}: The name "{}" on line {} must be a generic free variable'\
-                                .format(current_line.line_no, c, target_line.line_no)
-                            return response
+                            if (line.rule.casefold() == 'Premise'.casefold()) or \
+                                (line.rule.casefold() == 'Assumption'.casefold()) or \
+                                (line.rule.casefold() == 'Assumpt'.casefold()):
+                                response.err_msg = 'Error on line {}: The name "{}" on line {} must be a generic free variable'\
+                                    .format(current_line.line_no, c, target_line.line_no)
+                                return response
+                            break
 
                 response.is_valid = True
                 return response
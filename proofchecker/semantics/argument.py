@@ -0,0 +1,54 @@
+# Checks run when an instructor authors a Problem, so a problem whose
+# premises do not entail its conclusion is caught before it is published
+
+from proofchecker.proofs.proofobjects import ProofResponse
+from proofchecker.proofs.proofutils import get_premises, make_tree
+from proofchecker.utils import folparser, tflparser
+
+from . import finitemodels
+from .entailment import find_countermodel
+from .truthtable import format_assignment
+
+TFL_RULESETS = ('tfl_basic', 'tfl_derived')
+FOL_RULESETS = ('fol_basic', 'fol_derived')
+
+# Bounds of the FOL model search run while a form is submitted
+FOL_MAX_DOMAIN_SIZE = 3
+FOL_TIME_LIMIT = 1.0
+
+
+def check_argument(rules: str, premises: str, conclusion: str):
+    """
+    Verify that the premises of a problem entail its conclusion
+    Returns a ProofResponse with a countermodel in the error message if not.
+    FOL arguments are only searched for small countermodels, so an FOL
+    argument without one may still be invalid.
+    Arguments that cannot be checked (expressions that do not parse, or
+    a search over its budget) are reported as valid, the proof checker
+    reports syntax errors itself
+    """
+    response = ProofResponse(is_valid=True)
+    if (rules not in TFL_RULESETS + FOL_RULESETS) or (not conclusion):
+        return response
+
+    try:
+        parser = tflparser.parser if rules in TFL_RULESETS else folparser.parser
+        premise_trees = [make_tree(premise, parser) for premise in get_premises(premises)]
+        conclusion_tree = make_tree(conclusion, parser)
+        if rules in TFL_RULESETS:
+            countermodel = find_countermodel(premise_trees, conclusion_tree)
+            if countermodel is not None:
+                countermodel = format_assignment(countermodel)
+        else:
+            result = finitemodels.find_countermodel(premise_trees, conclusion_tree,
+                FOL_MAX_DOMAIN_SIZE, FOL_TIME_LIMIT)
+            countermodel = str(result.model) if result.status == finitemodels.FOUND else None
+    except Exception:
+        # A syntax error, an unsupported formula or a SatBudgetExceeded
+        return response
+
+    if countermodel is not None:
+        response.is_valid = False
+        response.err_msg = 'The premises do not entail the conclusion (countermodel: {})'\
+            .format(countermodel)
+    return response
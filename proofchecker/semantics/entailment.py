@@ -0,0 +1,36 @@
+# Entailment and equivalence queries for TFL, answered with a truth table
+# when it is small enough and with the SAT solver otherwise
+
+from proofchecker.utils.binarytree import Node
+
+from . import sat, truthtable
+from .sat import MAX_CONFLICTS, TIME_LIMIT
+
+
+def find_countermodel(premises, conclusion: Node, max_conflicts=MAX_CONFLICTS, time_limit=TIME_LIMIT):
+    """
+    Returns an assignment making every premise true and the conclusion
+    false, or None if the premises entail the conclusion
+    Raises a SatBudgetExceeded if the SAT solver runs out of budget
+    """
+    try:
+        return truthtable.find_countermodel(premises, conclusion)
+    except truthtable.TooManyAtomsError:
+        return sat.find_countermodel(premises, conclusion, max_conflicts, time_limit)
+
+
+def entails(premises, conclusion: Node, max_conflicts=MAX_CONFLICTS, time_limit=TIME_LIMIT):
+    """
+    Returns True if the premises entail the conclusion
+    """
+    return find_countermodel(premises, conclusion, max_conflicts, time_limit) is None
+
+
+def equivalent(tree_1: Node, tree_2: Node, max_conflicts=MAX_CONFLICTS, time_limit=TIME_LIMIT):
+    """
+    Returns True if two formulas are true on exactly the same assignments
+    """
+    try:
+        return truthtable.equivalent(tree_1, tree_2)
+    except truthtable.TooManyAtomsError:
+        return sat.equivalent(tree_1, tree_2, max_conflicts, time_limit)
@@ -0,0 +1,331 @@
+# A bounded model finder for FOL: interpretations of the predicates and
+# names of an argument are enumerated over domains of size 1..N, looking
+# for one that makes every premise true and the conclusion false.
+# Formulas are evaluated for every assignment of their variables at once:
+# each subformula is an int with one bit per assignment (as truthtable.py
+# does for the rows of a truth table)
+
+import itertools
+import threading
+import time
+
+from proofchecker.utils.binarytree import Node
+
+from .truthtable import FALSE_VALUES, TRUE_VALUES, walk
+
+# Default bounds for a single search
+MAX_DOMAIN_SIZE = 3
+TIME_LIMIT = 2.0
+
+# Search outcomes
+FOUND = 'countermodel'
+NOT_FOUND = 'none'
+TIMED_OUT = 'timeout'
+
+QUANTIFIERS = ('∀', '∃')
+
+
+def is_name(ch):
+    return 'a' <= ch <= 'r'
+
+
+def is_var(ch):
+    return 's' <= ch <= 'z'
+
+
+def parse_atom(value: str):
+    """
+    Returns the predicate and terms of an atomic formula,
+    e.g. ('F', ['a', 'x']) for 'F(a,x)' or 'Fax'
+    """
+    predicate = value[0]
+    terms = [ch for ch in value[1:] if ch not in '(),']
+    if (not 'A' <= predicate <= 'R') or (not terms) or (not all(is_name(t) or is_var(t) for t in terms)):
+        raise ValueError('Unsupported atomic formula {}'.format(value))
+    return predicate, terms
+
+
+class Signature:
+    """
+    The predicates (with their arity), names and variables of one or more formulas
+    """
+    def __init__(self, *trees):
+        self.predicates = set()
+        names = set()
+        variables = set()
+        for tree in trees:
+            for node in walk(tree):
+                value = node.value
+                if value[0] in QUANTIFIERS:
+                    variables.add(value[1])
+                elif value == '=':
+                    for term in (node.left.value, node.right.value):
+                        if (len(term) != 1) or not (is_name(term) or is_var(term)):
+                            raise ValueError('Unsupported identity {}'.format(term))
+                        (names if is_name(term) else variables).add(term)
+                elif (node.left is None) and (node.right is None):
+                    if (value in TRUE_VALUES) or (value in FALSE_VALUES) or (len(value) == 1):
+                        continue
+                    predicate, terms = parse_atom(value)
+                    self.predicates.add((predicate, len(terms)))
+                    for term in terms:
+                        (names if is_name(term) else variables).add(term)
+        self.predicates = sorted(self.predicates)
+        self.names = sorted(names)
+        self.variables = sorted(variables)
+
+
+class Model:
+    """
+    An interpretation over the domain {0, ..., size-1}: a value for each
+    name, and the extension of each predicate as an int with one bit per
+    tuple (tuple (d1, ..., dk) is bit d1 + d2*size + ... + dk*size^(k-1))
+    """
+    def __init__(self, size: int, names: dict, extensions: dict):
+        self.size = size
+        self.names = names
+        self.extensions = extensions
+
+    def tuples(self, predicate, arity: int):
+        """
+        Returns the tuples in the extension of a predicate
+        """
+        extension = self.extensions[(predicate, arity)]
+        result = []
+        for index in range(self.size ** arity):
+            if (extension >> index) & 1:
+                result.append(tuple((index // self.size ** j) % self.size for j in range(arity)))
+        return result
+
+    def __str__(self):
+        parts = ['domain {{{}}}'.format(', '.join(str(d) for d in range(self.size)))]
+        for name in sorted(self.names):
+            parts.append('{}={}'.format(name, self.names[name]))
+        for predicate, arity in sorted(self.extensions):
+            tuples = self.tuples(predicate, arity)
+            if arity == 1:
+                members = [str(t[0]) for t in tuples]
+            else:
+                members = ['({})'.format(','.join(str(d) for d in t)) for t in tuples]
+            parts.append('{}={{{}}}'.format(predicate, ', '.join(members)))
+        return '; '.join(parts)
+
+
+class Evaluator:
+    """
+    Evaluates formulas in a model for every assignment of the variables
+    at once.  Assignment (v1=d1, ..., vm=dm) is bit d1 + d2*size + ...
+    so a formula is true in the model when its column is full
+    """
+    def __init__(self, size: int, variables):
+        self.size = size
+        self.variables = dict((var, i) for i, var in enumerate(variables))
+        self.count = size ** len(variables)
+        self.full = (1 << self.count) - 1
+
+        # Variable -> value -> assignments where the variable has that value
+        self.masks = {}
+        for var, i in self.variables.items():
+            step = size ** i
+            self.masks[var] = []
+            for d in range(size):
+                mask = 0
+                for index in range(self.count):
+                    if (index // step) % size == d:
+                        mask |= 1 << index
+                self.masks[var].append(mask)
+
+    def term_mask(self, term: str, d: int, model: Model):
+        """
+        Returns the assignments where a term denotes d
+        """
+        if is_name(term):
+            return self.full if model.names[term] == d else 0
+        return self.masks[term][d]
+
+    def atom(self, value: str, model: Model):
+        predicate, terms = parse_atom(value)
+        arity = len(terms)
+        extension = model.extensions[(predicate, arity)]
+        column = 0
+        for index in range(self.size ** arity):
+            if not (extension >> index) & 1:
+                continue
+            mask = self.full
+            for j, term in enumerate(terms):
+                mask &= self.term_mask(term, (index // self.size ** j) % self.size, model)
+                if not mask:
+                    break
+            column |= mask
+        return column
+
+    def quantify(self, value: str, column: int):
+        var = value[1]
+        step = self.size ** self.variables[var]
+        masks = self.masks[var]
+        # Move the assignments with var=d onto those with var=0, then combine
+        combined = None
+        for d in range(self.size):
+            part = (column & masks[d]) >> (d * step)
+            if combined is None:
+                combined = part
+            elif value[0] == '∀':
+                combined &= part
+            else:
+                combined |= part
+        # Copy the result to every value of var
+        result = 0
+        for d in range(self.size):
+            result |= combined << (d * step)
+        return result
+
+    def evaluate(self, tree: Node, model: Model):
+        values = {}
+        stack = [(tree, False)]
+        while stack:
+            node, visited = stack.pop()
+            if id(node) in values:
+                continue
+            value = node.value
+            if (not visited) and (value != '='):
+                stack.append((node, True))
+                for child in (node.left, node.right):
+                    if child is not None:
+                        stack.append((child, False))
+                continue
+
+            if value == '=':
+                column = 0
+                for d in range(self.size):
+                    column |= self.term_mask(node.left.value, d, model) & self.term_mask(node.right.value, d, model)
+            elif value[0] in QUANTIFIERS:
+                column = self.quantify(value, values[id(node.right)])
+            elif (node.left is None) and (node.right is None):
+                if value in TRUE_VALUES:
+                    column = self.full
+                elif value in FALSE_VALUES:
+                    column = 0
+                else:
+                    column = self.atom(value, model)
+            elif value == '¬':
+                column = self.full ^ values[id(node.right)]
+            else:
+                left = values[id(node.left)]
+                right = values[id(node.right)]
+                if value == '∧':
+                    column = left & right
+                elif value == '∨':
+                    column = left | right
+                elif value == '→':
+                    column = (self.full ^ left) | right
+                elif value == '↔':
+                    column = self.full ^ (left ^ right)
+                else:
+                    raise ValueError('Unknown connective {}'.format(value))
+            values[id(node)] = column
+        return values[id(tree)]
+
+    def is_true(self, tree: Node, model: Model):
+        return self.evaluate(tree, model) == self.full
+
+
+def name_assignments(count: int, size: int):
+    """
+    Yields the values of count names over a domain of the given size,
+    up to renaming the elements of the domain (each name is at most one
+    more than the largest value used before it)
+    """
+    def extend(prefix, largest):
+        if len(prefix) == count:
+            yield list(prefix)
+            return
+        for d in range(min(largest + 2, size)):
+            prefix.append(d)
+            yield from extend(prefix, max(largest, d))
+            prefix.pop()
+    yield from extend([], -1)
+
+
+class SearchResult:
+    """
+    The outcome of a search: FOUND (with the model), NOT_FOUND (no
+    countermodel up to max_size) or TIMED_OUT (after checked_size)
+    """
+    def __init__(self, status: str, max_size: int, model: Model = None, checked_size: int = 0):
+        self.status = status
+        self.max_size = max_size
+        self.model = model
+        self.checked_size = checked_size
+
+    def __str__(self):
+        if self.status == FOUND:
+            return 'Countermodel: {}'.format(self.model)
+        if self.status == NOT_FOUND:
+            return 'No countermodel up to domain size {}'.format(self.max_size)
+        return 'No countermodel up to domain size {} (time limit reached)'.format(self.checked_size)
+
+
+def find_countermodel(premises, conclusion: Node, max_size=MAX_DOMAIN_SIZE, time_limit=TIME_LIMIT, cancel=None):
+    """
+    Search domains of size 1..max_size for a model of the premises in
+    which the conclusion is false.  All quantifiers range over the same
+    domain, whatever domain letter they use.
+    Returns a SearchResult.  The search stops when time_limit seconds
+    have passed or the cancel Event is set
+    Raises a ValueError for formulas the model finder does not support
+    """
+    trees = list(premises) + [conclusion]
+    signature = Signature(*trees)
+    deadline = time.monotonic() + time_limit if time_limit is not None else None
+
+    for size in range(1, max_size + 1):
+        evaluator = Evaluator(size, signature.variables)
+        ranges = [range(1 << (size ** arity)) for predicate, arity in signature.predicates]
+        for values in name_assignments(len(signature.names), size):
+            names = dict(zip(signature.names, values))
+            for extensions in itertools.product(*ranges):
+                if ((deadline is not None) and (time.monotonic() > deadline)) or \
+                        ((cancel is not None) and cancel.is_set()):
+                    return SearchResult(TIMED_OUT, max_size, checked_size=size-1)
+                model = Model(size, names, dict(zip(signature.predicates, extensions)))
+                if evaluator.is_true(conclusion, model):
+                    continue
+                if all(evaluator.is_true(premise, model) for premise in premises):
+                    return SearchResult(FOUND, max_size, model, size)
+    return SearchResult(NOT_FOUND, max_size, checked_size=max_size)
+
+
+class ModelSearch(threading.Thread):
+    """
+    Runs find_countermodel on a background thread, for larger domains.
+    Call start(), then wait() for the SearchResult (or cancel())
+    """
+    def __init__(self, premises, conclusion: Node, max_size=MAX_DOMAIN_SIZE, time_limit=TIME_LIMIT):
+        super().__init__(daemon=True)
+        self.premises = list(premises)
+        self.conclusion = conclusion
+        self.max_size = max_size
+        self.time_limit = time_limit
+        self.cancelled = threading.Event()
+        self.result = None
+        self.error = None
+
+    def run(self):
+        try:
+            self.result = find_countermodel(self.premises, self.conclusion, self.max_size,
+                self.time_limit, self.cancelled)
+        except Exception as err:
+            self.error = err
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def wait(self, timeout=None):
+        """
+        Returns the SearchResult, or None if still running after timeout
+        Raises the error of a failed search
+        """
+        self.join(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.result
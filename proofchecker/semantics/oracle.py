@@ -0,0 +1,112 @@
+# A semantic check run before a rule's syntactic checks: if the cited
+# lines (and the open assumptions) do not even entail the current line,
+# no TFL rule can justify it, and a countermodel shows why
+
+from proofchecker.proofs.proofindex import get_index
+from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj, ProofResponse
+from proofchecker.proofs.proofutils import compile_proof, verify_line_citation
+
+from proofchecker.utils.binarytree import InternedNode
+
+from . import sat
+from .argument import TFL_RULESETS
+from .truthtable import MAX_ATOMS, TooManyAtomsError, TruthTable, atoms, format_assignment, lowest_row
+
+
+def proof_truth_table(compiled):
+    """
+    Returns the TruthTable over every sentence letter of a compiled proof,
+    building it on first use (None if there are too many letters).
+    Columns are cached by the table, so each line is evaluated once
+    """
+    if compiled.truth_table is None:
+        trees = [tree for tree, err in compiled.trees.values() if err is None]
+        try:
+            compiled.truth_table = TruthTable(atoms(*trees))
+        except TooManyAtomsError:
+            compiled.truth_table = False
+    return compiled.truth_table or None
+
+
+def cited_facts(current_line: ProofLineObj, proof: ProofObj, compiled):
+    """
+    Returns what a rule applied on current_line may rely on, as
+    (antecedent, consequent) pairs of trees (antecedent None for a line):
+    the cited lines, the cited subproofs (as conditionals) and the
+    assumptions of the subproofs current_line is in.
+    Returns None if a citation is missing or invalid (the rule reports it)
+    """
+    compiled_line = compiled.line(current_line)
+    citation = compiled_line.citation
+    if (citation is None) or (not citation.line_nos):
+        return None
+
+    index = get_index(proof)
+    facts = []
+    for line_no in citation.line_nos:
+        if not verify_line_citation(current_line.line_no, line_no).is_valid:
+            return None
+        line = index.get_line(line_no)
+        if line is not None:
+            facts.append((None, compiled.tree(line.expression)))
+            continue
+        subproof = index.get_subproof(line_no)
+        if subproof is None:
+            return None
+        facts.append((compiled.tree(subproof[0].expression), compiled.tree(subproof[1].expression)))
+
+    number = compiled_line.number
+    for k in range(1, len(number)):
+        subproof = index.subproofs.get(number[:k])
+        if (subproof is not None) and (subproof[0] is not current_line):
+            facts.append((None, compiled.tree(subproof[0].expression)))
+    return facts
+
+
+def check_entailment(current_line: ProofLineObj, proof: ProofObj, parser):
+    """
+    Verify the facts a rule may rely on entail the current line
+    Returns a ProofResponse with a countermodel if they do not,
+    or None if they do (or if the check does not apply)
+    """
+    if proof.rules not in TFL_RULESETS:
+        return None
+
+    try:
+        compiled = compile_proof(proof, parser)
+        current = compiled.line(current_line).tree
+        facts = cited_facts(current_line, proof, compiled)
+        if facts is None:
+            return None
+
+        trees = [current] + [tree for fact in facts for tree in fact if tree is not None]
+        letters = atoms(*trees)
+        table = proof_truth_table(compiled)
+        if (table is None) and (len(letters) > MAX_ATOMS):
+            # Too many letters for a truth table, ask the SAT solver
+            premises = [consequent if antecedent is None else InternedNode('→', antecedent, consequent)
+                for antecedent, consequent in facts]
+            row = sat.find_countermodel(premises, current)
+        else:
+            if table is None:
+                table = TruthTable(letters)
+            rows = table.full ^ table.evaluate(current)
+            for antecedent, consequent in facts:
+                column = table.evaluate(consequent)
+                if antecedent is not None:
+                    column |= table.full ^ table.evaluate(antecedent)
+                rows &= column
+            row = table.row(lowest_row(rows)) if rows else None
+    except Exception:
+        # Syntax errors, invalid line numbers and SAT queries over
+        # their budget are left to the rule
+        return None
+
+    if row is None:
+        return None
+
+    response = ProofResponse()
+    response.err_msg = "Error on line {}: Line {} does not follow from the cited lines (countermodel: {})"\
+        .format(str(current_line.line_no), str(current_line.line_no),
+            format_assignment(dict((letter, row[letter]) for letter in letters)))
+    return response
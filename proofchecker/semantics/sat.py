@@ -0,0 +1,389 @@
+# A SAT backend for TFL, for arguments with too many sentence letters
+# for a truth table: formulas are converted to CNF with the Tseitin
+# encoding and solved by a CDCL solver (two watched literals,
+# first-UIP clause learning, activity-based decisions and restarts)
+
+import time
+
+from proofchecker.utils.binarytree import InternedNode, Node, intern_tree
+
+from .truthtable import FALSE_VALUES, TRUE_VALUES
+
+# Default budgets for a single query
+MAX_CONFLICTS = 20000
+TIME_LIMIT = 2.0
+
+# Conflicts before the first restart, and growth factor between restarts
+RESTART_FIRST = 100
+RESTART_FACTOR = 1.5
+
+# Activity decay (the increment grows instead of decaying every variable)
+ACTIVITY_DECAY = 0.95
+
+
+class SatBudgetExceeded(Exception):
+    """
+    Raised when a query runs out of conflicts or time before an answer is found
+    """
+    def __init__(self, conflicts: int, elapsed: float):
+        self.conflicts = conflicts
+        self.elapsed = elapsed
+        self.message = 'SAT budget exceeded after {} conflicts ({:.2f}s)'\
+            .format(conflicts, elapsed)
+        super().__init__(self.message)
+
+
+class CNF:
+    """
+    Clauses built with the Tseitin encoding: every connective gets a new
+    variable equivalent to its subformula, so the CNF grows linearly with
+    the formula.  Variables are positive ints, literals are +v or -v.
+    Interned subtrees shared between formulas are encoded once
+    """
+    def __init__(self):
+        self.num_vars = 0
+        self.clauses = []
+        # Sentence letter -> variable
+        self.letters = {}
+        # InternedNode -> literal
+        self.literals = {}
+        self.true_var = None
+
+    def new_var(self):
+        self.num_vars += 1
+        return self.num_vars
+
+    def constant(self, value: bool):
+        if self.true_var is None:
+            self.true_var = self.new_var()
+            self.clauses.append([self.true_var])
+        return self.true_var if value else -self.true_var
+
+    def encode(self, tree: Node):
+        """
+        Returns the literal equivalent to a formula, adding its clauses
+        """
+        literals = {}
+
+        def lookup(node):
+            if isinstance(node, InternedNode) and node in self.literals:
+                return self.literals[node]
+            return literals.get(id(node))
+
+        stack = [(tree, False)]
+        while stack:
+            node, visited = stack.pop()
+            if lookup(node) is not None:
+                continue
+            if not visited:
+                stack.append((node, True))
+                for child in (node.left, node.right):
+                    if child is not None:
+                        stack.append((child, False))
+                continue
+
+            value = node.value
+            if (node.left is None) and (node.right is None):
+                if value in TRUE_VALUES:
+                    literal = self.constant(True)
+                elif value in FALSE_VALUES:
+                    literal = self.constant(False)
+                else:
+                    if value not in self.letters:
+                        self.letters[value] = self.new_var()
+                    literal = self.letters[value]
+            elif value == '¬':
+                literal = -lookup(node.right)
+            else:
+                a = lookup(node.left)
+                b = lookup(node.right)
+                x = self.new_var()
+                if value == '∧':
+                    self.clauses.extend([[-x, a], [-x, b], [x, -a, -b]])
+                elif value == '∨':
+                    self.clauses.extend([[-x, a, b], [x, -a], [x, -b]])
+                elif value == '→':
+                    self.clauses.extend([[-x, -a, b], [x, a], [x, -b]])
+                elif value == '↔':
+                    self.clauses.extend([[-x, -a, b], [-x, a, -b], [x, a, b], [x, -a, -b]])
+                else:
+                    raise ValueError('Unknown connective {}'.format(value))
+                literal = x
+
+            literals[id(node)] = literal
+            if isinstance(node, InternedNode):
+                self.literals[node] = literal
+        return lookup(tree)
+
+    def assert_formula(self, tree: Node, value=True):
+        """
+        Add a unit clause making a formula true (or false)
+        """
+        literal = self.encode(tree)
+        self.clauses.append([literal if value else -literal])
+
+
+class Solver:
+    """
+    A CDCL SAT solver.  solve returns True (satisfiable, see model),
+    False (unsatisfiable) or None if the conflict or time budget ran out
+    """
+    def __init__(self, num_vars: int, clauses, max_conflicts=MAX_CONFLICTS, time_limit=TIME_LIMIT):
+        self.num_vars = num_vars
+        self.max_conflicts = max_conflicts
+        self.time_limit = time_limit
+        self.conflicts = 0
+
+        # Variable -> 1 (true), -1 (false) or 0 (unassigned)
+        self.values = [0] * (num_vars + 1)
+        self.levels = [0] * (num_vars + 1)
+        self.reasons = [None] * (num_vars + 1)
+        self.phases = [-1] * (num_vars + 1)
+        self.activity = [0.0] * (num_vars + 1)
+        self.increment = 1.0
+
+        self.trail = []
+        self.trail_limits = []
+        self.queue_head = 0
+
+        # Literal -> indexes of the clauses watching it
+        self.clauses = []
+        self.watches = dict((literal, []) for v in range(1, num_vars + 1) for literal in (v, -v))
+        self.unsatisfiable = False
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def value(self, literal: int):
+        value = self.values[abs(literal)]
+        return value if literal > 0 else -value
+
+    def level(self):
+        return len(self.trail_limits)
+
+    def add_clause(self, clause):
+        """
+        Add an input clause (at decision level 0)
+        """
+        literals = []
+        for literal in clause:
+            if -literal in literals:
+                return
+            if literal not in literals:
+                literals.append(literal)
+
+        if not literals:
+            self.unsatisfiable = True
+        elif len(literals) == 1:
+            value = self.value(literals[0])
+            if value == -1:
+                self.unsatisfiable = True
+            elif value == 0:
+                self.enqueue(literals[0], None)
+        else:
+            self.attach(literals)
+
+    def attach(self, literals):
+        self.clauses.append(literals)
+        index = len(self.clauses) - 1
+        self.watches[literals[0]].append(index)
+        self.watches[literals[1]].append(index)
+        return index
+
+    def enqueue(self, literal: int, reason):
+        var = abs(literal)
+        self.values[var] = 1 if literal > 0 else -1
+        self.levels[var] = self.level()
+        self.reasons[var] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """
+        Unit propagation over the watched literals
+        Returns the index of a conflicting clause, or None
+        """
+        while self.queue_head < len(self.trail):
+            false_literal = -self.trail[self.queue_head]
+            self.queue_head += 1
+
+            watching = self.watches[false_literal]
+            self.watches[false_literal] = kept = []
+            for i, index in enumerate(watching):
+                clause = self.clauses[index]
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+
+                if self.value(clause[0]) == 1:
+                    kept.append(index)
+                    continue
+
+                # Look for a new literal to watch
+                for k in range(2, len(clause)):
+                    if self.value(clause[k]) != -1:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches[clause[1]].append(index)
+                        break
+                else:
+                    kept.append(index)
+                    if self.value(clause[0]) == -1:
+                        kept.extend(watching[i+1:])
+                        return index
+                    self.enqueue(clause[0], index)
+        return None
+
+    def bump(self, var: int):
+        self.activity[var] += self.increment
+        if self.activity[var] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.increment *= 1e-100
+
+    def analyze(self, conflict: int):
+        """
+        Returns the first-UIP clause learnt from a conflict (asserting
+        literal first) and the level to backjump to
+        """
+        seen = [False] * (self.num_vars + 1)
+        learnt = [None]
+        pending = 0
+        literal = None
+        i = len(self.trail) - 1
+        clause = self.clauses[conflict]
+        level = self.level()
+
+        while True:
+            for q in clause:
+                var = abs(q)
+                if (literal is not None) and (var == abs(literal)):
+                    continue
+                if (not seen[var]) and (self.levels[var] > 0):
+                    seen[var] = True
+                    self.bump(var)
+                    if self.levels[var] == level:
+                        pending += 1
+                    else:
+                        learnt.append(q)
+
+            # The next literal of the current level on the trail
+            while not seen[abs(self.trail[i])]:
+                i -= 1
+            literal = self.trail[i]
+            i -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.clauses[self.reasons[abs(literal)]]
+
+        learnt[0] = -literal
+        if len(learnt) == 1:
+            return learnt, 0
+
+        # Watch the literal with the highest level next to the asserting literal
+        best = max(range(1, len(learnt)), key=lambda k: self.levels[abs(learnt[k])])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, self.levels[abs(learnt[1])]
+
+    def backtrack(self, level: int):
+        if self.level() <= level:
+            return
+        limit = self.trail_limits[level]
+        for literal in self.trail[limit:]:
+            var = abs(literal)
+            self.phases[var] = self.values[var]
+            self.values[var] = 0
+            self.reasons[var] = None
+        del self.trail[limit:]
+        del self.trail_limits[level:]
+        self.queue_head = len(self.trail)
+
+    def decide(self):
+        """
+        Returns the unassigned variable with the highest activity (or None)
+        """
+        best = None
+        best_activity = -1.0
+        for var in range(1, self.num_vars + 1):
+            if (self.values[var] == 0) and (self.activity[var] > best_activity):
+                best = var
+                best_activity = self.activity[var]
+        return best
+
+    def solve(self):
+        if self.unsatisfiable:
+            return False
+        start = time.monotonic()
+        restart_limit = RESTART_FIRST
+        restart_conflicts = 0
+
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                restart_conflicts += 1
+                if self.level() == 0:
+                    return False
+                if (self.max_conflicts is not None) and (self.conflicts > self.max_conflicts):
+                    return None
+                if (self.time_limit is not None) and (time.monotonic() - start > self.time_limit):
+                    return None
+
+                learnt, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learnt) == 1:
+                    self.enqueue(learnt[0], None)
+                else:
+                    self.enqueue(learnt[0], self.attach(learnt))
+                self.increment /= ACTIVITY_DECAY
+                continue
+
+            if restart_conflicts >= restart_limit:
+                restart_conflicts = 0
+                restart_limit = int(restart_limit * RESTART_FACTOR)
+                self.backtrack(0)
+                continue
+
+            var = self.decide()
+            if var is None:
+                return True
+            self.trail_limits.append(len(self.trail))
+            self.enqueue(var if self.phases[var] > 0 else -var, None)
+
+    def model(self):
+        """
+        Returns the satisfying assignment found by solve, as var -> bool
+        """
+        return dict((var, self.values[var] > 0) for var in range(1, self.num_vars + 1))
+
+
+def find_countermodel(premises, conclusion: Node, max_conflicts=MAX_CONFLICTS, time_limit=TIME_LIMIT):
+    """
+    Returns an assignment making every premise true and the conclusion
+    false, or None if the premises entail the conclusion
+    Raises a SatBudgetExceeded if the budget runs out first
+    """
+    cnf = CNF()
+    for premise in premises:
+        cnf.assert_formula(premise)
+    cnf.assert_formula(conclusion, False)
+
+    start = time.monotonic()
+    solver = Solver(cnf.num_vars, cnf.clauses, max_conflicts, time_limit)
+    result = solver.solve()
+    if result is None:
+        raise SatBudgetExceeded(solver.conflicts, time.monotonic() - start)
+    if not result:
+        return None
+    model = solver.model()
+    return dict((letter, model[var]) for letter, var in cnf.letters.items())
+
+
+def entails(premises, conclusion: Node, max_conflicts=MAX_CONFLICTS, time_limit=TIME_LIMIT):
+    """
+    Returns True if the premises entail the conclusion
+    """
+    return find_countermodel(premises, conclusion, max_conflicts, time_limit) is None
+
+
+def equivalent(tree_1: Node, tree_2: Node, max_conflicts=MAX_CONFLICTS, time_limit=TIME_LIMIT):
+    """
+    Returns True if two formulas are true on exactly the same assignments
+    """
+    return entails([], InternedNode('↔', intern_tree(tree_1), intern_tree(tree_2)), max_conflicts, time_limit)
@@ -0,0 +1,187 @@
+# Truth tables for TFL computed bit-parallel: each sentence letter and
+# each formula is a single int with one bit per row of the truth table,
+# so a connective is one bitwise operation over every row at once
+
+from proofchecker.utils.binarytree import InternedNode, Node
+
+# Largest number of sentence letters checked with a truth table
+# (2^20 rows is a 128KB int per formula)
+MAX_ATOMS = 20
+
+TRUE_VALUES = ('True', 'TRUE')
+FALSE_VALUES = ('False', 'FALSE', '⊥')
+
+
+class TooManyAtomsError(ValueError):
+    """
+    Raised when a truth table would have more than MAX_ATOMS sentence letters
+    """
+    def __init__(self, count: int):
+        self.count = count
+        self.message = 'Too many sentence letters for a truth table ({}, at most {})'\
+            .format(count, MAX_ATOMS)
+        super().__init__(self.message)
+
+
+def walk(tree: Node):
+    """
+    Yields every node of a tree (iteratively, so deep trees are fine)
+    """
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        yield node
+        stack.append(node.right)
+        stack.append(node.left)
+
+
+def atoms(*trees):
+    """
+    Returns the sorted sentence letters appearing in one or more TFL trees
+    """
+    letters = set()
+    for tree in trees:
+        for node in walk(tree):
+            if (node.left is None) and (node.right is None) and (node.value not in TRUE_VALUES + FALSE_VALUES):
+                letters.add(node.value)
+    return sorted(letters)
+
+
+def atom_vector(i: int, size: int):
+    """
+    Returns the column of the i-th sentence letter in a truth table with
+    size rows: row k is true when bit i of k is set
+    """
+    width = 2 << i
+    vector = ((1 << (1 << i)) - 1) << (1 << i)
+    while width < size:
+        vector |= vector << width
+        width *= 2
+    return vector & ((1 << size) - 1)
+
+
+class TruthTable:
+    """
+    The truth table over a fixed list of sentence letters.
+    evaluate returns the column of a formula as an int, with bit k set
+    when the formula is true on row k.  Columns of subformulas are
+    cached, so formulas sharing (interned) subtrees are evaluated once
+    """
+    def __init__(self, letters):
+        if len(letters) > MAX_ATOMS:
+            raise TooManyAtomsError(len(letters))
+        self.letters = list(letters)
+        self.size = 1 << len(self.letters)
+        self.full = (1 << self.size) - 1
+        self.columns = {}
+        for i, letter in enumerate(self.letters):
+            self.columns[letter] = atom_vector(i, self.size)
+        self.cache = {}
+
+    def evaluate(self, tree: Node):
+        """
+        Returns the column of a formula
+        Raises a ValueError for a node that is not a TFL connective or letter
+        """
+        values = {}
+        stack = [(tree, False)]
+        while stack:
+            node, visited = stack.pop()
+            if id(node) in values:
+                continue
+            cached = self.cache.get(node) if isinstance(node, InternedNode) else None
+            if cached is not None:
+                values[id(node)] = cached
+                continue
+            if not visited:
+                stack.append((node, True))
+                for child in (node.left, node.right):
+                    if child is not None:
+                        stack.append((child, False))
+                continue
+
+            value = node.value
+            if (node.left is None) and (node.right is None):
+                if value in TRUE_VALUES:
+                    column = self.full
+                elif value in FALSE_VALUES:
+                    column = 0
+                elif value in self.columns:
+                    column = self.columns[value]
+                else:
+                    raise ValueError('Unknown sentence letter {}'.format(value))
+            elif value == '¬':
+                column = self.full ^ values[id(node.right)]
+            else:
+                left = values[id(node.left)]
+                right = values[id(node.right)]
+                if value == '∧':
+                    column = left & right
+                elif value == '∨':
+                    column = left | right
+                elif value == '→':
+                    column = (self.full ^ left) | right
+                elif value == '↔':
+                    column = self.full ^ (left ^ right)
+                else:
+                    raise ValueError('Unknown connective {}'.format(value))
+
+            values[id(node)] = column
+            if isinstance(node, InternedNode):
+                self.cache[node] = column
+        return values[id(tree)]
+
+    def row(self, k: int):
+        """
+        Returns the assignment of row k, e.g. {'P': True, 'Q': False}
+        """
+        return dict((letter, bool((k >> i) & 1)) for i, letter in enumerate(self.letters))
+
+
+def lowest_row(column: int):
+    """
+    Returns the index of the lowest set bit of a column
+    """
+    return (column & -column).bit_length() - 1
+
+
+def find_countermodel(premises, conclusion: Node):
+    """
+    Returns an assignment making every premise true and the conclusion
+    false, or None if the premises entail the conclusion
+    Raises a TooManyAtomsError if the truth table would be too large
+    """
+    table = TruthTable(atoms(conclusion, *premises))
+    rows = table.full ^ table.evaluate(conclusion)
+    for premise in premises:
+        if not rows:
+            break
+        rows &= table.evaluate(premise)
+    if not rows:
+        return None
+    return table.row(lowest_row(rows))
+
+
+def entails(premises, conclusion: Node):
+    """
+    Returns True if every row making the premises true makes the conclusion true
+    """
+    return find_countermodel(premises, conclusion) is None
+
+
+def equivalent(tree_1: Node, tree_2: Node):
+    """
+    Returns True if two formulas have the same truth table
+    """
+    table = TruthTable(atoms(tree_1, tree_2))
+    return table.evaluate(tree_1) == table.evaluate(tree_2)
+
+
+def format_assignment(assignment: dict):
+    """
+    Returns an assignment as text, e.g. 'P=T, Q=F'
+    """
+    return ', '.join('{}={}'.format(letter, 'T' if assignment[letter] else 'F')
+        for letter in sorted(assignment))
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Proof, ProofLine, ProofVerification
+
+
+@receiver(post_save, sender=Proof)
+def proof_changed(sender, instance, **kwargs):
+    """
+    Delete the stored verification of a proof when it is saved
+    """
+    ProofVerification.objects.filter(proof_id=instance.pk).delete()
+
+
+@receiver([post_save, post_delete], sender=ProofLine)
+def proofline_changed(sender, instance, **kwargs):
+    """
+    Delete the stored verification of a proof when one of its lines
+    is saved or deleted
+    """
+    ProofVerification.objects.filter(proof_id=instance.proof_id).delete()
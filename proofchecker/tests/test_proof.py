@@ -1,10 +1,15 @@
+import os
+
 from django.test import TestCase
 
-from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj
+from proofchecker.proofs.proofobjects import LineNumber, ProofObj, ProofLineObj
 from proofchecker.proofs.proofutils import find_c, get_citable_lines, get_line_no, get_line_nos, get_lines_in_subproof, \
     get_premises, is_conclusion, is_valid_expression, is_var, make_tree, verify_expression, verify_line_citation, \
-    depth, verify_line_citation, clean_rule, verify_same_structure_FOL, count_inputs, verify_var_replaces_every_name
-from proofchecker.proofs.proofchecker import verify_proof, verify_rule
+    depth, verify_line_citation, clean_rule, verify_same_structure_FOL, count_inputs, verify_var_replaces_every_name, \
+    compile_proof, get_tree
+from proofchecker.proofs.proofchecker import proof_pool, verify_proof, verify_proofs, verify_rule
+from proofchecker.proofs.proofcache import proof_digest, rule_cache, verification_cache
+from proofchecker.proofs.proofindex import get_index
 from proofchecker.utils import tflparser
 
 from proofchecker.rules.conditionalelim import ConditionalElim
@@ -737,7 +742,7 @@ class ProofTests(TestCase):
         """
         # Test a proof with an invalid character
         line1 = ProofLineObj('1', 'Hello', 'Premise')
-        proof = ProofObj(premises='Hello', lines=[line1])
+        proof = ProofObj(premises='A', lines=[line1])
         parser = tflparser.parser
         result = verify_proof(proof, parser)
         self.assertFalse(result.is_valid)
@@ -745,11 +750,27 @@ class ProofTests(TestCase):
 
         # Test a proof with an valid characters but invalid syntax
         line1 = ProofLineObj('1', 'A∧', 'Premise')
-        proof = ProofObj(premises='A∧', lines=[line1])
+        proof = ProofObj(premises='A', lines=[line1])
         parser = tflparser.parser
         result = verify_proof(proof, parser)
         self.assertFalse(result.is_valid)
         self.assertEqual(result.err_msg, 'Syntax error on line 1.  Expression "A∧" does not conform to ruleset "TFL - Basic Rules Only"')
+
+        # Test that malformed premises are reported before any line
+        line1 = ProofLineObj('1', 'Hello', 'Premise')
+        proof = ProofObj(premises='Hello', lines=[line1])
+        parser = tflparser.parser
+        result = verify_proof(proof, parser)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, 'Illegal character \'e\' in premise "Hello"')
+
+        line1 = ProofLineObj('1', 'A', 'Premise')
+        proof = ProofObj(premises=['A', 'A∧'], lines=[line1])
+        parser = tflparser.parser
+        result = verify_proof(proof, parser, full_report=True)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, 'Syntax error in premise "A∧".  Expression does not conform to ruleset "TFL - Basic Rules Only"')
+        self.assertTrue(result.line_responses[0].is_valid)
     
         # Test with a valid but incomplete proof
         line1 = ProofLineObj('1', '(A∧C)∨(B∧C)', 'Premise')
@@ -761,4 +782,461 @@ class ProofTests(TestCase):
         self.assertTrue(result.is_valid)
         self.assertEqual(result.err_msg, "All lines are valid, but the proof is incomplete")
 
+    def test_verify_proof_full_report(self):
+        """
+        Test that verify_proof with full_report=True verifies every line,
+        and marks the lines citing an invalid line as depending on it
+        """
+        line1 = ProofLineObj('1', 'A∧B', 'Premise')
+        line2 = ProofLineObj('2', 'C', '∧E 1')
+        line3 = ProofLineObj('3', 'A', '∧E 1')
+        line4 = ProofLineObj('4', 'C∧A', '∧I 2, 3')
+        line5 = ProofLineObj('5', 'A∧C', '∧I 3, 4')
+        proof = ProofObj(premises='A∧B', conclusion='A∧C', lines=[line1, line2, line3, line4, line5])
+        parser = tflparser.parser
+        result = verify_proof(proof, parser, full_report=True)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, verify_proof(proof, parser).err_msg)
+
+        responses = result.line_responses
+        self.assertEqual([r.line_no for r in responses], ['1', '2', '3', '4', '5'])
+        self.assertTrue(responses[0].is_valid)
+        self.assertFalse(responses[1].is_valid)
+        self.assertEqual(responses[1].err_msg, result.err_msg)
+        self.assertTrue(responses[2].is_valid)
+        self.assertEqual(responses[2].depends_on, [])
+        self.assertEqual(responses[3].depends_on, ['2'])
+        # Line 5 only depends on line 2 through line 4
+        self.assertEqual(responses[4].depends_on, ['4'])
+
+        # Without errors the conclusion checks still apply
+        proof = ProofObj(premises='A∧B', conclusion='A', lines=[line1, line3])
+        result = verify_proof(proof, parser, full_report=True)
+        self.assertTrue(result.is_valid)
+        self.assertIsNone(result.err_msg)
+        self.assertTrue(all(r.is_valid for r in result.line_responses))
+
+    def test_verify_proof_full_report_subproof(self):
+        """
+        Test that citing a subproof containing an invalid line
+        is marked as depending on the subproof
+        """
+        line1 = ProofLineObj('1', 'A', 'Premise')
+        line2 = ProofLineObj('2.1', 'B', 'Assumption')
+        line3 = ProofLineObj('2.2', 'C', '∧E 2.1')
+        line4 = ProofLineObj('3', 'B→C', '→I 2')
+        proof = ProofObj(premises='A', conclusion='B→C', lines=[line1, line2, line3, line4])
+        parser = tflparser.parser
+        result = verify_proof(proof, parser, full_report=True)
+        self.assertFalse(result.is_valid)
+        responses = result.line_responses
+        self.assertFalse(responses[2].is_valid)
+        self.assertEqual(responses[3].depends_on, ['2'])
+
+
+class CountingParser:
+    """
+    Wraps a parser to count how many times it is invoked
+    """
+    def __init__(self, parser):
+        self.parser = parser
+        self.lexer = parser.lexer
+        self.calls = 0
+
+    def parse(self, string, lexer=None):
+        self.calls += 1
+        return self.parser.parse(string, lexer=lexer)
+
+
+class CompiledProofTests(TestCase):
+
+    def test_expressions_are_parsed_once(self):
+        """
+        Test that verify_proof parses each distinct expression only once
+        """
+        line1 = ProofLineObj('1', 'A∧B', 'Premise')
+        line2 = ProofLineObj('2', 'A', '∧E 1')
+        line3 = ProofLineObj('3', 'B', '∧E 1')
+        line4 = ProofLineObj('4', 'B∧A', '∧I 3, 2')
+        proof = ProofObj(premises=['A∧B'], conclusion='B∧A', lines=[line1, line2, line3, line4])
+        parser = CountingParser(tflparser.parser)
+        result = verify_proof(proof, parser)
+        self.assertTrue(result.is_valid)
+        self.assertIsNone(result.err_msg)
+        self.assertEqual(parser.calls, 4)
+
+    def test_premise_index(self):
+        """
+        Test that premises are parsed once into a set of trees,
+        and that malformed premises are kept apart
+        """
+        premises = ['A', 'B∨C', '(D→E)', 'F∧', '']
+        lines = [ProofLineObj(str(i+1), premise, 'Premise') for i, premise in enumerate(premises[:3])]
+        proof = ProofObj(premises=premises, lines=lines)
+        parser = CountingParser(tflparser.parser)
+        index = compile_proof(proof, parser).premise_index
+        self.assertEqual(len(index.trees), 3)
+        self.assertEqual([premise for premise, err in index.errors], ['F∧'])
+        self.assertIn(make_tree('D→E', tflparser.parser), index)
+        self.assertNotIn(make_tree('E→D', tflparser.parser), index)
+
+        calls = parser.calls
+        for line in lines:
+            self.assertTrue(verify_rule(line, proof, parser).is_valid)
+        self.assertEqual(parser.calls, calls)
+
+    def test_compiled_lines(self):
+        """
+        Test that a compiled proof holds the tree, depth and citation of each line
+        """
+        line1 = ProofLineObj('1', 'A∨B', 'Premise')
+        line2 = ProofLineObj('2.1', 'A', 'Assumption')
+        line3 = ProofLineObj('2.2', 'A∧', '→I 2.1-2.2')
+        proof = ProofObj(premises='A∨B', lines=[line1, line2, line3])
+        compiled = compile_proof(proof, tflparser.parser)
+        self.assertEqual(len(compiled.lines), 3)
+        self.assertEqual(str(compiled.lines[0].tree), 'A∨B')
+        self.assertEqual(compiled.lines[1].depth, 2)
+        self.assertEqual(compiled.lines[2].citation.symbol, '→I')
+        self.assertEqual(compiled.lines[2].citation.line_nos, ['2.1', '2.2'])
+        self.assertRaises(SyntaxError, getattr, compiled.lines[2], 'tree')
+        self.assertIs(get_tree('A∨B', proof, tflparser.parser), compiled.lines[0].tree)
+
+
+class LineNumberTests(TestCase):
+
+    def test_line_number_parse(self):
+        """
+        Test that line numbers are parsed once into interned integer tuples
+        """
+        a = LineNumber.parse('3.12.4')
+        self.assertEqual(a, (3, 12, 4))
+        self.assertEqual(a.depth, 3)
+        self.assertEqual(str(a), '3.12.4')
+        self.assertEqual(a.parent, (3, 12))
+        self.assertIs(LineNumber.parse('3.12.4'), a)
+        self.assertEqual(LineNumber.parse(' 3 . 12.4'), a)
+        for invalid in ['', '3.', '.3', '3..4', '3a', '3 4', '3-4']:
+            self.assertRaises(SyntaxError, LineNumber.parse, invalid)
+
+    def test_line_number_ordering(self):
+        """
+        Test that line numbers compare numerically and support prefix tests
+        """
+        self.assertLess(LineNumber.parse('9.1'), LineNumber.parse('10'))
+        self.assertLess(LineNumber.parse('2.1'), LineNumber.parse('2.1.1'))
+        self.assertTrue(LineNumber.parse('2').is_ancestor_of(LineNumber.parse('2.1')))
+        self.assertFalse(LineNumber.parse('1').is_ancestor_of(LineNumber.parse('10.1')))
+        self.assertTrue(LineNumber.parse('10.1').startswith(LineNumber.parse('10')))
+
+    def test_multi_digit_line_numbers(self):
+        """
+        Test that citations and subproofs compare line numbers as integers
+        """
+        result = verify_line_citation('10.2', '9.1')
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, 'Error on line 10.2: Invalid citation: Line 9.1 occurs in a previous subproof')
+
+        line1 = ProofLineObj('1.1', 'A', 'Assumption')
+        line2 = ProofLineObj('10.1', 'B', 'Assumption')
+        proof = ProofObj(lines=[line1, line2])
+        self.assertEqual(get_lines_in_subproof('1', proof), [line1, line1])
+
+
+class ProofIndexTests(TestCase):
+
+    def test_proof_index(self):
+        """
+        Test that the index maps line numbers and subproofs to lines
+        """
+        line1 = ProofLineObj('1', 'A∨B', 'Premise')
+        line2_1 = ProofLineObj('2.1', 'A', 'Assumption')
+        line2_2_1 = ProofLineObj('2.2.1', 'B', 'Assumption')
+        line2_3 = ProofLineObj('2.3', 'A', 'R 2.1')
+        line3 = ProofLineObj('3', 'A→A', '→I 2.1-2.3')
+        proof = ProofObj(lines=[line1, line2_1, line2_2_1, line2_3, line3])
+        index = get_index(proof)
+        self.assertIs(index.get_line('2.3'), line2_3)
+        self.assertIsNone(index.get_line('4'))
+        self.assertEqual(index.get_subproof('2'), [line2_1, line2_3])
+        self.assertEqual(index.get_subproof('2.2'), [line2_2_1, line2_2_1])
+        self.assertIsNone(index.get_subproof('3'))
+        self.assertRaises(SyntaxError, index.get_subproof, '2-3')
+
+        # The index is built once, and rebuilt when lines are added
+        self.assertIs(get_index(proof), index)
+        line4 = ProofLineObj('4', 'A', 'R 2.1')
+        proof.lines.append(line4)
+        self.assertIs(get_index(proof).get_line('4'), line4)
+
+    def test_lines_edited_in_place(self):
+        """
+        Test that verifying a proof again after renumbering or editing a
+        line in place gives the same result as a fresh proof
+        """
+        parser = tflparser.parser
+        line1 = ProofLineObj('1', 'A∧B', 'Premise')
+        line2 = ProofLineObj('2', 'A', '∧E 1')
+        proof = ProofObj(premises=['A∧B'], conclusion='A', lines=[line1, line2])
+        self.assertIsNone(verify_proof(proof, parser).err_msg)
+
+        line1.line_no = '3'
+        fresh = ProofObj(premises=['A∧B'], conclusion='A',
+            lines=[ProofLineObj('3', 'A∧B', 'Premise'), ProofLineObj('2', 'A', '∧E 1')])
+        expected = verify_proof(fresh, parser).err_msg
+        self.assertIsNotNone(expected)
+        self.assertEqual(verify_proof(proof, parser).err_msg, expected)
+
+        line1.line_no = '1'
+        line1.expression = 'C∧B'
+        fresh = ProofObj(premises=['A∧B'], conclusion='A',
+            lines=[ProofLineObj('1', 'C∧B', 'Premise'), ProofLineObj('2', 'A', '∧E 1')])
+        self.assertEqual(verify_proof(proof, parser).err_msg, verify_proof(fresh, parser).err_msg)
+
+    def test_lines_in_scope(self):
+        """
+        Test that the scope tree returns the same lines as checking
+        every pair of lines with verify_line_citation
+        """
+        line_nos = ['1', '2', '3.1', '3.2', '3.3.1', '3.3.2', '3.4', '4', '5.1', '5.2.1', '5.2.2', '5.3', '6',
+            '10.1', '10.2', '11']
+        lines = [ProofLineObj(line_no, 'A', 'R 1') for line_no in line_nos]
+        proof = ProofObj(lines=lines)
+        for current_line in lines:
+            expected = [line for line in lines if (line is not current_line) and
+                verify_line_citation(current_line.line_no, line.line_no).is_valid]
+            self.assertEqual(get_citable_lines(current_line, proof), expected)
+
+        self.assertEqual(list(get_index(proof).lines_in_scope('5.2.2')),
+            [lines[0], lines[1], lines[7], lines[8], lines[9], lines[10]])
+        self.assertEqual(list(get_index(proof).lines_in_scope('5-6')), [])
+
+    def test_name_masks(self):
+        """
+        Test that the scope masks agree with scanning the citable lines for a name
+        """
+        lines = [
+            ProofLineObj('1', '∀x∈S(F(x)→G(a))', 'Premise'),
+            ProofLineObj('2.1', 'F(b)', 'Assumption'),
+            ProofLineObj('2.2', 'G(c)∧F(d)', 'R 2.1'),
+            ProofLineObj('3.1', 'F(e)', 'Assumption'),
+            ProofLineObj('3.1', 'H(f)', 'R 3.1'),
+            ProofLineObj('3.2', 'F(g)', 'R 3.1'),
+            ProofLineObj('4', 'G(h)', 'R 1'),
+        ]
+        proof = ProofObj(lines=lines)
+        index = get_index(proof)
+        for current_line in lines:
+            for name in 'abcdefghxyz':
+                expected = any(name in line.expression for line in get_citable_lines(current_line, proof))
+                self.assertEqual(index.may_appear_in_scope(name, current_line), expected)
+        self.assertTrue(index.may_appear_in_scope('F', lines[0]))
+
+
+class VerificationCacheTests(TestCase):
+
+    def setUp(self):
+        verification_cache.clear()
+
+    def make_proof(self, expression_3):
+        lines = [
+            ProofLineObj('1', 'A∧B', 'Premise'),
+            ProofLineObj('2', 'A', '∧E 1'),
+            ProofLineObj('3', expression_3, '∧E 1'),
+            ProofLineObj('4', 'B∧A', '∧I 3, 2'),
+        ]
+        return ProofObj(premises='A∧B', conclusion='B∧A', lines=lines)
+
+    def test_unchanged_lines_are_not_verified_again(self):
+        """
+        Test that only edited lines and the lines citing them
+        are verified again under the same cache key
+        """
+        parser = tflparser.parser
+        result = verify_proof(self.make_proof('B'), parser, cache_key='proof-1')
+        self.assertTrue(result.is_valid)
+        self.assertEqual(verification_cache.stats()['misses'], 4)
+
+        result = verify_proof(self.make_proof('B'), parser, cache_key='proof-1')
+        self.assertTrue(result.is_valid)
+        self.assertEqual(verification_cache.stats()['hits'], 4)
+
+        # Editing line 3 invalidates lines 3 and 4 only
+        proof = self.make_proof('C')
+        result = verify_proof(proof, parser, full_report=True, cache_key='proof-1')
+        stats = verification_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (6, 6))
+        expected = verify_proof(self.make_proof('C'), parser, full_report=True)
+        self.assertEqual(result.err_msg, expected.err_msg)
+        self.assertEqual([(r.is_valid, r.err_msg, r.depends_on) for r in result.line_responses],
+            [(r.is_valid, r.err_msg, r.depends_on) for r in expected.line_responses])
+
+        # Other keys do not share results
+        verify_proof(self.make_proof('B'), parser, cache_key='proof-2')
+        self.assertEqual(verification_cache.stats()['misses'], 10)
+
+    def test_premises_are_part_of_the_fingerprint(self):
+        """
+        Test that changing the premises invalidates Premise lines
+        """
+        parser = tflparser.parser
+        verify_proof(self.make_proof('B'), parser, cache_key='proof-1')
+        proof = self.make_proof('B')
+        proof.premises = 'A∧C'
+        result = verify_proof(proof, parser, cache_key='proof-1')
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, "Error on line 1: Expression on line 1 is not a premise")
+
+
+class RuleCacheTests(TestCase):
+
+    def setUp(self):
+        rule_cache.clear()
+
+    def test_rule_applications_are_shared(self):
+        """
+        Test that the same rule application in another proof
+        (with a different spelling of the same expressions) is a cache hit
+        """
+        parser = tflparser.parser
+        line1 = ProofLineObj('1', 'A∧B', 'Premise')
+        line2 = ProofLineObj('2', 'B', '∧E 1')
+        proof = ProofObj(premises='A∧B', lines=[line1, line2])
+        self.assertTrue(verify_rule(line2, proof, parser).is_valid)
+        self.assertEqual(rule_cache.stats()['misses'], 1)
+
+        line1 = ProofLineObj('1', '(A & B)', 'Premise')
+        line2 = ProofLineObj('2', 'B', '∧E 1')
+        proof = ProofObj(premises='A∧B', lines=[line1, line2])
+        self.assertTrue(verify_rule(line2, proof, parser).is_valid)
+        self.assertEqual(rule_cache.stats()['hits'], 1)
+
+        # A different cited expression is a miss
+        line1 = ProofLineObj('1', 'A∨B', 'Premise')
+        proof = ProofObj(premises='A∨B', lines=[line1, line2])
+        result = verify_rule(line2, proof, parser)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(rule_cache.stats()['misses'], 2)
+
+        # Cached errors are returned as new responses
+        result.err_msg = None
+        self.assertIsNotNone(verify_rule(line2, proof, parser).err_msg)
+        self.assertEqual(rule_cache.stats()['hits'], 2)
+
+    def test_line_numbers_are_part_of_the_key(self):
+        """
+        Test that error messages mention the line numbers of the proof being checked
+        """
+        parser = tflparser.parser
+        line1 = ProofLineObj('1', 'A∧B', 'Premise')
+        line2 = ProofLineObj('2', 'C', '∧E 1')
+        proof = ProofObj(premises='A∧B', lines=[line1, line2])
+        self.assertEqual(verify_rule(line2, proof, parser).err_msg, "Error on line 2: Line 2 does not follow from line 1")
+
+        line3 = ProofLineObj('3', 'C', '∧E 1')
+        proof = ProofObj(premises='A∧B', lines=[line1, line3])
+        self.assertEqual(verify_rule(line3, proof, parser).err_msg, "Error on line 3: Line 3 does not follow from line 1")
+        self.assertEqual(rule_cache.stats()['hits'], 0)
+
+    def test_scope_rules_are_not_cached(self):
+        """
+        Test that ∀I, which checks lines it does not cite, is not cached
+        """
+        parser = folparser.parser
+        line1 = ProofLineObj('1', 'F(a)', 'Premise')
+        line2 = ProofLineObj('2', '∀x∈S F(x)', '∀I 1')
+        proof = ProofObj(premises='F(a)', lines=[line1, line2], rules='fol_basic')
+        verify_rule(line2, proof, parser)
+        self.assertEqual(rule_cache.stats()['misses'], 0)
+        self.assertEqual(rule_cache.stats()['size'], 0)
+
+
+class ProofDigestTests(TestCase):
+    def make_proof(self, rule='∧E 1', rules='tfl_basic'):
+        return ProofObj(rules=rules, premises=['A∧B'], conclusion='A', lines=[
+            ProofLineObj('1', 'A∧B', 'Premise'),
+            ProofLineObj('2', 'A', rule),
+        ])
+
+    def test_digest(self):
+        self.assertEqual(proof_digest(self.make_proof()), proof_digest(self.make_proof()))
+        self.assertNotEqual(proof_digest(self.make_proof()), proof_digest(self.make_proof(rule='∧E 2')))
+        self.assertNotEqual(proof_digest(self.make_proof()), proof_digest(self.make_proof(rules='tfl_derived')))
+
+    def test_string_premise(self):
+        proof = self.make_proof()
+        proof.premises = 'A∧B'
+        self.assertEqual(proof_digest(proof), proof_digest(self.make_proof()))
+
+    def test_line_order(self):
+        proof = self.make_proof()
+        reordered = self.make_proof()
+        reordered.lines.reverse()
+        self.assertNotEqual(proof_digest(proof), proof_digest(reordered))
+
+
+class VerifyProofsTests(TestCase):
+    def make_proofs(self, count):
+        """
+        Returns count proofs of B∧A from A∧B, every third one invalid
+        """
+        proofs = []
+        for i in range(count):
+            conclusion = 'B∧A' if i % 3 else 'A∨B'
+            proofs.append(ProofObj(premises=['A∧B'], conclusion='B∧A', lines=[
+                ProofLineObj('1', 'A∧B', 'Premise'),
+                ProofLineObj('2', 'B', '∧E 1'),
+                ProofLineObj('3', 'A', '∧E 1'),
+                ProofLineObj('4', conclusion, '∧I 2, 3'),
+            ]))
+        return proofs
+
+    def expected(self, proofs):
+        return [verify_proof(proof, tflparser.parser).err_msg for proof in proofs]
+
+    def test_input_order(self):
+        proofs = self.make_proofs(20)
+        results = list(verify_proofs(proofs, workers=2, chunksize=3))
+        self.assertEqual([index for index, response in results], list(range(20)))
+        self.assertEqual([response.err_msg for index, response in results], self.expected(proofs))
+
+    def test_completion_order(self):
+        proofs = self.make_proofs(20)
+        results = dict(verify_proofs(proofs, workers=2, ordered=False, chunksize=3))
+        self.assertEqual([results[index].err_msg for index in range(20)], self.expected(proofs))
+
+    def test_shared_executor(self):
+        # Batches verified by one pool, which stays open between them
+        with proof_pool(2) as executor:
+            for count in (20, 10):
+                proofs = self.make_proofs(count)
+                results = list(verify_proofs(proofs, workers=2, chunksize=3, executor=executor))
+                self.assertEqual([response.err_msg for index, response in results], self.expected(proofs))
+            pids = set(executor.submit(os.getpid).result() for _ in range(4))
+            self.assertLessEqual(len(pids), 2)
+
+    def test_string_premise(self):
+        # A single premise given as a string, as verify_proof accepts it
+        proofs = [ProofObj(premises='A∧B', conclusion='A', lines=[
+            ProofLineObj('1', 'A∧B', 'Premise'),
+            ProofLineObj('2', 'A', '∧E 1'),
+        ]) for _ in range(10)]
+        expected = verify_proof(proofs[0], tflparser.parser)
+        self.assertTrue(expected.is_valid)
+        self.assertIsNone(expected.err_msg)
+        for workers in (1, 2):
+            for index, response in verify_proofs(proofs, workers=workers):
+                self.assertTrue(response.is_valid)
+                self.assertIsNone(response.err_msg)
+
+    def test_ruleset(self):
+        proof = ProofObj(premises=['∀x∈S F(x)'], conclusion='F(a)', lines=[
+            ProofLineObj('1', '∀x∈S F(x)', 'Premise'),
+            ProofLineObj('2', 'F(a)', '∀E 1'),
+        ])
+        (index, response), = verify_proofs([proof], 'fol_basic')
+        self.assertTrue(response.is_valid)
+        self.assertIsNone(response.err_msg)
+        # The proof itself is unchanged
+        self.assertEqual(proof.rules, 'tfl_basic')
 
@@ -1,6 +1,6 @@
 from django.test import TestCase
 from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj
-from proofchecker.proofs.proofutils import make_tree
+from proofchecker.proofs.proofutils import find_c, make_tree
 from proofchecker.rules.conversionofquantifiers import ConversionOfQuantifiers
 from proofchecker.rules.equalityelim import EqualityElim, check_subs
 from proofchecker.rules.equalityintro import EqualityIntro
@@ -9,6 +9,7 @@ from proofchecker.rules.existentialintro import ExistentialIntro
 from proofchecker.rules.universalelim import UniversalElim
 from proofchecker.rules.universalintro import UniversalIntro
 from proofchecker.utils import folparser
+from proofchecker.utils.folterms import Atom, aligned_terms, debruijn, free_vars, parse_atom
 
 
 class FOLRulesTests(TestCase):
@@ -688,4 +689,61 @@ class FOLRulesTests(TestCase):
         proof = ProofObj(lines=[line1, line2])
         result = rule.verify(line2, proof, parser)
         self.assertFalse(result.is_valid)
-        self.assertEqual(result.err_msg, 'Error on line 2: The quantifiers on lines 1 and 2 do not refer to the same domain')
\ No newline at end of file
+        self.assertEqual(result.err_msg, 'Error on line 2: The quantifiers on lines 1 and 2 do not refer to the same domain')
+
+
+class FOLTermTests(TestCase):
+
+    def test_parse_atom(self):
+        self.assertEqual(parse_atom('F(a, x)'), Atom('F', ('a', 'x')))
+        self.assertEqual(parse_atom('Fax'), Atom('F', ('a', 'x')))
+        self.assertEqual(parse_atom('a'), Atom(None, ('a',)))
+        self.assertEqual(parse_atom('⊥'), Atom('⊥', ()))
+
+    def test_debruijn(self):
+        parser = folparser.parser
+        tree_1 = make_tree('∀x∈S (F(x)→∃y∈T G(x, y, a))', parser)
+        tree_2 = make_tree('∀z∈S (F(z)→∃w∈T G(z, w, a))', parser)
+        tree_3 = make_tree('∀x∈S (F(x)→∃y∈T G(y, x, a))', parser)
+        self.assertIs(debruijn(tree_1), debruijn(tree_2))
+        self.assertIsNot(debruijn(tree_1), debruijn(tree_3))
+        self.assertEqual(debruijn(tree_1).right.right.right.value, Atom('G', (1, 0, 'a')))
+        self.assertEqual(free_vars(tree_1), frozenset())
+        self.assertEqual(free_vars(tree_1.right), frozenset(['x']))
+        self.assertEqual(list(aligned_terms(tree_1.right, make_tree('F(b)→∃y∈T G(b, y, a)', parser))),
+            [('x', 'b'), ('x', 'b'), (0, 0), ('a', 'a')])
+
+    def test_substitutions(self):
+        parser = folparser.parser
+
+        # Every instance of the variable must replace the same name, across the whole line
+        line1 = ProofLineObj('1', 'F(a)∧G(b)', 'Premise')
+        line2 = ProofLineObj('2', '∃x∈S (F(x)∧G(x))', '∃I 1')
+        proof = ProofObj(lines=[line1, line2])
+        result = ExistentialIntro().verify(line2, proof, parser)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, 'Error on line 2: All instances of variable "x" on line 2 should replace the same name on line 1')
+
+        # A variable bound by an inner quantifier is not an instance
+        line1 = ProofLineObj('1', '∀x∈S (F(x)∧∃x∈S G(x))', 'Premise')
+        line2 = ProofLineObj('2', 'F(a)∧∃x∈S G(x)', '∀E 1')
+        proof = ProofObj(lines=[line1, line2])
+        result = UniversalElim().verify(line2, proof, parser)
+        self.assertTrue(result.is_valid)
+        self.assertEqual(find_c(make_tree('F(x)∧∃x∈S G(x)', parser), make_tree('F(a)∧∃x∈S G(x)', parser), 'x'), 'a')
+
+        # =E does not replace bound variables
+        current_tree = make_tree('∀x∈S F(x, b)', parser)
+        line_n_tree = make_tree('∀y∈S F(y, a)', parser)
+        current_line = ProofLineObj('3', '∀x∈S F(x, b)', '=E 1, 2')
+        line_n = ProofLineObj('2', '∀y∈S F(y, a)', 'Premise')
+        result = check_subs(current_tree, line_n_tree, 'a', 'b', current_line, line_n)
+        self.assertTrue(result.is_valid)
+
+        current_tree = make_tree('∀x∈S F(x, x)', parser)
+        line_n_tree = make_tree('∀x∈S F(x, a)', parser)
+        current_line = ProofLineObj('3', '∀x∈S F(x, x)', '=E 1, 2')
+        line_n = ProofLineObj('2', '∀x∈S F(x, a)', 'Premise')
+        result = check_subs(current_tree, line_n_tree, 'a', 'x', current_line, line_n)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, 'Error on line 3: Expression "∀x∈S F(x, x)" cannot be achieved by replacing "a" with "x" (or vice versa) in the expression "∀x∈S F(x, a)"')
@@ -22,7 +22,9 @@ from proofchecker.rules.negationintro import NegationIntro
 from proofchecker.rules.premise import Premise
 from proofchecker.rules.reiteration import Reiteration
 
-from proofchecker.rules.rulechecker import RuleChecker
+from proofchecker.rules.rulechecker import RULESET_TIERS, RuleChecker, RuleRegistry
+from proofchecker.rules.rule import Rule
+from proofchecker.rules.schema import Schema, SchemaRule, match, parse_pattern, spine
 from proofchecker.utils import tflparser
 
 
@@ -42,6 +44,38 @@ class RuleCheckerTests(TestCase):
         self.assertTrue(isinstance(checker.get_rule(str4, proof), BiconditionalIntro))
         self.assertTrue(isinstance(checker.get_rule(str5, proof), BiconditionalElim))
 
+    def test_get_rule_by_ruleset(self):
+        checker = RuleChecker()
+        self.assertTrue(isinstance(checker.get_rule('dem', ProofObj(rules='tfl_derived')), DeMorgan))
+        self.assertIsNone(checker.get_rule('DeM', ProofObj(rules='tfl_basic')))
+        self.assertIsNone(checker.get_rule('DeM', ProofObj(rules='fol_basic')))
+        self.assertTrue(isinstance(checker.get_rule('DeM', ProofObj(rules='fol_derived')), DeMorgan))
+        self.assertTrue(isinstance(checker.get_rule('∧I', ProofObj(rules='unknown')), ConjunctionIntro))
+        self.assertIsNone(checker.get_rule('∧X', ProofObj(rules='tfl_basic')))
+
+    def test_register_rules(self):
+
+        class Commutativity(Rule):
+            name = "Commutativity"
+            symbols = "Comm"
+
+            def verify(self, current_line, proof, parser):
+                pass
+
+        class StrictReiteration(Reiteration):
+            pass
+
+        registry = RuleRegistry(RULESET_TIERS)
+        registry.register_ruleset('tfl_course', [Commutativity()], base='tfl_derived')
+        self.assertTrue(isinstance(registry.get_rule('tfl_course', 'COMM'), Commutativity))
+        self.assertTrue(isinstance(registry.get_rule('tfl_course', 'DS'), DisjunctiveSyllogism))
+        self.assertIsNone(registry.get_rule('tfl_derived', 'Comm'))
+
+        registry.register_rule(StrictReiteration(), ['tfl_derived'])
+        self.assertTrue(isinstance(registry.get_rule('tfl_derived', 'R'), StrictReiteration))
+        self.assertFalse(isinstance(registry.get_rule('tfl_course', 'R'), StrictReiteration))
+        self.assertRaises(KeyError, registry.register_rule, StrictReiteration(), ['missing'])
+
 
 class BasicRuleTests(TestCase):
 
@@ -640,6 +674,69 @@ class BasicRuleTests(TestCase):
         result = rule.verify(line2, proof, parser)
         self.assertFalse(result.is_valid)
 
+    def test_chain_grouping(self):
+        parser = tflparser.parser
+
+        class ChainConjunctionElim(ConjunctionElim):
+            modulo_association = True
+
+        class ChainDisjunctionIntro(DisjunctionIntro):
+            modulo_association = True
+
+        # By default ∧E and ∨I follow the grouping of the binary tree
+        line1 = ProofLineObj('1', 'A∧B∧C', 'Premise')
+        line2 = ProofLineObj('2', 'B∧C', '∧E 1')
+        proof = ProofObj(lines=[line1, line2])
+        result = ConjunctionElim().verify(line2, proof, parser)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, 'Error on line 2: Line 2 does not follow from line 1')
+
+        # With modulo_association, a chain written without parentheses may be regrouped
+        self.assertTrue(ChainConjunctionElim().verify(line2, proof, parser).is_valid)
+
+        line2 = ProofLineObj('2', 'B', '∧E 1')
+        proof = ProofObj(lines=[line1, line2])
+        self.assertFalse(ChainConjunctionElim().verify(line2, proof, parser).is_valid)
+
+        line1 = ProofLineObj('1', 'B∨C', 'Premise')
+        line2 = ProofLineObj('2', 'A∨B∨C', '∨I 1')
+        proof = ProofObj(lines=[line1, line2])
+        self.assertFalse(DisjunctionIntro().verify(line2, proof, parser).is_valid)
+        self.assertTrue(ChainDisjunctionIntro().verify(line2, proof, parser).is_valid)
+
+    def test_chain_parentheses(self):
+        parser = tflparser.parser
+
+        # The grouping written by the student is kept, even with modulo_association
+        class ChainConjunctionElim(ConjunctionElim):
+            modulo_association = True
+
+        class ChainDisjunctionIntro(DisjunctionIntro):
+            modulo_association = True
+
+        # so cached results of these rules are keyed by the text
+        self.assertTrue(ChainConjunctionElim().quotes_expressions)
+        self.assertFalse(ConjunctionElim().quotes_expressions)
+
+        # Brackets group like parentheses
+        for expression in ('(A∧B)∧C', '[A∧B]∧C', '{A∧B}∧C'):
+            line1 = ProofLineObj('1', expression, 'Premise')
+            line2 = ProofLineObj('2', 'B∧C', '∧E 1')
+            proof = ProofObj(lines=[line1, line2])
+            for rule in (ConjunctionElim(), ChainConjunctionElim()):
+                result = rule.verify(line2, proof, parser)
+                self.assertFalse(result.is_valid)
+                self.assertEqual(result.err_msg, 'Error on line 2: Line 2 does not follow from line 1')
+
+        for expression in ('(C∨A)∨B', '[C∨A]∨B', '{C∨A}∨B'):
+            line1 = ProofLineObj('1', 'A∨B', 'Premise')
+            line2 = ProofLineObj('2', expression, '∨I 1')
+            proof = ProofObj(lines=[line1, line2])
+            for rule in (DisjunctionIntro(), ChainDisjunctionIntro()):
+                result = rule.verify(line2, proof, parser)
+                self.assertFalse(result.is_valid)
+                self.assertEqual(result.err_msg, 'Error on line 2: Line 2 does not follow from line 1')
+
 
 class DerivedRuleTests(TestCase):
 
@@ -1037,4 +1134,182 @@ class DerivedRuleTests(TestCase):
         proof = ProofObj(lines=[line1, line2])
         result = rule.verify(line2, proof, parser)
         self.assertFalse(result.is_valid)
-        self.assertEquals(result.err_msg, 'Error on line 2: The atomic sentences on line 1 should be negations of the atomic sentences on line 2.')
\ No newline at end of file
+        self.assertEquals(result.err_msg, 'Error on line 2: The atomic sentences on line 1 should be negations of the atomic sentences on line 2.')
+
+
+class SchemaTests(TestCase):
+
+    def test_match(self):
+        pattern = parse_pattern('A→(B∨A)')
+        tree = parse_pattern('(C∧D)→(E∨(C∧D))')
+        bindings = match(pattern, tree, {})
+        self.assertEqual(str(bindings['A']), 'C∧D')
+        self.assertEqual(str(bindings['B']), 'E')
+        self.assertIsNone(match(pattern, parse_pattern('(C∧D)→(E∨C)'), {}))
+        self.assertIsNone(match(pattern, parse_pattern('C∧(E∨C)'), {}))
+        self.assertIsNone(match(parse_pattern('¬A'), parse_pattern('¬B'), {'A': parse_pattern('C')}))
+        self.assertEqual(spine(parse_pattern('¬(A∧B)')), ('¬', '∧'))
+        self.assertEqual(spine(parse_pattern('¬A∨¬B')), ('∨',))
+        self.assertEqual(spine(parse_pattern('A')), ())
+
+    def test_schema_rule(self):
+
+        class Contraposition(SchemaRule):
+            name = "Contraposition"
+            symbols = "Con"
+            usage = "Contraposition: Con m"
+            schemas = [
+                Schema('m: A→B ⊢ ¬B→¬A'),
+                Schema('m: ¬A∨B ⊢ A→B'),
+            ]
+
+        rule = Contraposition()
+        parser = tflparser.parser
+        self.assertEqual(rule.select(parse_pattern('C→D')), [rule.schemas[0]])
+        self.assertEqual(rule.select(parse_pattern('¬C∨D')), [rule.schemas[1]])
+        self.assertIsNone(rule.select(parse_pattern('C∧D')))
+
+        line1 = ProofLineObj('1', 'C→(D∧E)', 'Premise')
+        line2 = ProofLineObj('2', '¬(D∧E)→¬C', 'Con 1')
+        proof = ProofObj(lines=[line1, line2])
+        result = rule.verify(line2, proof, parser)
+        self.assertTrue(result.is_valid)
+
+        line2 = ProofLineObj('2', '¬C∧¬D', 'Con 1')
+        proof = ProofObj(lines=[line1, line2])
+        result = rule.verify(line2, proof, parser)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, 'Error on line 2: The root of line 2 should be an implication (→) when applying contraposition')
+
+        line2 = ProofLineObj('2', '¬D→¬C', 'Con 1')
+        proof = ProofObj(lines=[line1, line2])
+        result = rule.verify(line2, proof, parser)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, 'Error on line 2: Line 2 does not match ¬B→¬A in Con m: A→B ⊢ ¬B→¬A')
+
+        line1 = ProofLineObj('1', 'C∧D', 'Premise')
+        line2 = ProofLineObj('2', 'C→D', 'Con 1')
+        proof = ProofObj(lines=[line1, line2])
+        result = rule.verify(line2, proof, parser)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, 'Error on line 2: Line 1 does not match any form of this rule')
+
+        line2 = ProofLineObj('2', 'C→D', 'Con 3')
+        proof = ProofObj(lines=[line1, line2])
+        result = rule.verify(line2, proof, parser)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, 'Error on line 2: Invalid citation: Line 3 occurs after line 2')
+
+        line3 = ProofLineObj('3', 'C→D', 'Con 2')
+        proof = ProofObj(lines=[line1, line3])
+        result = rule.verify(line3, proof, parser)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, 'Error on line 3: Line numbers are not specified correctly.  Contraposition: Con m')
+
+    def test_schema_distinct(self):
+        rule = ModusTollens()
+        parser = tflparser.parser
+        line1 = ProofLineObj('1', 'A→A', 'Premise')
+        line2 = ProofLineObj('2', '¬A', 'Premise')
+        line3 = ProofLineObj('3', '¬A', 'MT 1, 2')
+        proof = ProofObj(lines=[line1, line2, line3])
+        result = rule.verify(line3, proof, parser)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, 'Error on line 3: Line 2 and line 3 should not be equivalent')
+
+    def test_schema_alternatives(self):
+        # The error comes from the form the lines came closest to
+        parser = tflparser.parser
+        rule = DisjunctiveSyllogism()
+        line1 = ProofLineObj('1', 'A∨B', 'Premise')
+        line2 = ProofLineObj('2', '¬B', 'Premise')
+        for expression, err_msg in (
+            ('A', None),
+            ('C', 'Error on line 3: Line 3 should be equivalent to either the left or right half of line 1'),
+            ('B', 'Error on line 3: Line 2 and line 3 should not represent the same half of the disjunction on line 1')):
+            line3 = ProofLineObj('3', expression, 'DS 1, 2')
+            proof = ProofObj(lines=[line1, line2, line3])
+            result = rule.verify(line3, proof, parser)
+            self.assertEqual(result.is_valid, err_msg is None)
+            self.assertEqual(result.err_msg, err_msg)
+
+        # Either operand of ∨I may be the cited line, but the root must be ∨
+        rule = DisjunctionIntro()
+        line1 = ProofLineObj('1', 'A', 'Premise')
+        for expression, is_valid in (('A∨B', True), ('B∨A', True), ('A∧B', False), ('B→A', False)):
+            line2 = ProofLineObj('2', expression, '∨I 1')
+            proof = ProofObj(lines=[line1, line2])
+            self.assertEqual(rule.verify(line2, proof, parser).is_valid, is_valid)
+
+    def test_schema_sides(self):
+        parser = tflparser.parser
+        rule = BiconditionalIntro()
+        line1 = ProofLineObj('1.1', 'A', 'Assumption')
+        line2 = ProofLineObj('1.2', 'B', 'R 1.1')
+        line3 = ProofLineObj('2.1', 'B', 'Assumption')
+        line4 = ProofLineObj('2.2', 'A', 'R 2.1')
+        for expression, err_msg in (
+            ('B↔A', None),
+            ('C↔A', 'Error on line 3: Left side of line 3 does not equal either of the expressions on lines 1.2 and 2.2'),
+            ('B↔C', 'Error on line 3: Right side of line 3 does not equal either of the expressions on lines 1.2 and 2.2'),
+            ('A↔A', 'Error on line 3: Left side and right side of line 3 are equivalent, but lines 1.1 and 1.2 are not equivalent')):
+            line5 = ProofLineObj('3', expression, '↔I 1, 2')
+            proof = ProofObj(lines=[line1, line2, line3, line4, line5])
+            result = rule.verify(line5, proof, parser)
+            self.assertEqual(result.err_msg, err_msg)
+
+    def test_schema_subproof(self):
+        parser = tflparser.parser
+        rule = ConditionalIntro()
+        line1 = ProofLineObj('1.1', 'A', 'Assumption')
+        line2 = ProofLineObj('1.2', 'B', 'R 1.1')
+        for expression, rule_text, err_msg in (
+            ('A→B', '→I 1', None),
+            ('A∧B', '→I 1', 'Error on line 2: The expressions on lines 1.1 and 1.2 do not match the implication on line 2'),
+            ('A→B', '→I 3', 'Error on line 2: Invalid citation: Line 3 occurs after line 2'),
+            ('A→B', '→I 0', 'Error on line 2: Line numbers are not specified correctly.  Conditional Introduction: →I m'),
+            ('A→B', '→I 1, 1', 'Error on line 2: Rule not formatted properly.  Conditional Introduction: →I m')):
+            line3 = ProofLineObj('2', expression, rule_text)
+            proof = ProofObj(lines=[line1, line2, line3])
+            self.assertEqual(rule.verify(line3, proof, parser).err_msg, err_msg)
+
+    def test_schema_nested_line_as_subproof(self):
+        # A line inside a subproof cited as a subproof gets the citation error
+        parser = tflparser.parser
+        line1 = ProofLineObj('1', 'A', 'Premise')
+        line2 = ProofLineObj('2.1', '¬A', 'Assumption')
+        line3 = ProofLineObj('2.2', '⊥', '¬E 2.1, 1')
+        err_msg = 'Error on line 3: Invalid citation: Line 2.2 exists within in a subproof at a lower depth than line 3'
+        for rule, expression in ((ConditionalIntro(), '¬A→⊥'), (NegationIntro(), '¬¬A'), (IndirectProof(), 'A')):
+            line4 = ProofLineObj('3', expression, '{} 2.2'.format(rule.symbols))
+            proof = ProofObj(lines=[line1, line2, line3, line4])
+            result = rule.verify(line4, proof, parser)
+            self.assertFalse(result.is_valid)
+            self.assertEqual(result.err_msg, err_msg)
+
+    def test_schema_extra_line_numbers(self):
+        # Citing more lines than the rule takes is not accepted
+        parser = tflparser.parser
+        line1 = ProofLineObj('1', 'A∧B', 'Premise')
+        line2 = ProofLineObj('2', '⊥', 'Premise')
+        line3 = ProofLineObj('3', '¬(A∧B)', 'Premise')
+        for rule, expression, rule_text in (
+            (ConjunctionElim(), 'A', '∧E 1, 5, 7'),
+            (ConjunctionElim(), 'A', '∧E 1, 1'),
+            (DisjunctionIntro(), 'A∧B∨C', '∨I 1, 9'),
+            (Explosion(), 'C', 'X 2, 1'),
+            (DeMorgan(), '¬A∨¬B', 'DeM 3, 1'),
+            (Reiteration(), 'A∧B', 'R 1, 1')):
+            line4 = ProofLineObj('4', expression, rule_text)
+            proof = ProofObj(lines=[line1, line2, line3, line4])
+            self.assertTrue(rule.verify(ProofLineObj('4', expression, rule_text.split(',')[0]), proof, parser).is_valid)
+            result = rule.verify(line4, proof, parser)
+            self.assertFalse(result.is_valid)
+            self.assertEqual(result.err_msg, 'Error on line 4: Rule not formatted properly.  {}'.format(rule.usage))
+
+    def test_tfl_rules_are_schemas(self):
+        # Every TFL rule but Premise and Assumption is checked by the schema engine
+        for tiers in (RULESET_TIERS['tfl_basic'], RULESET_TIERS['tfl_derived']):
+            for tier in tiers:
+                for rule in tier:
+                    self.assertEqual(isinstance(rule, SchemaRule), not isinstance(rule, (Premise, Assumption)), rule.name)
@@ -0,0 +1,286 @@
+from django.test import TestCase
+
+from proofchecker.proofs.proofchecker import verify_proof, verify_rule
+from proofchecker.proofs.proofobjects import ProofObj, ProofLineObj
+from proofchecker.proofs.proofutils import make_tree
+from proofchecker.semantics import entailment, finitemodels, sat
+from proofchecker.semantics.argument import check_argument
+from proofchecker.semantics.truthtable import MAX_ATOMS, TooManyAtomsError, TruthTable, atoms, entails, \
+    equivalent, find_countermodel, format_assignment
+from proofchecker.utils import folparser, tflparser
+from proofchecker.utils.binarytree import InternedNode, Node
+
+
+def tree(expression):
+    return make_tree(expression, tflparser.parser)
+
+
+class TruthTableTests(TestCase):
+
+    def test_atoms(self):
+        """
+        Test that atoms lists the sentence letters of one or more trees
+        """
+        self.assertEqual(atoms(tree('(B∧A)→¬C')), ['A', 'B', 'C'])
+        self.assertEqual(atoms(tree('A∨⊥'), tree('D')), ['A', 'D'])
+
+    def test_columns(self):
+        """
+        Test that each row of a column agrees with evaluating the formula on that row
+        """
+        table = TruthTable(['A', 'B', 'C'])
+        column = table.evaluate(tree('(A→B)↔¬(C∨A)'))
+        for k in range(table.size):
+            row = table.row(k)
+            expected = ((not row['A']) or row['B']) == (not (row['C'] or row['A']))
+            self.assertEqual(bool((column >> k) & 1), expected)
+
+        # Plain Nodes are evaluated as well
+        node = Node('∧')
+        node.left = Node('A')
+        node.right = Node('True')
+        self.assertEqual(table.evaluate(node), table.evaluate(tree('A')))
+
+    def test_entails(self):
+        """
+        Test entailment, countermodels and equivalence
+        """
+        self.assertTrue(entails([tree('A→B'), tree('A')], tree('B')))
+        self.assertTrue(entails([], tree('A∨¬A')))
+        self.assertTrue(entails([tree('⊥')], tree('Q')))
+        self.assertFalse(entails([tree('A→B'), tree('B')], tree('A')))
+
+        countermodel = find_countermodel([tree('A∨B')], tree('A'))
+        self.assertEqual(countermodel, {'A': False, 'B': True})
+        self.assertEqual(format_assignment(countermodel), 'A=F, B=T')
+
+        self.assertTrue(equivalent(tree('¬(A∧B)'), tree('¬A∨¬B')))
+        self.assertFalse(equivalent(tree('A→B'), tree('B→A')))
+
+    def test_many_atoms(self):
+        """
+        Test a chain of MAX_ATOMS sentence letters, and the limit itself
+        """
+        letters = [chr(ord('A') + i) for i in range(MAX_ATOMS)]
+        premises = [tree('{}→{}'.format(letters[i], letters[i+1])) for i in range(MAX_ATOMS-1)]
+        self.assertTrue(entails(premises + [tree('A')], tree(letters[-1])))
+        self.assertFalse(entails(premises, tree(letters[-1])))
+
+        with self.assertRaises(TooManyAtomsError):
+            TruthTable([chr(ord('A') + i) for i in range(MAX_ATOMS+1)])
+
+    def test_check_argument(self):
+        """
+        Test the check run when authoring a problem
+        """
+        self.assertTrue(check_argument('tfl_basic', 'A→B;A', 'B').is_valid)
+        response = check_argument('tfl_derived', 'A∨B', 'A')
+        self.assertFalse(response.is_valid)
+        self.assertEqual(response.err_msg, 'The premises do not entail the conclusion (countermodel: A=F, B=T)')
+
+        # Arguments that cannot be checked are not rejected
+        self.assertTrue(check_argument('tfl_basic', 'A∧', 'B').is_valid)
+        self.assertTrue(check_argument('fol_basic', 'F(a', 'G(a)').is_valid)
+
+        # FOL arguments are searched for small countermodels
+        self.assertTrue(check_argument('fol_basic', '∀x∈S(F(x)→G(x));F(a)', 'G(a)').is_valid)
+        response = check_argument('fol_derived', 'F(a)', 'G(a)')
+        self.assertEqual(response.err_msg, 'The premises do not entail the conclusion (countermodel: domain {0}; a=0; F={0}; G={})')
+
+
+class SemanticCheckTests(TestCase):
+
+    def test_countermodel(self):
+        """
+        Test that a line not entailed by its citations fails with a countermodel
+        """
+        line1 = ProofLineObj('1', 'A∨B', 'Premise')
+        line2 = ProofLineObj('2', 'A', '∧E 1')
+        proof = ProofObj(premises='A∨B', conclusion='A', lines=[line1, line2])
+        parser = tflparser.parser
+        result = verify_proof(proof, parser, semantic_check=True)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.err_msg, "Error on line 2: Line 2 does not follow from the cited lines (countermodel: A=F, B=T)")
+
+        # Without the semantic check the rule reports the error
+        result = verify_proof(proof, parser)
+        self.assertEqual(result.err_msg, "Error on line 1: The root operand should be ∧ when applying ∧E (currently the root operand is ∨)")
+
+        # A step that is entailed but not justified by the rule is left to the rule
+        line2 = ProofLineObj('2', 'A∨B', '∧E 1')
+        proof = ProofObj(premises='A∨B', conclusion='A∨B', lines=[line1, line2])
+        result = verify_proof(proof, parser, semantic_check=True)
+        self.assertEqual(result.err_msg, verify_proof(proof, parser).err_msg)
+
+    def test_valid_proof_with_subproofs(self):
+        """
+        Test that cited subproofs and open assumptions are taken into account
+        """
+        lines = [
+            ProofLineObj('1', 'A→B', 'Premise'),
+            ProofLineObj('2', 'B→C', 'Premise'),
+            ProofLineObj('3.1', 'A', 'Assumption'),
+            ProofLineObj('3.2', 'B', '→E 1, 3.1'),
+            ProofLineObj('3.3', 'C', '→E 2, 3.2'),
+            ProofLineObj('4', 'A→C', '→I 3'),
+        ]
+        proof = ProofObj(premises=['A→B', 'B→C'], conclusion='A→C', lines=lines, rules='tfl_basic')
+        parser = tflparser.parser
+        result = verify_proof(proof, parser, full_report=True, semantic_check=True)
+        self.assertTrue(result.is_valid)
+        self.assertIsNone(result.err_msg)
+
+        # The truth table is built once per proof
+        table = proof.compiled.truth_table
+        self.assertEqual(table.letters, ['A', 'B', 'C'])
+
+    def test_fol_is_not_checked(self):
+        """
+        Test that the semantic check only applies to TFL rulesets
+        """
+        line1 = ProofLineObj('1', 'F(a)∨G(a)', 'Premise')
+        line2 = ProofLineObj('2', 'F(a)', '∧E 1')
+        proof = ProofObj(premises='F(a)∨G(a)', lines=[line1, line2], rules='fol_basic')
+        parser = folparser.parser
+        result = verify_rule(line2, proof, parser, semantic_check=True)
+        self.assertEqual(result.err_msg, verify_rule(line2, proof, parser).err_msg)
+
+
+def pigeonhole(n: int):
+    """
+    Clauses placing n+1 pigeons in n holes (unsatisfiable)
+    """
+    var = lambda i, j: i*n + j + 1
+    clauses = [[var(i, j) for j in range(n)] for i in range(n+1)]
+    for j in range(n):
+        for i in range(n+1):
+            for k in range(i+1, n+1):
+                clauses.append([-var(i, j), -var(k, j)])
+    return (n+1)*n, clauses
+
+
+class SatTests(TestCase):
+
+    def test_agrees_with_truth_tables(self):
+        """
+        Test the SAT backend against truth tables on random formulas
+        """
+        import random
+        generator = random.Random(16)
+
+        def random_tree(depth, letters):
+            if (depth == 0) or (generator.random() < 0.2):
+                return InternedNode(generator.choice(letters + ['⊥']))
+            value = generator.choice('¬∧∨→↔')
+            if value == '¬':
+                return InternedNode(value, None, random_tree(depth-1, letters))
+            return InternedNode(value, random_tree(depth-1, letters), random_tree(depth-1, letters))
+
+        for _ in range(300):
+            letters = [chr(ord('A') + i) for i in range(generator.randint(1, 6))]
+            premises = [random_tree(3, letters) for _ in range(generator.randint(0, 3))]
+            conclusion = random_tree(3, letters)
+            countermodel = sat.find_countermodel(premises, conclusion)
+            self.assertEqual(countermodel is None, entails(premises, conclusion))
+            if countermodel is not None:
+                table = TruthTable(sorted(countermodel))
+                k = sum(1 << i for i, letter in enumerate(table.letters) if countermodel[letter])
+                for premise in premises:
+                    self.assertTrue((table.evaluate(premise) >> k) & 1)
+                self.assertFalse((table.evaluate(conclusion) >> k) & 1)
+
+    def test_solver(self):
+        """
+        Test unsatisfiable instances, and the conflict budget
+        """
+        for n in range(2, 6):
+            num_vars, clauses = pigeonhole(n)
+            self.assertFalse(sat.Solver(num_vars, clauses, max_conflicts=None, time_limit=None).solve())
+
+        num_vars, clauses = pigeonhole(8)
+        self.assertIsNone(sat.Solver(num_vars, clauses, max_conflicts=10).solve())
+
+        solver = sat.Solver(3, [[1, 2], [-1, 3], [-3]])
+        self.assertTrue(solver.solve())
+        self.assertEqual(solver.model(), {1: False, 2: True, 3: False})
+
+    def test_many_letters(self):
+        """
+        Test entailment over all 26 sentence letters
+        """
+        letters = [chr(ord('A') + i) for i in range(26)]
+        premises = [tree('{}→{}'.format(letters[i], letters[i+1])) for i in range(25)]
+        self.assertTrue(entailment.entails(premises + [tree('A')], tree('Z')))
+        countermodel = entailment.find_countermodel(premises, tree('Z'))
+        self.assertFalse(countermodel['Z'])
+        self.assertTrue(entailment.equivalent(tree('¬(A∧B)∨(' + '∧'.join(letters) + ')'),
+            tree('(A∧B)→(' + '∧'.join(letters) + ')')))
+
+        response = check_argument('tfl_basic', ';'.join(str(premise) for premise in premises[1:]), 'A→Z')
+        self.assertFalse(response.is_valid)
+        self.assertTrue(response.err_msg.startswith('The premises do not entail the conclusion (countermodel: A=T, B=F'))
+
+        # Pigeonhole clauses as premises: entailment needs conflicts to prove
+        num_vars, clauses = pigeonhole(3)
+        premises = [tree('∨'.join(('¬' if literal < 0 else '') + letters[abs(literal)-1] for literal in clause))
+            for clause in clauses]
+        self.assertTrue(sat.entails(premises, tree('⊥')))
+        with self.assertRaises(sat.SatBudgetExceeded):
+            sat.find_countermodel(premises, tree('⊥'), max_conflicts=0)
+
+
+def fol_tree(expression):
+    return make_tree(expression, folparser.parser)
+
+
+class FiniteModelTests(TestCase):
+
+    def test_countermodels(self):
+        """
+        Test that invalid FOL arguments have a small countermodel
+        """
+        result = finitemodels.find_countermodel([fol_tree('∃x∈S F(x)')], fol_tree('∀x∈S F(x)'))
+        self.assertEqual(result.status, finitemodels.FOUND)
+        self.assertEqual(str(result), 'Countermodel: domain {0, 1}; F={0}')
+
+        result = finitemodels.find_countermodel([fol_tree('∀x∈S ∃y∈S L(x,y)')], fol_tree('∃y∈S ∀x∈S L(x,y)'))
+        self.assertEqual(result.status, finitemodels.FOUND)
+        self.assertEqual(result.model.size, 2)
+
+        result = finitemodels.find_countermodel([fol_tree('F(a)')], fol_tree('F(b)'))
+        self.assertEqual(str(result.model), 'domain {0, 1}; a=0; b=1; F={0}')
+
+    def test_valid_arguments(self):
+        """
+        Test that valid FOL arguments have no countermodel up to N
+        """
+        arguments = [
+            (['∀x∈S F(x)'], '∃x∈S F(x)'),
+            (['∀x∈S(F(x)→G(x))', 'F(a)'], 'G(a)'),
+            (['∃y∈S ∀x∈S L(x,y)'], '∀x∈S ∃y∈S L(x,y)'),
+            (['a=b', 'F(a)'], 'F(b)'),
+            (['¬∃x∈S F(x)'], '∀x∈S ¬F(x)'),
+        ]
+        for premises, conclusion in arguments:
+            result = finitemodels.find_countermodel([fol_tree(premise) for premise in premises], fol_tree(conclusion))
+            self.assertEqual(result.status, finitemodels.NOT_FOUND)
+            self.assertEqual(str(result), 'No countermodel up to domain size 3')
+
+    def test_time_limit(self):
+        """
+        Test the time budget, and searching on a background thread
+        """
+        premises = [fol_tree('∀x∈S ∀y∈S ∀z∈S((R(x,y)∧R(y,z))→R(x,z))'), fol_tree('∀x∈S ¬R(x,x)')]
+        conclusion = fol_tree('∃x∈S ∀y∈S ¬R(y,x)')
+        result = finitemodels.find_countermodel(premises, conclusion, max_size=6, time_limit=0)
+        self.assertEqual(result.status, finitemodels.TIMED_OUT)
+
+        search = finitemodels.ModelSearch(premises, conclusion, max_size=3, time_limit=10)
+        search.start()
+        result = search.wait(10)
+        self.assertEqual(result.status, finitemodels.NOT_FOUND)
+
+        search = finitemodels.ModelSearch(premises, conclusion, max_size=8, time_limit=None)
+        search.start()
+        search.cancel()
+        self.assertEqual(search.wait(10).status, finitemodels.TIMED_OUT)
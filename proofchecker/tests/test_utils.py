@@ -1,8 +1,16 @@
 from django.test import TestCase
+import os
+import pickle
+import tempfile
+
+from proofchecker.proofs.proofutils import make_tree
 from proofchecker.utils import folparser
 from proofchecker.utils import numparser
 from proofchecker.utils import tflparser
-from proofchecker.utils.binarytree import Node, inorder, postorder, preorder, tree_to_string, string_to_tree
+from proofchecker.utils import lrtables
+from proofchecker.utils.parsecache import ParseCache, normalize
+from proofchecker.utils.binarytree import InternedNode, Node, inorder, intern_tree, postorder, preorder, tree_to_string, string_to_tree
+from proofchecker.utils.narytree import flatten, has_brackets, is_side, same_modulo_association, same_modulo_commutativity
 from proofchecker.utils.numlexer import lexer as numlexer
 from proofchecker.utils.syntax import Syntax
 from proofchecker.utils.tfllexer import IllegalCharacterError, lexer as tfllexer
@@ -110,6 +118,64 @@ class BinaryTreeTests(TestCase):
         str2 = postorder(tflparser.parser.parse(str1, lexer=tfllexer))
         self.assertEqual(str2, 'AB∧C∨')
 
+    def test_parsed_trees_are_interned(self):
+        """
+        Identical subformulas should share a single node,
+        so equal trees are the same object
+        """
+        a = tflparser.parser.parse('(A∧B)∨C', lexer=tfllexer)
+        b = tflparser.parser.parse('C→(A ∧ B)', lexer=tfllexer)
+        c = tflparser.parser.parse('(A&B)vC', lexer=tfllexer)
+
+        self.assertIs(a.left, b.right)
+        self.assertIs(a, c)
+        self.assertEqual(hash(a), hash(c))
+        self.assertNotEqual(a, b)
+        self.assertIs(InternedNode('¬', None, a.left), tflparser.parser.parse('¬(A∧B)', lexer=tfllexer))
+
+    def test_interned_node_is_immutable(self):
+        """
+        Interned nodes should not allow their values to be changed
+        """
+        a = tflparser.parser.parse('A∧B', lexer=tfllexer)
+        with self.assertRaises(AttributeError):
+            a.value = '∨'
+        with self.assertRaises(AttributeError):
+            a.left = None
+
+    def test_interned_node_walks(self):
+        """
+        Interned trees should produce the same walks and strings as Nodes
+        """
+        a = Node('∨')
+        a.left = Node('∧')
+        a.left.left = Node('A')
+        a.left.right = Node('B')
+        a.right = Node('C')
+        b = intern_tree(a)
+
+        self.assertIsInstance(b, InternedNode)
+        self.assertEqual(a, b)
+        self.assertEqual(b, a)
+        self.assertIs(b, tflparser.parser.parse('(A∧B)∨C', lexer=tfllexer))
+        self.assertEqual(str(b), str(a))
+        self.assertEqual(inorder(b), inorder(a))
+        self.assertEqual(preorder(b), preorder(a))
+        self.assertEqual(postorder(b), postorder(a))
+
+        c = []
+        d = []
+        tree_to_string(a, c)
+        tree_to_string(b, d)
+        self.assertEqual(''.join(c), ''.join(d))
+
+    def test_interned_node_pickle(self):
+        """
+        Unpickling an interned tree should return the interned node
+        """
+        a = tflparser.parser.parse('(A∧B)∨¬C', lexer=tfllexer)
+        self.assertIs(pickle.loads(pickle.dumps(a)), a)
+
 class SyntaxTests(TestCase):
 
     def test_remove_justification_with_just(self):
@@ -320,4 +386,167 @@ class NumLexerTests(TestCase):
         The lexer should raise an IllegalCharacterError
         if provided an invalid character
         """
-        self.assertRaises(IllegalCharacterError, tflparser.parser.parse, '3.a', lexer=tfllexer)
\ No newline at end of file
+        self.assertRaises(IllegalCharacterError, tflparser.parser.parse, '3.a', lexer=tfllexer)
+
+class ParserTableCacheTests(TestCase):
+
+    def setUp(self):
+        self.table_dir = tempfile.TemporaryDirectory()
+        self.default_dir = lrtables.TABLE_DIR
+        lrtables.TABLE_DIR = self.table_dir.name
+
+    def tearDown(self):
+        lrtables.TABLE_DIR = self.default_dir
+        self.table_dir.cleanup()
+
+    def test_tables_are_written_and_reused(self):
+        """
+        The first build should save the tables to disk,
+        and later builds should load them instead of rebuilding
+        """
+        built = lrtables.build_parser('tfl', module=tflparser)
+        self.assertEqual(len(os.listdir(self.table_dir.name)), 1)
+        self.assertFalse(isinstance(built.productions[0], lrtables.TableProduction))
+
+        loaded = lrtables.build_parser('tfl', module=tflparser)
+        self.assertTrue(isinstance(loaded.productions[0], lrtables.TableProduction))
+        self.assertEqual(loaded.action, built.action)
+        self.assertEqual(loaded.goto, built.goto)
+
+        str1 = '(A∧B)∨[(¬C→D)∧(A↔Z)]'
+        self.assertEqual(loaded.parse(str1, lexer=tfllexer), built.parse(str1, lexer=tfllexer))
+        self.assertRaises(SyntaxError, loaded.parse, 'A∧', lexer=tfllexer)
+
+    def test_stale_tables_are_rebuilt(self):
+        """
+        A table file whose signature does not match the grammar should be ignored
+        """
+        signature, _ = lrtables.grammar_signature(vars(numparser))
+        path = lrtables.table_path('num', signature)
+        lrtables.build_parser('num', module=numparser)
+        self.assertIsNotNone(lrtables.read_tables(path, signature))
+        self.assertIsNone(lrtables.read_tables(path, 'not-the-signature'))
+
+        with open(path, 'wb') as f:
+            f.write(b'corrupted')
+        parser = lrtables.build_parser('num', module=numparser)
+        self.assertEqual(parser.parse('3.12.4', lexer=numlexer), 3)
+        self.assertIsNotNone(lrtables.read_tables(path, signature))
+
+
+class ParseCacheTests(TestCase):
+
+    def test_normalize(self):
+        """
+        Aliases and whitespace should be normalized without merging tokens
+        """
+        self.assertEqual(normalize('A ^ B -> [C v D]', 'tfl'), 'A∧B→(C∨D)')
+        self.assertEqual(normalize('A <-> ~B', 'tfl'), 'A↔¬B')
+        self.assertEqual(normalize('Tr ue', 'tfl'), 'Tr ue')
+        self.assertEqual(normalize('∀x∈S (F(x) | G(x))', 'fol'), '∀x∈S(F(x)∨G(x))')
+        self.assertEqual(normalize('F(v) & [G(v)]', 'fol'), 'F(v)∧[G(v)]')
+
+    def test_hits_and_misses(self):
+        """
+        Equivalent expressions should share one cache entry and one tree
+        """
+        cache = ParseCache()
+        a = cache.parse('A∧B', tflparser.parser)
+        b = cache.parse('A ^ B', tflparser.parser)
+        c = cache.parse('F(a)∧G(a)', folparser.parser)
+        self.assertIs(a, b)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 2)
+        self.assertEqual(cache.stats()['size'], 2)
+        self.assertEqual(str(c), 'F(a)∧G(a)')
+
+    def test_syntax_errors_are_cached(self):
+        """
+        Syntax errors should be cached and raised again on a hit
+        """
+        cache = ParseCache()
+        self.assertRaises(SyntaxError, cache.parse, 'A∧', tflparser.parser)
+        self.assertRaises(SyntaxError, cache.parse, 'A ∧', tflparser.parser)
+        with self.assertRaises(IllegalCharacterError) as first:
+            cache.parse('Hello', tflparser.parser)
+        with self.assertRaises(IllegalCharacterError) as second:
+            cache.parse('Hello', tflparser.parser)
+        self.assertEqual(first.exception.message, "Illegal character 'e'")
+        self.assertEqual(second.exception.message, "Illegal character 'e'")
+        self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_eviction(self):
+        """
+        The least recently used and expired entries should be evicted
+        """
+        cache = ParseCache(max_size=2)
+        cache.parse('A', tflparser.parser)
+        cache.parse('B', tflparser.parser)
+        cache.parse('A', tflparser.parser)
+        cache.parse('C', tflparser.parser)
+        self.assertEqual(list(key[1] for key in cache.entries), ['A', 'C'])
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+        cache = ParseCache(ttl=0)
+        cache.parse('A', tflparser.parser)
+        cache.parse('A', tflparser.parser)
+        self.assertEqual(cache.stats()['hits'], 0)
+        self.assertEqual(cache.stats()['misses'], 2)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+
+class NaryTreeTests(TestCase):
+
+    def test_flatten(self):
+        parser = tflparser.parser
+        form = flatten(tflparser.parser.parse('A∧B∧(C∨D∨E)∧¬F', lexer=tfllexer))
+        self.assertEqual(form.value, '∧')
+        self.assertEqual([child.value for child in form.children], ['A', 'B', '∨', '¬'])
+        self.assertEqual(len(form.children[2].children), 3)
+        self.assertEqual(form.index[flatten(InternedNode('B'))], [1])
+        self.assertTrue(same_modulo_association(make_tree('(A∧B)∧(C∨D)', parser), make_tree('A∧(B∧(C∨D))', parser)))
+        self.assertFalse(same_modulo_association(make_tree('A∧B', parser), make_tree('B∧A', parser)))
+        self.assertFalse(same_modulo_association(make_tree('A∧(B∨C)', parser), make_tree('(A∧B)∨C', parser)))
+        self.assertTrue(same_modulo_commutativity(make_tree('A∧B∧¬(C∨D)', parser), make_tree('¬(D∨C)∧(B∧A)', parser)))
+        self.assertFalse(same_modulo_commutativity(make_tree('A→B', parser), make_tree('B→A', parser)))
+
+    def test_is_side(self):
+        parser = tflparser.parser
+        whole = make_tree('A∧B∧C', parser)
+        self.assertTrue(is_side(make_tree('A∧B', parser), whole, '∧'))
+        self.assertTrue(is_side(make_tree('B∧C', parser), whole, '∧'))
+        self.assertTrue(is_side(make_tree('A', parser), whole, '∧'))
+        self.assertTrue(is_side(make_tree('C', parser), whole, '∧'))
+        self.assertFalse(is_side(make_tree('B', parser), whole, '∧'))
+        self.assertFalse(is_side(whole, whole, '∧'))
+        self.assertFalse(is_side(make_tree('A', parser), make_tree('A∨B', parser), '∧'))
+
+    def test_has_brackets(self):
+        self.assertFalse(has_brackets('A∧B∧C'))
+        for expression in ('(A∧B)∧C', '[A∧B]∧C', '{A∧B}∧C'):
+            self.assertTrue(has_brackets(expression))
+
+    def test_deep_chain(self):
+        letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+        expression = '∧'.join(letters[i % 26] for i in range(5000))
+        tree = tflparser.parser.parse(expression, lexer=tfllexer)
+        self.assertEqual(len(flatten(tree).children), 5000)
+        self.assertEqual(len(flatten(tree).digest), 32)
+        string = []
+        tree_to_string(tree, string)
+        self.assertEqual(string[:4], ['∧', '(', '∧', '('])
+
+        # Plain Nodes are compared without recursion
+        chains = []
+        for k in range(2):
+            node = Node('A')
+            for i in range(5000):
+                parent = Node('∧')
+                parent.left = node
+                parent.right = Node('B')
+                node = parent
+            chains.append(node)
+        self.assertTrue(chains[0] == chains[1])
+        chains[1].left.right.value = 'C'
+        self.assertFalse(chains[0] == chains[1])
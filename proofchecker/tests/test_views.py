@@ -93,6 +93,24 @@ class ProofCreateViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'proofchecker/proof_add_edit.html')
 
+    def test_check_proof_shows_dependent_lines(self):
+        self.client = Client(enforce_csrf_checks=False)
+        login = self.client.login(username='testuser1', password='1X<ISRUkw+tuK', is_active='True')
+        data = {
+            'name': ['Proof'], 'rules': ['tfl_basic'], 'premises': ['A∧B'], 'conclusion': ['C∨A'], 'proofline_set-TOTAL_FORMS': ['3'],
+            'proofline_set-INITIAL_FORMS': ['0'], 'proofline_set-MIN_NUM_FORMS': ['0'],
+            'proofline_set-MAX_NUM_FORMS': ['1000'], 'check_proof': ['']}
+        lines = [('1', 'A∧B', 'Premise'), ('2', 'C', '∧E 1'), ('3', 'C∨A', '∨I 2')]
+        for i, (line_no, formula, rule) in enumerate(lines):
+            data.update({'proofline_set-{}-id'.format(i): [''], 'proofline_set-{}-ORDER'.format(i): [str(i)],
+                'proofline_set-{}-line_no'.format(i): [line_no], 'proofline_set-{}-formula'.format(i): [formula],
+                'proofline_set-{}-rule'.format(i): [rule]})
+        response = self.client.post(reverse('add_proof'), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Error on line 2: Line 2 does not follow from line 1')
+        # Line 3 is a valid use of ∨I, but cites the invalid line 2
+        self.assertContains(response, 'Depends on line 2, which contains an error')
+
     def test_submit_proof_redirect(self):
         self.client = Client(enforce_csrf_checks=False)
         login = self.client.login(username='testuser1', password='1X<ISRUkw+tuK', is_active='True')
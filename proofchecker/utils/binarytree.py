@@ -1,5 +1,7 @@
 # Creates an binary tree
 
+import threading
+import weakref
 from collections import deque
 
 class Node:
@@ -15,14 +17,116 @@ class Node:
         return inorder(self)
 
     def __eq__(self, other):
-        if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+        if isinstance(other, (self.__class__, InternedNode)):
+            return same_structure(self, other)
         else:
             return False
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
+class InternedNode:
+    """
+    An immutable, hash-consed binary tree node.
+    Structurally identical trees share a single object, so equality
+    between InternedNodes is an identity check.  The hash and the
+    in-order string are computed once per node
+    """
+    __slots__ = ('value', 'left', 'right', '_hash', '_string', '__weakref__')
+
+    _table = weakref.WeakValueDictionary()
+    _lock = threading.Lock()
+
+    def __new__(cls, value, left=None, right=None):
+        key = (value, left, right)
+        with cls._lock:
+            node = cls._table.get(key)
+            if node is None:
+                node = object.__new__(cls)
+                object.__setattr__(node, 'value', value)
+                object.__setattr__(node, 'left', left)
+                object.__setattr__(node, 'right', right)
+                object.__setattr__(node, '_hash', hash(key))
+                object.__setattr__(node, '_string', None)
+                cls._table[key] = node
+        return node
+
+    def __setattr__(self, name, value):
+        raise AttributeError('InternedNode is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('InternedNode is immutable')
+
+    def __reduce__(self):
+        return (InternedNode, (self.value, self.left, self.right))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __hash__(self):
+        return self._hash
+
+    def __str__(self):
+        if self._string is None:
+            object.__setattr__(self, '_string', inorder(self))
+        return self._string
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, Node):
+            return same_structure(self, other)
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+
+def same_structure(root_1, root_2):
+    """
+    Compares two trees node by node
+    (used when a plain Node is compared with an InternedNode)
+    """
+    stack = [(root_1, root_2)]
+    while stack:
+        node_1, node_2 = stack.pop()
+        if node_1 is node_2:
+            continue
+        if (node_1 is None) or (node_2 is None) or (node_1.value != node_2.value):
+            return False
+        stack.append((node_1.left, node_2.left))
+        stack.append((node_1.right, node_2.right))
+    return True
+
+
+def intern_tree(root):
+    """
+    Returns the InternedNode equivalent of a tree of Nodes
+    """
+    if (root is None) or isinstance(root, InternedNode):
+        return root
+
+    # Intern the children before their parents (post-order)
+    interned = {}
+    stack = [(root, False)]
+    while stack:
+        node, visited = stack.pop()
+        if (node is None) or (id(node) in interned):
+            continue
+        if visited:
+            interned[id(node)] = InternedNode(
+                node.value,
+                interned.get(id(node.left), node.left) if node.left is not None else None,
+                interned.get(id(node.right), node.right) if node.right is not None else None)
+        else:
+            stack.append((node, True))
+            stack.append((node.right, False))
+            stack.append((node.left, False))
+    return interned[id(root)]
+
 def inorder(root: Node):
     """
     Returns a string representation of an in-order tree traversal
@@ -100,28 +204,32 @@ def postorder(root: Node):
 def tree_to_string(root: Node, string: list):
     """
     Function to construct string from binary tree
+    (iterative, so deep trees are fine)
     """
 
-    if root is None:
-        return
-
-    # Push the root data as character
-    string.append(str(root.value))
-
-    # if leaf node, then return
-    if not root.left and not root.right:
-        return
-
-    # For left subtree
-    string.append('(')
-    tree_to_string(root.left, string)
-    string.append(')')
- 
-    # Only if right child is present to avoid extra parenthesis
-    if root.right:
-        string.append('(')
-        tree_to_string(root.right, string)
-        string.append(')')
+    # Stack of nodes still to write, and parentheses (as str)
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            string.append(item)
+            continue
+        if item is None:
+            continue
+
+        # Push the root data as character
+        string.append(str(item.value))
+
+        # if leaf node, continue
+        if not item.left and not item.right:
+            continue
+
+        # Only if right child is present to avoid extra parenthesis
+        if item.right:
+            stack.extend([')', item.right, '('])
+
+        # For left subtree
+        stack.extend([')', item.left, '('])
 
 
 def string_to_tree_helper(start_index, end_index, arr, root):
@@ -1,7 +1,7 @@
 from proofchecker.utils.ply.lex import lex
-from .ply import yacc 
+from .lrtables import build_parser
 
-from .binarytree import Node
+from .binarytree import InternedNode
 from .follexer import tokens, lexer
 
 # Ordered lowest to highest
@@ -19,25 +19,24 @@ def p_formula_binary_op(p):
             | formula OR formula
             | formula AND formula
     '''
-    # Construct tree node
-    p[0] = Node(p[2])
-    p[0].left = p[1]
-    p[0].right = p[3]
-
     # Reformat symbol if necessary
-    if p[0].value != ('∧' or '∨' or '→' or '↔'):
-        if p[0].value == '^':
-            p[0].value = '∧'
-        if p[0].value == '&':
-            p[0].value = '∧'
-        if p[0].value == '|':
-            p[0].value = '∨'
-        if p[0].value == '>':
-            p[0].value = '→'
-        if p[0].value == '->':
-            p[0].value = '→'
-        if p[0].value == '<->':
-            p[0].value = '↔'
+    value = p[2]
+    if value != ('∧' or '∨' or '→' or '↔'):
+        if value == '^':
+            value = '∧'
+        if value == '&':
+            value = '∧'
+        if value == '|':
+            value = '∨'
+        if value == '>':
+            value = '→'
+        if value == '->':
+            value = '→'
+        if value == '<->':
+            value = '↔'
+
+    # Construct tree node
+    p[0] = InternedNode(value, p[1], p[3])
 
 
 def p_formula_unary_op(p):
@@ -45,21 +44,15 @@ def p_formula_unary_op(p):
     formula : NOT formula
     '''
 
-    # Create tree node
-    p[0] = Node(p[1])
-    p[0].right = p[2]
-
-    # Reformat symbol if necessary
-    if p[0].value != '¬':
-        p[0].value = '¬'
+    # Create tree node (reformatting the symbol if necessary)
+    p[0] = InternedNode('¬', None, p[2])
 
 
 def p_formula_quanitifier(p):
     '''
     formula : QUANTIFIER VAR MEMBERSHIP DOMAIN formula
     '''
-    p[0] = Node(p[1] + p[2] + p[3] + p[4])
-    p[0].right = p[5]
+    p[0] = InternedNode(p[1] + p[2] + p[3] + p[4], None, p[5])
 
 
 def p_formula_parens(p):
@@ -73,15 +66,13 @@ def p_equals_formula(p):
     formula : term EQUALS term
             | atomic_formula EQUALS atomic_formula
     '''
-    p[0] = Node(p[2])
-    p[0].left = Node(p[1])
-    p[0].right = Node(p[3])
+    p[0] = InternedNode(p[2], InternedNode(p[1]), InternedNode(p[3]))
 
 def p_formula(p):
     '''
     formula : atomic_formula
     '''
-    p[0] = Node(p[1])
+    p[0] = InternedNode(p[1])
 
 
 def p_atomic_formula_x(p):
@@ -142,7 +133,7 @@ def p_error(p):
     raise SyntaxError
 
 # Build the parser
-parser = yacc.yacc()
+parser = build_parser('fol')
 parser.lexer = lexer
 
 def test():
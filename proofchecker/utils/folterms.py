@@ -0,0 +1,152 @@
+import weakref
+from collections import namedtuple
+from functools import lru_cache
+
+from .binarytree import InternedNode
+from .constants import Constants
+
+# A structured view of FOL trees.  The parser keeps atomic formulas
+# as strings ('F(a,x)', 'Fax'); here they are split into a predicate
+# and a tuple of terms, and quantified variables are replaced by
+# de Bruijn-style indices (0 for the innermost quantifier), so
+# substitutions can be checked in one walk over two trees
+# without comparing strings character by character
+
+BOOLS = ('True', 'TRUE', 'False', 'FALSE', '⊥')
+
+# An atomic formula: the predicate (None for a term on either side
+# of '=', or the value of a BOOL) and its terms.  A term is a name or
+# a free variable (str), or a bound variable (int, its de Bruijn index)
+Atom = namedtuple('Atom', ['predicate', 'terms'])
+
+
+@lru_cache(maxsize=65536)
+def parse_atom(value: str):
+    """
+    Returns the Atom of a leaf of an FOL tree,
+    e.g. Atom('F', ('a', 'x')) for 'F(a, x)' or 'Fax'
+    """
+    value = value.replace(' ', '')
+    if (value in BOOLS) or (not value):
+        return Atom(value, ())
+    if value[0] in Constants.PREDICATES:
+        return Atom(value[0], tuple(ch for ch in value[1:] if ch not in '(),'))
+    return Atom(None, tuple(ch for ch in value if ch not in '(),'))
+
+
+def is_quantifier_node(node: InternedNode):
+    return isinstance(node.value, str) and (node.value[:1] in Constants.QUANTIFIERS) and (node.left is None)
+
+
+# Tree -> de Bruijn form of the tree (as a whole formula)
+_debruijn = weakref.WeakKeyDictionary()
+
+# Tree -> free variables of the tree
+_free_vars = weakref.WeakKeyDictionary()
+
+
+def debruijn(tree: InternedNode):
+    """
+    Returns the de Bruijn form of an FOL tree: every leaf becomes an
+    Atom, and quantifier nodes drop their variable ('∀x∈S' becomes '∀∈S')
+    while the variable's occurrences in the body become indices.
+    Trees equal up to renaming bound variables have the same form
+    (the same InternedNode)
+    """
+    if tree is None:
+        return None
+    cached = _debruijn.get(tree)
+    if cached is not None:
+        return cached
+
+    # (id(node), binders) -> converted node.  Binders are the variables
+    # of the enclosing quantifiers, innermost first
+    converted = {}
+    stack = [(tree, (), False)]
+    while stack:
+        node, binders, visited = stack.pop()
+        key = (id(node), binders)
+        if key in converted:
+            continue
+
+        if (node.left is None) and (node.right is None):
+            atom = parse_atom(node.value)
+            terms = tuple(binders.index(term) if term in binders else term for term in atom.terms)
+            converted[key] = InternedNode(Atom(atom.predicate, terms))
+            continue
+
+        quantified = is_quantifier_node(node)
+        inner = ((node.value[1],) + binders) if quantified else binders
+
+        if not visited:
+            stack.append((node, binders, True))
+            for child in (node.left, node.right):
+                if child is not None:
+                    stack.append((child, inner, False))
+            continue
+
+        value = (node.value[0] + node.value[2:]) if quantified else node.value
+        converted[key] = InternedNode(value,
+            converted[(id(node.left), inner)] if node.left is not None else None,
+            converted[(id(node.right), inner)] if node.right is not None else None)
+
+    result = converted[(id(tree), ())]
+    if isinstance(tree, InternedNode):
+        _debruijn[tree] = result
+    return result
+
+
+def free_vars(tree: InternedNode):
+    """
+    Returns the set of variables occurring free in an FOL tree
+    """
+    if tree is None:
+        return frozenset()
+    cached = _free_vars.get(tree)
+    if cached is not None:
+        return cached
+
+    variables = set()
+    stack = [debruijn(tree)]
+    while stack:
+        node = stack.pop()
+        if isinstance(node.value, Atom):
+            variables.update(term for term in node.value.terms if term in Constants.VARS)
+            continue
+        for child in (node.left, node.right):
+            if child is not None:
+                stack.append(child)
+
+    result = frozenset(variables)
+    if isinstance(tree, InternedNode):
+        _free_vars[tree] = result
+    return result
+
+
+def aligned_atoms(tree_1: InternedNode, tree_2: InternedNode):
+    """
+    Yields the pairs of Atoms at the same position in two trees
+    (in de Bruijn form), from left to right.
+    Subtrees where the trees have a different shape are skipped
+    """
+    stack = [(debruijn(tree_1), debruijn(tree_2))]
+    while stack:
+        node_1, node_2 = stack.pop()
+        if (node_1 is None) or (node_2 is None):
+            continue
+        atom_1 = isinstance(node_1.value, Atom)
+        atom_2 = isinstance(node_2.value, Atom)
+        if atom_1 and atom_2:
+            yield node_1.value, node_2.value
+        elif not (atom_1 or atom_2):
+            stack.append((node_1.right, node_2.right))
+            stack.append((node_1.left, node_2.left))
+
+
+def aligned_terms(tree_1: InternedNode, tree_2: InternedNode):
+    """
+    Yields the pairs of terms at the same position in two trees,
+    from left to right (a bound variable is its de Bruijn index)
+    """
+    for atom_1, atom_2 in aligned_atoms(tree_1, tree_2):
+        yield from zip(atom_1.terms, atom_2.terms)
@@ -0,0 +1,160 @@
+# Persists the LALR tables generated by the vendored PLY yacc,
+# so each parser is only constructed once per grammar change
+
+import hashlib
+import os
+import pickle
+import sys
+
+from .ply import __version__ as ply_version
+from .ply import yacc
+
+# Bump whenever the layout of the pickled tables changes
+TABLE_VERSION = 1
+
+# Directory holding the generated table files
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parsetabs')
+
+
+class TableProduction:
+    """
+    The subset of a yacc Production needed by LRParser at parse time
+    """
+    __slots__ = ('name', 'len', 'func', 'str', 'callable')
+
+    def __init__(self, name, length, func, string):
+        self.name = name
+        self.len = length
+        self.func = func
+        self.str = string
+        self.callable = None
+
+    def __str__(self):
+        return self.str
+
+    def bind(self, pdict):
+        if self.func:
+            self.callable = pdict[self.func]
+
+
+class TableSet:
+    """
+    Stand-in for yacc.LRTable, built from tables loaded off disk
+    """
+
+    def __init__(self, action, goto, productions):
+        self.lr_action = action
+        self.lr_goto = goto
+        self.lr_productions = productions
+
+    def bind_callables(self, pdict):
+        for p in self.lr_productions:
+            p.bind(pdict)
+
+
+def grammar_signature(pdict):
+    """
+    Returns a hex digest identifying the grammar defined in pdict
+    (start symbol, precedence, tokens, rule names and docstrings),
+    together with the PLY and table format versions
+    """
+    pinfo = yacc.ParserReflect(pdict, log=yacc.NullLogger())
+    pinfo.get_all()
+
+    parts = [str(TABLE_VERSION), ply_version, pinfo.signature()]
+    for _, _, name, doc in pinfo.pfuncs:
+        parts.append(name)
+        parts.append(doc or '')
+
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest(), pinfo
+
+
+def table_path(name: str, signature: str):
+    """
+    Returns the path of the table file for a grammar
+    """
+    return os.path.join(TABLE_DIR, '{}-{}.pickle'.format(name, signature[:16]))
+
+
+def read_tables(path: str, signature: str):
+    """
+    Load a TableSet from disk
+    Returns None if the file is missing, unreadable or stale
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+    except Exception:
+        return None
+
+    if not isinstance(data, dict) or data.get('signature') != signature:
+        return None
+
+    productions = [TableProduction(*p) for p in data['productions']]
+    return TableSet(data['action'], data['goto'], productions)
+
+
+def write_tables(path: str, signature: str, parser):
+    """
+    Save the tables of a freshly built parser to disk
+    Failures are ignored (e.g. a read-only deployment), the
+    parser is simply rebuilt on the next start
+    """
+    data = {
+        'signature': signature,
+        'action': parser.action,
+        'goto': parser.goto,
+        'productions': [(p.name, p.len, p.func, p.str) for p in parser.productions],
+    }
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def build_parser(name: str, module=None, use_cache=True, refresh=False):
+    """
+    Build the yacc parser defined in the calling module (or module),
+    loading its tables from disk when a matching table file exists
+    and rebuilding (then saving) them otherwise.
+    With refresh=True the tables are always rebuilt and saved
+    """
+    if module is None:
+        pdict = yacc.get_caller_module_dict(2)
+        module = sys.modules[pdict['__name__']]
+    else:
+        pdict = dict((k, getattr(module, k)) for k in dir(module))
+
+    signature, pinfo = grammar_signature(pdict)
+    path = table_path(name, signature)
+
+    if use_cache and not refresh and not pinfo.error:
+        tables = read_tables(path, signature)
+        if tables is not None:
+            tables.bind_callables(pdict)
+            parser = yacc.LRParser(tables, pinfo.error_func)
+            parser.name = name
+            return parser
+
+    parser = yacc.yacc(module=module)
+    parser.name = name
+    if use_cache:
+        write_tables(path, signature, parser)
+    return parser
+
+
+if __name__ == '__main__':
+    # Build step: regenerate the table files for every grammar
+    # (e.g. python -m proofchecker.utils.lrtables)
+    from proofchecker.utils import folparser, numparser, tflparser
+
+    for grammar in (tflparser, folparser, numparser):
+        parser = build_parser(grammar.parser.name, module=grammar, refresh=True)
+        print('Built tables for {}'.format(parser.name))
@@ -0,0 +1,208 @@
+import hashlib
+import threading
+import weakref
+
+from .binarytree import InternedNode, Node
+
+# A canonical n-ary form of parse trees: chains of an associative
+# connective such as A∧B∧C∧D (a left-leaning binary tree, one level
+# per conjunct) become a single node with the operands in order, so
+# (A∧B)∧C and A∧(B∧C) have the same form.  The form is built without
+# recursion, so long chains cost no recursion depth
+
+ASSOCIATIVE = ('∧', '∨')
+
+# The characters the TFL and FOL lexers read as an opening parenthesis
+OPENING_BRACKETS = '([{'
+
+
+class NaryNode:
+    """
+    An immutable, hash-consed node with any number of children.
+    Like InternedNode, equal forms are the same object.
+    index maps each child to its positions, and digest is a hash that
+    also ignores the order of the operands of ∧ and ∨
+    """
+    __slots__ = ('value', 'children', '_hash', '_index', '_digest', '__weakref__')
+
+    _table = weakref.WeakValueDictionary()
+    _lock = threading.Lock()
+
+    def __new__(cls, value, children=()):
+        key = (value, children)
+        with cls._lock:
+            node = cls._table.get(key)
+            if node is None:
+                node = object.__new__(cls)
+                object.__setattr__(node, 'value', value)
+                object.__setattr__(node, 'children', children)
+                object.__setattr__(node, '_hash', hash(key))
+                object.__setattr__(node, '_index', None)
+                object.__setattr__(node, '_digest', None)
+                cls._table[key] = node
+        return node
+
+    def __setattr__(self, name, value):
+        raise AttributeError('NaryNode is immutable')
+
+    def __reduce__(self):
+        return (NaryNode, (self.value, self.children))
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return self is other
+
+    def __ne__(self, other):
+        return self is not other
+
+    @property
+    def index(self):
+        """
+        Returns a dictionary {child: [positions]}
+        """
+        if self._index is None:
+            index = {}
+            for position, child in enumerate(self.children):
+                index.setdefault(child, []).append(position)
+            object.__setattr__(self, '_index', index)
+        return self._index
+
+    @property
+    def digest(self):
+        """
+        Returns a hex digest equal for forms that differ only in the
+        order of the operands of ∧ and ∨ (computed once per node)
+        """
+        stack = [(self, False)]
+        while stack:
+            node, visited = stack.pop()
+            if node._digest is not None:
+                continue
+            if not visited:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children)
+                continue
+            digests = [child._digest for child in node.children]
+            if node.value in ASSOCIATIVE:
+                digests.sort()
+            digest = hashlib.blake2b(repr((str(node.value), digests)).encode('utf-8'), digest_size=16).hexdigest()
+            object.__setattr__(node, '_digest', digest)
+        return self._digest
+
+
+# InternedNode -> NaryNode
+_forms = weakref.WeakKeyDictionary()
+
+
+def chain_operands(node: Node):
+    """
+    Returns the operands of the chain of node.value rooted at node, in
+    order (the maximal subtrees whose root is another connective)
+    """
+    operands = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if (current.value == node.value) and (current.left is not None) and (current.right is not None):
+            stack.append(current.right)
+            stack.append(current.left)
+        else:
+            operands.append(current)
+    return operands
+
+
+def flatten(tree: Node):
+    """
+    Returns the n-ary form of a tree (cached for InternedNodes)
+    """
+    if tree is None:
+        return None
+    cached = _forms.get(tree) if isinstance(tree, InternedNode) else None
+    if cached is not None:
+        return cached
+
+    forms = {}
+    # Stack of (node, its children in the n-ary form, or None before they are visited)
+    stack = [(tree, None)]
+    while stack:
+        node, children = stack.pop()
+        if id(node) in forms:
+            continue
+        cached = _forms.get(node) if isinstance(node, InternedNode) else None
+        if cached is not None:
+            forms[id(node)] = cached
+            continue
+        if children is None:
+            if (node.value in ASSOCIATIVE) and (node.left is not None) and (node.right is not None):
+                children = chain_operands(node)
+            else:
+                children = [child for child in (node.left, node.right) if child is not None]
+            stack.append((node, children))
+            stack.extend((child, None) for child in reversed(children))
+            continue
+
+        form = NaryNode(node.value, tuple(forms[id(child)] for child in children))
+        forms[id(node)] = form
+        if isinstance(node, InternedNode):
+            _forms[node] = form
+    return forms[id(tree)]
+
+
+def operands(tree: Node, value: str):
+    """
+    Returns the operands of a chain of the connective value
+    (a tree whose root is another connective is a single operand)
+    """
+    form = flatten(tree)
+    if form.value == value:
+        return form.children
+    return (form,)
+
+
+def same_modulo_association(tree_1: Node, tree_2: Node):
+    """
+    Returns True if two trees differ only in the grouping of ∧ and ∨ chains
+    """
+    return flatten(tree_1) is flatten(tree_2)
+
+
+def same_modulo_commutativity(tree_1: Node, tree_2: Node):
+    """
+    Returns True if two trees differ only in the grouping and
+    the order of the operands of ∧ and ∨ chains
+    """
+    return flatten(tree_1).digest == flatten(tree_2).digest
+
+
+def has_brackets(expression: str):
+    """
+    Returns True if an expression is written with any parentheses or
+    brackets (so the grouping of its chains is the one written)
+    """
+    return any(ch in OPENING_BRACKETS for ch in expression)
+
+
+def is_side(part: Node, whole: Node, value: str):
+    """
+    Returns True if part is the left or right side of whole, a chain of
+    the connective value, under some grouping of the chain: the operands
+    of part are the first or last operands of whole (e.g. A∧B or C for
+    A∧B∧C, but not B)
+    """
+    form = flatten(whole)
+    if form.value != value:
+        return False
+    whole_operands = form.children
+    part_operands = operands(part, value)
+    count = len(part_operands)
+    if count >= len(whole_operands):
+        return False
+
+    # Look up where the first operand of part appears in whole
+    positions = form.index.get(part_operands[0], ())
+    if (0 in positions) and (whole_operands[:count] == part_operands):
+        return True
+    start = len(whole_operands) - count
+    return (start in positions) and (whole_operands[start:] == part_operands)
@@ -1,4 +1,4 @@
-from .ply import yacc
+from .lrtables import build_parser
 from .numlexer import tokens
 
 def p_num_dot_num(p):
@@ -18,4 +18,4 @@ def p_error(p):
     raise SyntaxError
 
 # Build the parser
-parser = yacc.yacc()
\ No newline at end of file
+parser = build_parser('num')
\ No newline at end of file
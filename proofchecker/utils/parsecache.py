@@ -0,0 +1,143 @@
+# A process-wide cache of parsed expressions, so the same premises and
+# conclusions submitted by many students are only parsed once
+
+import threading
+import time
+from collections import OrderedDict
+
+# Maximum number of cached expressions (per process)
+MAX_SIZE = 4096
+
+# Number of seconds an entry stays valid
+TTL = 3600
+
+# Operator aliases rewritten to the symbol the parser produces,
+# longest first so '<->' is not split into '<' and '->'
+ALIASES = {
+    'tfl': [('<->', '↔'), ('->', '→'), ('>', '→'), ('^', '∧'), ('&', '∧'),
+        ('v', '∨'), ('|', '∨'), ('~', '¬'), ('-', '¬'),
+        ('[', '('), ('{', '('), (']', ')'), ('}', ')')],
+    'fol': [('<->', '↔'), ('->', '→'), ('>', '→'), ('^', '∧'), ('&', '∧'),
+        ('|', '∨'), ('~', '¬'), ('-', '¬')],
+}
+
+# Characters ignored by the lexers
+WHITESPACE = ' \t\n'
+
+
+def normalize(expression: str, name: str):
+    """
+    Rewrite an expression into the canonical form used as a cache key.
+    Aliases are replaced by their canonical symbol and whitespace is
+    removed, except for a single space between two letters
+    (so 'Tr ue' does not become the keyword 'True').
+    Normalizing never changes the tokens seen by the parser, nor the
+    first illegal character in the expression
+    """
+    for alias, symbol in ALIASES.get(name, []):
+        if alias in expression:
+            expression = expression.replace(alias, symbol)
+
+    result = []
+    pending_space = False
+    for ch in expression:
+        if ch in WHITESPACE:
+            pending_space = True
+            continue
+        if pending_space and result and result[-1].isalpha() and ch.isalpha():
+            result.append(' ')
+        pending_space = False
+        result.append(ch)
+    return ''.join(result)
+
+
+class ParseCache:
+    """
+    A bounded LRU cache of parse results with a time-to-live.
+    Entries are keyed by the parser name and the normalized expression.
+    Syntax errors are cached as well (negative entries) and raised
+    again on a hit
+    """
+
+    def __init__(self, max_size=MAX_SIZE, ttl=TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def parse(self, expression: str, parser):
+        """
+        Returns the tree for expression, parsing it only on a cache miss
+        Parsers without a name (or non-string input) bypass the cache
+        """
+        name = getattr(parser, 'name', None)
+        if (name is None) or (not isinstance(expression, str)) or (self.max_size <= 0):
+            return parser.parse(expression, lexer=parser.lexer)
+
+        key = (name, normalize(expression, name))
+        now = time.monotonic()
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                tree, err, expires = entry
+                if expires > now:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    if err is not None:
+                        raise err.with_traceback(None)
+                    return tree
+                del self.entries[key]
+                self.evictions += 1
+            self.misses += 1
+
+        try:
+            tree = parser.parse(expression, lexer=parser.lexer)
+            err = None
+        except Exception as parse_err:
+            tree = None
+            err = parse_err
+
+        with self.lock:
+            self.entries[key] = (tree, err, now + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+        if err is not None:
+            raise err.with_traceback(None)
+        return tree
+
+    def clear(self):
+        """
+        Remove every entry and reset the counters
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """
+        Returns the cache counters, e.g. for tuning MAX_SIZE and TTL
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+# The cache shared by every call to make_tree
+parse_cache = ParseCache()
@@ -1,7 +1,7 @@
 from proofchecker.utils.ply.lex import lex
-from .ply import yacc 
+from .lrtables import build_parser
 
-from .binarytree import Node
+from .binarytree import InternedNode
 from .tfllexer import tokens, lexer
 
 # Ordered lowest to highest
@@ -19,37 +19,31 @@ def p_sentence_binary_op(p):
              | sentence OR sentence
              | sentence AND sentence
     '''
-    # Construct tree node
-    p[0] = Node(p[2])
-    p[0].left = p[1]
-    p[0].right = p[3]
-
     # Reformat symbol if necessary
-    if p[0].value != ('∧' or '∨' or '→' or '↔'):
-        if p[0].value == '^':
-                p[0].value = '∧'
-        if p[0].value == '&':
-            p[0].value = '∧'
-        if p[0].value == 'v':
-            p[0].value = '∨'
-        if p[0].value == '>':
-            p[0].value = '→'
-        if p[0].value == '->':
-            p[0].value = '→' 
-        if p[0].value == '<->':
-            p[0].value = '↔'
+    value = p[2]
+    if value != ('∧' or '∨' or '→' or '↔'):
+        if value == '^':
+            value = '∧'
+        if value == '&':
+            value = '∧'
+        if value == 'v':
+            value = '∨'
+        if value == '>':
+            value = '→'
+        if value == '->':
+            value = '→'
+        if value == '<->':
+            value = '↔'
+
+    # Construct tree node
+    p[0] = InternedNode(value, p[1], p[3])
 
 
 def p_sentence_unary_op(p):
     'sentence : NOT sentence'
 
-    # Create tree node
-    p[0] = Node(p[1])
-    p[0].right = p[2]
-
-    # Reformat symbol if necessary
-    if p[0].value != '¬':
-        p[0].value = '¬'
+    # Create tree node (reformatting the symbol if necessary)
+    p[0] = InternedNode('¬', None, p[2])
 
 def p_sentence_parens(p):
     'sentence : LPAREN sentence RPAREN'
@@ -60,7 +54,7 @@ def p_sentence(p):
     sentence : BOOL
              | VAR
     '''
-    p[0] = Node(p[1])
+    p[0] = InternedNode(p[1])
 
 # TODO: Create more elegant error handling
 #       Define additional grammar rules for errors
@@ -69,7 +63,7 @@ def p_error(p):
     raise SyntaxError
 
 # Build the parser
-parser = yacc.yacc()
+parser = build_parser('tfl')
 parser.lexer = lexer
 
 # def test():
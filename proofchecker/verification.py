@@ -0,0 +1,83 @@
+# Stored verification results of saved proofs.  A ProofVerification is
+# keyed by the proof_digest of the proof it was computed for, so it is
+# reused until the proof changes (signals.py also deletes it when the
+# proof or one of its lines is saved)
+
+import time
+
+from django.utils import timezone
+
+from proofchecker.models import ProofVerification
+from proofchecker.proofs.proofcache import proof_digest
+from proofchecker.proofs.proofchecker import get_parser, verify_proof, verify_proofs
+
+RECORD_FIELDS = ['content_hash', 'is_valid', 'is_complete', 'err_msg', 'duration', 'verified_on']
+
+
+def stored_record(proof):
+    """
+    Returns the ProofVerification of a saved Proof, or None
+    """
+    try:
+        return proof.verification
+    except ProofVerification.DoesNotExist:
+        return None
+
+
+def make_record(proof, content_hash: str, response):
+    """
+    Returns the (unsaved) ProofVerification of a proof for a ProofResponse
+    """
+    record = stored_record(proof) or ProofVerification(proof=proof)
+    record.content_hash = content_hash
+    record.is_valid = response.is_valid
+    record.is_complete = response.is_valid and not response.err_msg
+    record.err_msg = response.err_msg
+    record.duration = response.duration or 0
+    record.verified_on = timezone.now()
+    return record
+
+
+def verify_saved_proofs(proofs, proof_objs, workers=None, executor=None):
+    """
+    Verify saved Proofs (proof_objs being their ProofObjs), reusing the
+    stored result of each proof that did not change.  Load the proofs
+    with select_related('verification') to avoid a query per proof.
+    With a number of workers, or an executor from proof_pool, the other
+    proofs are verified by verify_proofs.
+    Returns the ProofResponses, and the ProofVerifications to save with save_records
+    """
+    hashes = [proof_digest(proof_obj) for proof_obj in proof_objs]
+    responses = []
+    for proof, content_hash in zip(proofs, hashes):
+        record = stored_record(proof)
+        responses.append(record.response() if (record is not None) and (record.content_hash == content_hash) else None)
+
+    missing = [i for i, response in enumerate(responses) if response is None]
+    if (workers is not None) or (executor is not None):
+        for position, response in verify_proofs([proof_objs[i] for i in missing], workers=workers,
+                executor=executor):
+            responses[missing[position]] = response
+    else:
+        for i in missing:
+            start = time.perf_counter()
+            response = verify_proof(proof_objs[i], get_parser(proof_objs[i].rules),
+                cache_key='proof-{}'.format(proofs[i].pk))
+            response.duration = time.perf_counter() - start
+            responses[i] = response
+
+    records = [make_record(proofs[i], hashes[i], responses[i]) for i in missing]
+    return responses, records
+
+
+def save_records(records):
+    """
+    Save ProofVerifications: one query for the new ones and one for the others.
+    A record created meanwhile by another process is left as it is
+    """
+    new = [record for record in records if record.pk is None]
+    stored = [record for record in records if record.pk is not None]
+    if new:
+        ProofVerification.objects.bulk_create(new, ignore_conflicts=True)
+    if stored:
+        ProofVerification.objects.bulk_update(stored, RECORD_FIELDS)
@@ -38,6 +38,18 @@ def SyntaxTestPage(request):
     return render(request, "proofchecker/testpages/syntax_test.html")
 
 
+def proof_cache_key(request, pk=None):
+    """
+    Key of the cached line results of the proof being checked:
+    the proof id, or the session for a proof that is not saved yet
+    """
+    if pk is not None:
+        return 'proof-{}'.format(pk)
+    if request.session.session_key:
+        return 'session-{}-{}'.format(request.session.session_key, request.path)
+    return None
+
+
 def proof_checker(request):
     ProofLineFormset = inlineformset_factory(
         Proof, ProofLine, form=ProofLineForm, extra=0, can_order=True)
@@ -86,7 +98,8 @@ def proof_checker(request):
                     parser = tflparser.parser
 
                 # Verify the proof!
-                response = verify_proof(proof, parser)
+                response = verify_proof(proof, parser, full_report=True,
+                    cache_key=proof_cache_key(request))
 
                 # Send the response back
                 context = {
@@ -140,7 +153,8 @@ def proof_create_view(request):
                 else:
                     parser = tflparser.parser
 
-                response = verify_proof(proof, parser)
+                response = verify_proof(proof, parser, full_report=True,
+                    cache_key=proof_cache_key(request))
 
             elif 'submit' in request.POST:
                 if len(formset.forms) > 0:
@@ -196,7 +210,8 @@ def proof_update_view(request, pk=None):
                     else:
                         parser = tflparser.parser
 
-                    response = verify_proof(proof, parser)
+                    response = verify_proof(proof, parser, full_report=True,
+                        cache_key=proof_cache_key(request, obj.pk))
 
                 elif 'submit' in request.POST:
                     if len(formset.forms) > 0: